@@ -1,10 +1,35 @@
+import gzip
 import json
+import sqlite3
+import time
+import zlib
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+from urllib.parse import quote
 
-from qgis.core import QgsApplication
+from qgis.core import QgsApplication, QgsFeedback, QgsNetworkAccessManager
+from qgis.PyQt.QtNetwork import QNetworkReply, QNetworkRequest
 
-from qgis_hub_plugin.utilities.common import download_file
+from qgis_hub_plugin.core.catalog_service import catalog_service
+from qgis_hub_plugin.core.catalog_store import CatalogStore
+from qgis_hub_plugin.core.json_stream import ResultsStreamParser
+from qgis_hub_plugin.toolbelt import PlgLogger
+from qgis_hub_plugin.utilities.common import (
+    ReplyTimer,
+    build_network_request,
+    check_circuit,
+    record_metrics,
+    record_reply,
+    reply_header,
+    retry_without_http2,
+    wait_for_replies,
+)
+from qgis_hub_plugin.utilities.endpoints import endpoint_selector
 from qgis_hub_plugin.utilities.exception import DownloadError
+from qgis_hub_plugin.utilities.files import atomic_copy, atomic_write
+from qgis_hub_plugin.utilities.retry import retry_policy
 
 BASE_URL = "https://hub.qgis.org/api/v1/resources/"
 API_UNAVAILABLE_MESSAGE = (
@@ -13,33 +38,1061 @@ API_UNAVAILABLE_MESSAGE = (
     f'(<a href="{BASE_URL}">{BASE_URL}</a>)'
 )
 
+# Number of resources requested per catalog page
+PAGE_SIZE = 100
+# Maximum number of catalog pages downloaded at the same time
+MAX_PARALLEL_PAGES = 4
+# Seconds before the latency of the mirrors is measured again
+ENDPOINT_PROBE_INTERVAL = 15 * 60
+
+# Cached catalog, gzip compressed to keep the QGIS profile small
+RESPONSE_FILE_NAME = "response.json.gz"
+# Uncompressed cached catalog of previous versions
+LEGACY_RESPONSE_FILE_NAME = "response.json"
+# Copy of the last catalog written, restored when the cached one is corrupted
+LAST_GOOD_FILE_NAME = "response.last_good.json.gz"
+# Sidecar of the cached catalog storing the HTTP validators of each page
+VALIDATORS_FILE_NAME = "response.validators.json"
+# Sidecar of the cached catalog storing when it was last synchronized
+SYNC_STATE_FILE_NAME = "response.sync.json"
+# Indexed copy of the cached catalog queried by the resource browser
+STORE_FILE_NAME = "catalog.sqlite"
+
+# A delta sync is only trusted for that long after the last full download,
+# resources edited without a new upload date are picked up by the next one.
+FULL_SYNC_INTERVAL = timedelta(days=1)
+# Margin applied to the last sync time to absorb clock differences
+SYNC_OVERLAP = timedelta(hours=1)
+# Beyond that many pages of changes a full download is cheaper
+MAX_DELTA_PAGES = 5
+# Newest resources first, so a delta stops at the first already known page
+DELTA_ORDERING = "-upload_date"
+
+
+@dataclass
+class CatalogPage:
+    """A catalog page and the HTTP validators the server returned for it."""
+
+    url: str
+    data: dict = field(default_factory=dict)
+    etag: str = ""
+    last_modified: str = ""
+    not_modified: bool = False
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class CatalogFetch(NamedTuple):
+    catalog: dict
+    validators: dict
+    modified: bool
+
 
 def _load_response(response_file: Path):
     try:
-        with open(response_file) as f:
+        # Decompressed as the parser reads it
+        with gzip.open(response_file, "rt", encoding="utf-8") as f:
             return json.load(f)
-    except json.JSONDecodeError as exc:
+    except (ValueError, gzip.BadGzipFile, EOFError, zlib.error) as exc:
         raise DownloadError(API_UNAVAILABLE_MESSAGE) from exc
 
 
-def get_all_resources(force_update=False):
-    # Check if the response file exits
+def _write_response(response_file: Path, catalog: dict):
+    with atomic_write(response_file) as raw:
+        # Level 6 compresses about as well as 9, in much less time
+        with gzip.open(raw, "wt", encoding="utf-8", compresslevel=6) as f:
+            json.dump(catalog, f)
+    try:
+        atomic_copy(response_file, response_file.with_name(LAST_GOOD_FILE_NAME))
+    except OSError as exc:
+        PlgLogger.log(f"Unable to keep a copy of the catalog: {exc}", log_level=1)
+    _update_store(response_file, catalog)
+    catalog_service.put(str(response_file), _response_version(response_file), catalog)
+
+
+def _restore_last_good(response_file: Path) -> bool:
+    """Replace a corrupted cached catalog with the last one written.
+
+    Returns:
+        bool: Whether a copy was restored.
+    """
+    last_good_file = response_file.with_name(LAST_GOOD_FILE_NAME)
+    if not Path.exists(last_good_file):
+        return False
+    try:
+        atomic_copy(last_good_file, response_file)
+    except OSError as exc:
+        PlgLogger.log(f"Unable to restore the cached catalog: {exc}", log_level=1)
+        return False
+    PlgLogger.log("The cached catalog was corrupted, restored its last copy")
+    return True
+
+
+def _cached_response(response_file: Path) -> dict:
+    """Return the cached catalog, parsed only once per version of the file
+    for the whole QGIS session. The catalog is shared, do not modify it.
+
+    A corrupted cached catalog is replaced with its last known good copy,
+    without any network request."""
+
+    def load() -> dict:
+        return catalog_service.get(
+            str(response_file),
+            _response_version(response_file),
+            lambda: _load_response(response_file),
+        )
+
+    try:
+        return load()
+    except DownloadError:
+        if not _restore_last_good(response_file):
+            raise
+    return load()
+
+
+def _response_file(response_folder: Path) -> Path:
+    """Return the cached catalog file, compressing the uncompressed cache
+    left by a previous version of the plugin."""
+    response_file = Path(response_folder, RESPONSE_FILE_NAME)
+    legacy_file = Path(response_folder, LEGACY_RESPONSE_FILE_NAME)
+    if not Path.exists(response_file) and Path.exists(legacy_file):
+        try:
+            with open(legacy_file) as f:
+                catalog = json.load(f)
+            _write_response(response_file, catalog)
+            legacy_file.unlink()
+        except (OSError, json.JSONDecodeError) as exc:
+            PlgLogger.log(f"Unable to compress the cached catalog: {exc}")
+    return response_file
+
+
+def _response_version(response_file: Path) -> str:
+    """Identify a version of the cached catalog, to tell whether the store was
+    built from it."""
+    try:
+        stat = response_file.stat()
+    except OSError:
+        return ""
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def _update_store(response_file: Path, catalog: dict):
+    """Write the catalog to the store next to the cached catalog. The store
+    can always be rebuilt from the cached catalog, so a failure is only
+    logged."""
+    try:
+        store = CatalogStore(response_file.with_name(STORE_FILE_NAME))
+        try:
+            store.replace_all(
+                catalog.get("results", []), _response_version(response_file)
+            )
+        finally:
+            store.close()
+    except sqlite3.Error as exc:
+        PlgLogger.log(f"Unable to update the catalog store: {exc}", log_level=1)
+
+
+def _load_sidecar(sidecar_file: Path) -> dict:
+    """Load a file stored next to the cached catalog (validators, sync state).
+    A missing or unreadable sidecar only costs a full download, so it is
+    ignored."""
+    try:
+        with open(sidecar_file) as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_sidecar(sidecar_file: Path, data: dict):
+    with atomic_write(sidecar_file, "w") as f:
+        json.dump(data, f)
+
+
+def _page_url(
+    offset: int,
+    limit: int = PAGE_SIZE,
+    endpoint: Optional[str] = None,
+    resource_type: Optional[str] = None,
+) -> str:
+    base_url = BASE_URL
+    base_endpoint = endpoint_selector.endpoint_of(BASE_URL)
+    if endpoint is not None and base_endpoint is not None:
+        base_url = endpoint + BASE_URL[len(base_endpoint) :]
+    url = f"{base_url}?limit={limit}&offset={offset}&format=json"
+    if resource_type is not None:
+        url += f"&resource_type={quote(resource_type)}"
+    return url
+
+
+def _page_total(page: dict) -> Optional[int]:
+    """Return the total number of resources announced by a catalog page.
+
+    The Hub API reports the catalog size in ``total``; ``count`` is only used
+    as a fallback for responses that do not provide it.
+    """
+    for key in ("total", "count"):
+        value = page.get(key)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def _stream_page(
+    reply: QNetworkReply, url: str, parser: ResultsStreamParser
+) -> list[dict]:
+    """Parse the part of a page body received so far.
+
+    Returns:
+        list[dict]: The resources completed by the received bytes.
+    """
+    status = reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute)
+    if status != 200 or reply.bytesAvailable() <= 0:
+        return []
+    try:
+        return parser.feed(reply.readAll().data())
+    except ValueError as exc:
+        raise DownloadError(f"Invalid catalog page: {url}") from exc
+
+
+def _read_page(
+    reply: QNetworkReply, url: str, parser: Optional[ResultsStreamParser] = None
+) -> CatalogPage:
+    if reply.error() == QNetworkReply.NetworkError.ContentNotFoundError:
+        raise DownloadError(f"File not found (404 error): {url}")
+    if reply.error() != QNetworkReply.NetworkError.NoError:
+        raise DownloadError(f"Download failed: {reply.errorString()}")
+    if reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute) == 304:
+        return CatalogPage(url=url, not_modified=True)
+    parser = parser or ResultsStreamParser()
+    try:
+        # The rest of the body, or all of it when it was not streamed
+        parser.feed(reply.readAll().data())
+        data = parser.finish()
+    except ValueError as exc:
+        raise DownloadError(f"Invalid catalog page: {url}") from exc
+    return CatalogPage(
+        url=url,
+        data=data,
+        etag=reply_header(reply, "ETag"),
+        last_modified=reply_header(reply, "Last-Modified"),
+    )
+
+
+def fetch_pages(
+    urls: list[str],
+    on_page: Optional[Callable[[list[dict]], None]] = None,
+    timeout: int = 30000,
+    max_parallel: int = MAX_PARALLEL_PAGES,
+    cached_pages: Optional[dict[str, CatalogPage]] = None,
+    feedback: Optional[QgsFeedback] = None,
+) -> dict[str, CatalogPage]:
+    """Download catalog pages in parallel through the shared network manager.
+
+    The resources of each page are parsed while its body is downloading, so
+    the first ones are available before the page is complete. Pages failing
+    transiently are retried with backoff, and the download fails fast while
+    the circuit breaker of the Hub is open.
+
+    Args:
+        urls (list[str]): The page URLs to download.
+        on_page (Callable, optional): Called with batches of resources as soon
+            as they are received, in arrival order. The resources of a page
+            which is retried after a failure may be handed again.
+        timeout (int): The timeout for each request in milliseconds.
+        max_parallel (int): Maximum number of requests in flight.
+        cached_pages (dict[str, CatalogPage], optional): Previously downloaded
+            pages. They are revalidated with conditional requests and reused
+            when the server answers 304 Not Modified.
+        feedback (QgsFeedback, optional): Cancels the downloads when canceled.
+
+    Returns:
+        dict[str, CatalogPage]: The pages keyed by URL.
+
+    Raises:
+        DownloadError: If any page cannot be downloaded or parsed, or when
+            the download is canceled.
+    """
+    nam = QgsNetworkAccessManager.instance()
+    cached_pages = cached_pages or {}
+    queue = list(urls)
+    in_flight = {}
+    pages = {}
+    attempts = {}
+    # Pages waiting to be retried, with the time they can be sent again
+    delayed = {}
+    parsers = {}
+    timers = {}
+    # Number of resources of each page already handed to on_page
+    streamed = {}
+
+    try:
+        while queue or in_flight or delayed:
+            if feedback is not None and feedback.isCanceled():
+                raise DownloadError("Download canceled")
+
+            now = time.monotonic()
+            for url, retry_at in list(delayed.items()):
+                if retry_at <= now:
+                    del delayed[url]
+                    queue.append(url)
+
+            while queue and len(in_flight) < max_parallel:
+                url = queue.pop(0)
+                check_circuit(url)
+                attempts[url] = attempts.get(url, 0) + 1
+                cached = cached_pages.get(url)
+                request = build_network_request(
+                    url,
+                    timeout,
+                    headers=cached.conditional_headers() if cached else None,
+                )
+                # The catalog has its own validators, keep it out of the
+                # QGIS network cache so a 304 is never answered from there.
+                request.setAttribute(
+                    QNetworkRequest.Attribute.CacheLoadControlAttribute,
+                    QNetworkRequest.CacheLoadControl.AlwaysNetwork,
+                )
+                request.setAttribute(
+                    QNetworkRequest.Attribute.CacheSaveControlAttribute, False
+                )
+                in_flight[url] = nam.get(request)
+                timers[url] = ReplyTimer(in_flight[url])
+                parsers[url] = ResultsStreamParser()
+                streamed[url] = 0
+
+            for url, reply in list(in_flight.items()):
+                if not reply.isFinished():
+                    resources = _stream_page(reply, url, parsers[url])
+                    if resources and on_page is not None:
+                        streamed[url] += len(resources)
+                        on_page(resources)
+                    continue
+                del in_flight[url]
+                record_metrics(url, reply, timers.pop(url))
+                if retry_without_http2(reply, url):
+                    reply.deleteLater()
+                    queue.insert(0, url)
+                    continue
+                if record_reply(reply, url) and retry_policy.should_retry(
+                    attempts[url]
+                ):
+                    PlgLogger.log(f"Retrying {url} after: {reply.errorString()}")
+                    delayed[url] = time.monotonic() + retry_policy.delay(attempts[url])
+                    reply.deleteLater()
+                    continue
+                try:
+                    page = _read_page(reply, url, parsers.pop(url))
+                finally:
+                    reply.deleteLater()
+                if page.not_modified:
+                    if url not in cached_pages:
+                        raise DownloadError(f"Unexpected 304 response: {url}")
+                    page = replace(cached_pages[url], not_modified=True)
+                pages[url] = page
+                remaining = page.data.get("results", [])[streamed.pop(url) :]
+                if on_page is not None and remaining:
+                    on_page(remaining)
+
+            # Sleep until a page progresses or a retry is due, the GUI is
+            # processed meanwhile
+            wait_ms = timeout
+            if delayed:
+                next_retry = min(delayed.values()) - time.monotonic()
+                wait_ms = min(wait_ms, int(max(0.0, next_retry) * 1000))
+            if in_flight or delayed:
+                wait_for_replies(
+                    list(in_flight.values()), wait_ms, feedback, streaming=True
+                )
+    except Exception:
+        for reply in in_flight.values():
+            reply.abort()
+            reply.deleteLater()
+        raise
+
+    return pages
+
+
+def _cached_pages(cached_catalog: Optional[dict], validators: dict) -> dict:
+    """Rebuild the pages of a cached catalog from its validators.
+
+    Only pages whose resources are all still present in the cached catalog
+    are returned, the others will be downloaded unconditionally.
+    """
+    if not cached_catalog or not validators:
+        return {}
+
+    resources = {r.get("uuid"): r for r in cached_catalog.get("results", [])}
+    total = validators.get("total")
+    cached_pages = {}
+    for url, page_validators in validators.get("pages", {}).items():
+        uuids = page_validators.get("uuids", [])
+        if not all(uuid in resources for uuid in uuids):
+            continue
+        # Pages of a single resource type announce the size of that type
+        page_total = page_validators.get("total", total)
+        cached_pages[url] = CatalogPage(
+            url=url,
+            data={
+                "total": page_total,
+                "results": [resources[uuid] for uuid in uuids],
+            },
+            etag=page_validators.get("etag", ""),
+            last_modified=page_validators.get("last_modified", ""),
+        )
+    return cached_pages
+
+
+def _page_validators(pages: list[CatalogPage], total: Optional[int]) -> dict:
+    return {
+        "total": total,
+        "pages": {
+            page.url: {
+                "etag": page.etag,
+                "last_modified": page.last_modified,
+                "total": _page_total(page.data),
+                "uuids": [r.get("uuid") for r in page.data.get("results", [])],
+            }
+            for page in pages
+            if page.etag or page.last_modified
+        },
+    }
+
+
+def _merge_pages(pages: list[dict]) -> dict:
+    """Merge catalog pages into a single catalog, dropping resources that
+    appear twice when the catalog shifted between two page requests."""
+    results = []
+    seen = set()
+    for page in pages:
+        for resource in page.get("results", []):
+            uuid = resource.get("uuid")
+            if uuid in seen:
+                continue
+            seen.add(uuid)
+            results.append(resource)
+
+    return {
+        "total": len(results),
+        "count": len(results),
+        "next": None,
+        "previous": None,
+        "results": results,
+    }
+
+
+def probe_endpoints(timeout: int = 5000):
+    """Measure the latency of the QGIS Hub and its mirrors, in parallel, with
+    a catalog page of a single resource. An endpoint failing to answer is
+    recorded with the timeout as latency."""
+    nam = QgsNetworkAccessManager.instance()
+    started = time.monotonic()
+    pending = {}
+    for endpoint in endpoint_selector.endpoints:
+        url = _page_url(0, limit=1, endpoint=endpoint)
+        request = build_network_request(url, timeout)
+        request.setAttribute(
+            QNetworkRequest.Attribute.CacheLoadControlAttribute,
+            QNetworkRequest.CacheLoadControl.AlwaysNetwork,
+        )
+        reply = nam.get(request)
+        pending[endpoint] = (url, reply, ReplyTimer(reply))
+
+    while pending:
+        for endpoint, (url, reply, timer) in list(pending.items()):
+            if not reply.isFinished():
+                continue
+            del pending[endpoint]
+            record_metrics(url, reply, timer)
+            if record_reply(reply, url) or (
+                reply.error() != QNetworkReply.NetworkError.NoError
+            ):
+                latency = timeout / 1000
+            else:
+                latency = time.monotonic() - started
+            endpoint_selector.record_latency(endpoint, latency)
+            reply.deleteLater()
+        if pending:
+            wait_for_replies([reply for _, reply, _ in pending.values()], timeout)
+
+
+def fetch_catalog(
+    on_page: Optional[Callable[[list[dict]], None]] = None,
+    cached_catalog: Optional[dict] = None,
+    validators: Optional[dict] = None,
+    feedback: Optional[QgsFeedback] = None,
+    resource_types: Optional[list[str]] = None,
+) -> CatalogFetch:
+    """Download the whole catalog from the QGIS Hub API.
+
+    The catalog is downloaded from the fastest healthy endpoint among the
+    QGIS Hub and its mirrors, the next ones are tried when it fails. The
+    first page announces the catalog size, the remaining pages are then
+    downloaded in parallel, stepped by the size of the first page. When the
+    size is unknown, or the pages do not add up to it, the ``next`` links are
+    followed one page at a time. When a cached catalog and its validators are
+    given, every page is revalidated with a conditional request and reused
+    from the cache when the server answers 304 Not Modified.
+
+    With *resource_types*, the catalog of each resource type is downloaded
+    separately, all types in parallel and the pages of the first types
+    first. The whole catalog is downloaded instead when the types do not add
+    up to it, e.g. when the QGIS Hub has a new type.
+
+    Args:
+        on_page (Callable, optional): Called with the resources of each page
+            as soon as it is downloaded.
+        cached_catalog (dict, optional): The catalog currently in cache.
+        validators (dict, optional): The validators stored with the cache.
+        feedback (QgsFeedback, optional): Receives the share of resources
+            downloaded, and cancels the download when canceled.
+        resource_types (list[str], optional): The known resource types, the
+            ones to show first first.
+
+    Returns:
+        CatalogFetch: The merged catalog, the validators of its pages and
+            whether anything changed since the cached catalog.
+    """
+    if endpoint_selector.needs_probe(ENDPOINT_PROBE_INTERVAL):
+        probe_endpoints()
+
+    endpoints = endpoint_selector.ranked()
+    for index, endpoint in enumerate(endpoints):
+        try:
+            return _fetch_catalog(
+                endpoint, on_page, cached_catalog, validators, feedback, resource_types
+            )
+        except DownloadError as exc:
+            canceled = feedback is not None and feedback.isCanceled()
+            if canceled or index + 1 == len(endpoints):
+                raise
+            PlgLogger.log(
+                f"Catalog download from {endpoint} failed, trying "
+                f"{endpoints[index + 1]}: {exc}"
+            )
+
+
+def _fetch_catalog(
+    endpoint: str,
+    on_page: Optional[Callable[[list[dict]], None]],
+    cached_catalog: Optional[dict],
+    validators: Optional[dict],
+    feedback: Optional[QgsFeedback],
+    resource_types: Optional[list[str]] = None,
+) -> CatalogFetch:
+    cached_pages = _cached_pages(cached_catalog, validators or {})
+
+    fetched = None
+    if resource_types:
+        fetched = _fetch_pages_by_type(
+            endpoint, resource_types, on_page, cached_pages, feedback
+        )
+        if fetched is None:
+            PlgLogger.log(
+                "The resource types do not add up to the catalog, "
+                "downloading the whole catalog"
+            )
+    if fetched is None:
+        fetched = _fetch_all_pages(endpoint, on_page, cached_pages, feedback)
+    pages, total = fetched
+
+    modified = cached_catalog is None or not all(page.not_modified for page in pages)
+    if not modified:
+        return CatalogFetch(cached_catalog, validators, False)
+
+    return CatalogFetch(
+        _merge_pages([page.data for page in pages]),
+        _page_validators(pages, total),
+        True,
+    )
+
+
+def _page_offsets(first_page: dict, total: int) -> Optional[range]:
+    """Return the offsets of the pages after *first_page*, stepping by the
+    number of resources the server put in it, fewer than asked when it caps
+    the page size. None when it is empty although resources remain."""
+    size = len(first_page.get("results", []))
+    if not size:
+        return None if total else range(0)
+    return range(size, total, size)
+
+
+def _unique_count(pages: list[CatalogPage]) -> int:
+    return len(
+        {
+            resource.get("uuid")
+            for page in pages
+            for resource in page.data.get("results", [])
+        }
+    )
+
+
+def _fetch_all_pages(
+    endpoint: str,
+    on_page: Optional[Callable[[list[dict]], None]],
+    cached_pages: dict[str, CatalogPage],
+    feedback: Optional[QgsFeedback],
+) -> tuple[list[CatalogPage], Optional[int]]:
+    first_url = _page_url(0, endpoint=endpoint)
+    first_page = fetch_pages(
+        [first_url], on_page, cached_pages=cached_pages, feedback=feedback
+    )[first_url]
+    pages = [first_page]
+
+    total = _page_total(first_page.data)
+    offsets = None if total is None else _page_offsets(first_page.data, total)
+    if offsets is not None:
+        urls = [_page_url(offset, endpoint=endpoint) for offset in offsets]
+        received = len(first_page.data.get("results", []))
+
+        def on_resources(resources: list[dict]):
+            nonlocal received
+            received += len(resources)
+            if feedback is not None:
+                feedback.setProgress(min(100, 100 * received / total))
+            if on_page is not None:
+                on_page(resources)
+
+        if feedback is not None and total:
+            feedback.setProgress(min(100, 100 * received / total))
+        if urls:
+            fetched = fetch_pages(
+                urls, on_resources, cached_pages=cached_pages, feedback=feedback
+            )
+            pages.extend(fetched[url] for url in urls)
+        unique = _unique_count(pages)
+        if unique == total:
+            return pages, total
+        PlgLogger.log(
+            f"Received {unique} of the {total} resources announced, "
+            "following the next pages instead"
+        )
+
+    # The resources already handed are not handed again
+    handed = {r.get("uuid") for page in pages for r in page.data.get("results", [])}
+
+    def on_next_resources(resources: list[dict]):
+        resources = [r for r in resources if r.get("uuid") not in handed]
+        handed.update(r.get("uuid") for r in resources)
+        if on_page is not None and resources:
+            on_page(resources)
+
+    next_url = first_page.data.get("next")
+    while next_url:
+        page = fetch_pages(
+            [next_url], on_next_resources, cached_pages=cached_pages, feedback=feedback
+        )[next_url]
+        pages.append(page)
+        next_url = page.data.get("next")
+
+    return pages, total
+
+
+def _fetch_pages_by_type(
+    endpoint: str,
+    resource_types: list[str],
+    on_page: Optional[Callable[[list[dict]], None]],
+    cached_pages: dict[str, CatalogPage],
+    feedback: Optional[QgsFeedback],
+) -> Optional[tuple[list[CatalogPage], int]]:
+    """Download the catalog one resource type at a time.
+
+    The first page of every type is downloaded in a first batch, along with
+    a single resource page announcing the size of the whole catalog. The
+    remaining pages follow in a second batch, in the order of the types.
+
+    The pages of a type are stepped by the size of its first page, and the
+    resources received are counted against the catalog size at the end.
+
+    Returns:
+        Optional[tuple[list[CatalogPage], int]]: The pages and the catalog
+            size, or None when the types do not add up to the whole catalog.
+    """
+    count_url = _page_url(0, limit=1, endpoint=endpoint)
+    first_urls = [
+        _page_url(0, endpoint=endpoint, resource_type=resource_type)
+        for resource_type in resource_types
+    ]
+    total = None
+    # The resource of the count page is also in the page of its type
+    received = set()
+
+    def on_resources(resources: list[dict]):
+        resources = [r for r in resources if r.get("uuid") not in received]
+        received.update(r.get("uuid") for r in resources)
+        if feedback is not None and total:
+            feedback.setProgress(min(100, 100 * len(received) / total))
+        if on_page is not None and resources:
+            on_page(resources)
+
+    first_pages = fetch_pages(
+        first_urls + [count_url],
+        on_resources,
+        cached_pages=cached_pages,
+        feedback=feedback,
+    )
+    total = _page_total(first_pages[count_url].data)
+    type_totals = [_page_total(first_pages[url].data) for url in first_urls]
+    if total is None or None in type_totals or sum(type_totals) != total:
+        return None
+
+    type_offsets = [
+        _page_offsets(first_pages[url].data, type_total)
+        for url, type_total in zip(first_urls, type_totals)
+    ]
+    if None in type_offsets:
+        return None
+
+    if feedback is not None and total:
+        feedback.setProgress(min(100, 100 * len(received) / total))
+    urls = [
+        _page_url(offset, endpoint=endpoint, resource_type=resource_type)
+        for resource_type, offsets in zip(resource_types, type_offsets)
+        for offset in offsets
+    ]
+    pages = [first_pages[url] for url in first_urls]
+    if urls:
+        fetched = fetch_pages(
+            urls, on_resources, cached_pages=cached_pages, feedback=feedback
+        )
+        pages.extend(fetched[url] for url in urls)
+    unique = _unique_count(pages)
+    if unique != total:
+        PlgLogger.log(f"Received {unique} of the {total} resources announced")
+        return None
+    return pages, total
+
+
+def _parse_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO 8601 date from the API or the sync state, as UTC when it
+    carries no timezone."""
+    if not value:
+        return None
+    # Replace 'Z' with '+00:00' for Python < 3.11 compatibility
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        date = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    return date if date.tzinfo else date.replace(tzinfo=timezone.utc)
+
+
+def _delta_page_url(offset: int, endpoint: Optional[str] = None) -> str:
+    return f"{_page_url(offset, endpoint=endpoint)}&ordering={DELTA_ORDERING}"
+
+
+def _merge_delta(cached_catalog: dict, changed: list[dict]) -> dict:
+    """Merge resources uploaded since the last sync into the cached catalog.
+    Known resources are updated in place, new ones are put first."""
+    changed_by_uuid = {r.get("uuid"): r for r in changed}
+    cached_results = cached_catalog.get("results", [])
+    cached_uuids = {r.get("uuid") for r in cached_results}
+
+    results = [r for r in changed if r.get("uuid") not in cached_uuids]
+    results.extend(changed_by_uuid.get(r.get("uuid"), r) for r in cached_results)
+    return _merge_pages([{"results": results}])
+
+
+def fetch_catalog_delta(
+    cached_catalog: dict, since: datetime, feedback: Optional[QgsFeedback] = None
+) -> Optional[dict]:
+    """Download the resources uploaded since the last sync and merge them into
+    the cached catalog.
+
+    Pages are requested newest first and downloaded until one reaches the
+    last sync time. The delta is only trusted when the server honoured the
+    ordering and the merged catalog has as many resources as the server
+    announces, which is not the case when resources were removed. Like the
+    whole catalog, it is downloaded from the fastest healthy endpoint, the
+    next ones are tried when it fails.
+
+    Args:
+        cached_catalog (dict): The catalog currently in cache.
+        since (datetime): The time of the last successful sync.
+        feedback (QgsFeedback, optional): Cancels the download when canceled.
+
+    Returns:
+        Optional[dict]: The merged catalog, or None when the delta cannot be
+            trusted and the whole catalog must be downloaded.
+    """
+    endpoints = endpoint_selector.ranked()
+    for index, endpoint in enumerate(endpoints):
+        try:
+            return _fetch_catalog_delta(endpoint, cached_catalog, since, feedback)
+        except DownloadError as exc:
+            canceled = feedback is not None and feedback.isCanceled()
+            if canceled or index + 1 == len(endpoints):
+                raise
+            PlgLogger.log(
+                f"Delta sync from {endpoint} failed, trying "
+                f"{endpoints[index + 1]}: {exc}"
+            )
+
+
+def _fetch_catalog_delta(
+    endpoint: str,
+    cached_catalog: dict,
+    since: datetime,
+    feedback: Optional[QgsFeedback],
+) -> Optional[dict]:
+    cutoff = since - SYNC_OVERLAP
+    changed = []
+    total = None
+    previous_date = None
+
+    for page_number in range(MAX_DELTA_PAGES):
+        url = _delta_page_url(page_number * PAGE_SIZE, endpoint)
+        page = fetch_pages([url], feedback=feedback)[url].data
+        total = _page_total(page)
+
+        reached_cutoff = False
+        for resource in page.get("results", []):
+            upload_date = _parse_date(resource.get("upload_date"))
+            if upload_date is None or (
+                previous_date is not None and upload_date > previous_date
+            ):
+                PlgLogger.log("Delta sync: the catalog is not ordered by date")
+                return None
+            previous_date = upload_date
+            if upload_date < cutoff:
+                reached_cutoff = True
+                break
+            changed.append(resource)
+
+        if reached_cutoff or not page.get("next"):
+            break
+    else:
+        PlgLogger.log("Delta sync: too many changes since the last sync")
+        return None
+
+    catalog = _merge_delta(cached_catalog, changed)
+    if total != catalog["total"]:
+        PlgLogger.log(
+            f"Delta sync: {catalog['total']} resources merged, "
+            f"the QGIS Hub announces {total}"
+        )
+        return None
+    return catalog
+
+
+def _response_folder() -> Path:
     response_folder = Path(QgsApplication.qgisSettingsDirPath(), "qgis_hub")
     response_folder.mkdir(parents=True, exist_ok=True)
-    response_file = Path(response_folder, "response.json")
+    return response_folder
+
+
+def cached_catalog_file() -> Path:
+    """Return the compressed file of the cached catalog, which does not exist
+    until the catalog is first downloaded."""
+    return _response_file(_response_folder())
+
+
+def catalog_validators() -> dict:
+    """Return the validators of the pages of the cached catalog, empty when
+    they are unknown."""
+    return _load_sidecar(Path(_response_folder(), VALIDATORS_FILE_NAME))
+
+
+def catalog_last_sync() -> Optional[str]:
+    """Return when the cached catalog was last synchronized with the QGIS
+    Hub, as an ISO 8601 date, or None when it never was."""
+    sync_state = _load_sidecar(Path(_response_folder(), SYNC_STATE_FILE_NAME))
+    return sync_state.get("last_sync")
+
+
+def replace_cached_catalog(
+    catalog: dict, validators: Optional[dict], synced: str
+) -> None:
+    """Replace the cached catalog, e.g. with one imported from elsewhere.
+
+    Args:
+        catalog (dict): The new catalog.
+        validators (dict, optional): The validators of the pages of
+            *catalog*. Those of the previous catalog are dropped when None.
+        synced (str): When *catalog* was synchronized with the QGIS Hub, as
+            an ISO 8601 date. It is a full synchronization.
+    """
+    response_folder = _response_folder()
+    _write_response(_response_file(response_folder), catalog)
+    validators_file = Path(response_folder, VALIDATORS_FILE_NAME)
+    if validators:
+        _write_sidecar(validators_file, validators)
+    else:
+        validators_file.unlink(missing_ok=True)
+    _write_sidecar(
+        Path(response_folder, SYNC_STATE_FILE_NAME),
+        {"last_sync": synced, "last_full_sync": synced},
+    )
+
+
+def catalog_age() -> Optional[timedelta]:
+    """Return how long ago the cached catalog was last synchronized with the
+    QGIS Hub, or None when there is no cached catalog."""
+    if not Path.exists(cached_catalog_file()):
+        return None
+    last_sync = _parse_date(catalog_last_sync())
+    if last_sync is None:
+        return None
+    return datetime.now(timezone.utc) - last_sync
+
+
+def catalog_is_stale(ttl: timedelta) -> bool:
+    """Tell whether the cached catalog is missing or older than *ttl*."""
+    age = catalog_age()
+    return age is None or age >= ttl
+
+
+def get_catalog_store() -> CatalogStore:
+    """Open the local catalog store.
+
+    The store is rebuilt from the cached catalog when it was not built
+    from its current version, e.g. on the first run after an upgrade.
+
+    Returns:
+        CatalogStore: The store, empty when there is no cached catalog yet.
+    """
+    response_folder = _response_folder()
+    response_file = _response_file(response_folder)
+    store_file = Path(response_folder, STORE_FILE_NAME)
+    try:
+        store = CatalogStore(store_file)
+    except sqlite3.DatabaseError as exc:
+        PlgLogger.log(f"Rebuilding the catalog store: {exc}", log_level=1)
+        store_file.unlink(missing_ok=True)
+        store = CatalogStore(store_file)
+
+    version = _response_version(response_file)
+    if store.source_version != version:
+        try:
+            catalog = _cached_response(response_file) if version else {}
+        except (OSError, DownloadError):
+            catalog = {}
+        store.replace_all(catalog.get("results", []), version)
+    return store
+
+
+def get_all_resources(
+    force_update=False,
+    on_page: Optional[Callable[[list[dict]], None]] = None,
+    cache_only=False,
+    feedback: Optional[QgsFeedback] = None,
+    resource_types: Optional[list[str]] = None,
+):
+    # Check if the response file exits
+    response_folder = _response_folder()
+    response_file = _response_file(response_folder)
     if not force_update and Path.exists(response_file):
-        return _load_response(response_file)
+        return _cached_response(response_file)
+    if cache_only:
+        return None
 
-    url = f"{BASE_URL}?limit=1000&format=json"
+    # Revalidate the cached catalog instead of downloading it again
+    cached_catalog = None
+    validators = {}
+    validators_file = Path(response_folder, VALIDATORS_FILE_NAME)
+    if Path.exists(response_file):
+        try:
+            cached_catalog = _cached_response(response_file)
+        except DownloadError:
+            cached_catalog = None
+        else:
+            validators = _load_sidecar(validators_file)
+
+    sync_time = datetime.now(timezone.utc).isoformat()
     try:
-        status = download_file(url=url, destination=response_file, force=force_update)
+        catalog, validators, modified = fetch_catalog(
+            on_page=on_page,
+            cached_catalog=cached_catalog,
+            validators=validators,
+            feedback=feedback,
+            resource_types=resource_types,
+        )
     except DownloadError as exc:
         raise DownloadError(API_UNAVAILABLE_MESSAGE) from exc
 
-    if status and response_file.exists():
-        return _load_response(response_file)
+    if modified:
+        _write_response(response_file, catalog)
+        _write_sidecar(validators_file, validators)
+    _write_sidecar(
+        Path(response_folder, SYNC_STATE_FILE_NAME),
+        {"last_sync": sync_time, "last_full_sync": sync_time},
+    )
+    return catalog
 
-    if response_file.exists():
-        return _load_response(response_file)
 
-    return None
+def sync_resources(
+    on_page: Optional[Callable[[list[dict]], None]] = None,
+    feedback: Optional[QgsFeedback] = None,
+    resource_types: Optional[list[str]] = None,
+) -> dict:
+    """Bring the cached catalog up to date.
+
+    Only the resources uploaded since the last sync are downloaded when the
+    cache was fully synchronized recently enough, otherwise or when the delta
+    cannot be trusted the whole catalog is revalidated.
+
+    Args:
+        on_page (Callable, optional): Called with the resources of each page
+            when the whole catalog has to be downloaded.
+        feedback (QgsFeedback, optional): Receives the download progress, and
+            cancels the download when canceled.
+        resource_types (list[str], optional): Download the whole catalog one
+            resource type at a time, the first ones first.
+
+    Returns:
+        dict: The up to date catalog.
+
+    Raises:
+        DownloadError: If the QGIS Hub cannot be reached.
+    """
+    response_folder = _response_folder()
+    response_file = _response_file(response_folder)
+    sync_state_file = Path(response_folder, SYNC_STATE_FILE_NAME)
+    sync_state = _load_sidecar(sync_state_file)
+    last_sync = _parse_date(sync_state.get("last_sync"))
+    last_full_sync = _parse_date(sync_state.get("last_full_sync"))
+    now = datetime.now(timezone.utc)
+
+    cached_catalog = None
+    if Path.exists(response_file):
+        try:
+            cached_catalog = _cached_response(response_file)
+        except DownloadError:
+            cached_catalog = None
+
+    if (
+        cached_catalog is not None
+        and last_sync is not None
+        and last_full_sync is not None
+        and now - last_full_sync < FULL_SYNC_INTERVAL
+    ):
+        try:
+            catalog = fetch_catalog_delta(cached_catalog, last_sync, feedback)
+        except DownloadError as exc:
+            raise DownloadError(API_UNAVAILABLE_MESSAGE) from exc
+
+        if catalog is not None:
+            if catalog["results"] != cached_catalog.get("results"):
+                _write_response(response_file, catalog)
+            _write_sidecar(
+                sync_state_file,
+                {
+                    "last_sync": now.isoformat(),
+                    "last_full_sync": last_full_sync.isoformat(),
+                },
+            )
+            return catalog
+
+    return get_all_resources(
+        force_update=True,
+        on_page=on_page,
+        feedback=feedback,
+        resource_types=resource_types,
+    )
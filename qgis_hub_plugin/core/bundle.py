@@ -0,0 +1,303 @@
+import gzip
+import json
+import shutil
+import tempfile
+import zipfile
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, NamedTuple, Optional
+
+from qgis.core import QgsFeedback, QgsTask
+from qgis.PyQt.QtCore import pyqtSignal
+
+from qgis_hub_plugin.__about__ import __version__
+from qgis_hub_plugin.core.api_client import (
+    cached_catalog_file,
+    catalog_last_sync,
+    catalog_validators,
+    get_all_resources,
+    replace_cached_catalog,
+)
+from qgis_hub_plugin.toolbelt import PlgLogger
+from qgis_hub_plugin.utilities.common import (
+    download_file,
+    download_resource_thumbnail,
+    is_resource_thumbnail_cached,
+    offline_file_path,
+    resource_thumbnail_cache_path,
+)
+from qgis_hub_plugin.utilities.exception import DownloadError
+from qgis_hub_plugin.utilities.files import atomic_write
+
+# Bump when the layout changes, newer bundles are then refused
+BUNDLE_FORMAT = 1
+BUNDLE_SUFFIX = ".qgishub.zip"
+
+# Layout of the archive
+INDEX_NAME = "index.json"
+CATALOG_NAME = "catalog/response.json.gz"
+VALIDATORS_NAME = "catalog/response.validators.json"
+THUMBNAILS_FOLDER = "thumbnails"
+FILES_FOLDER = "files"
+
+
+class BundleSummary(NamedTuple):
+    resources: int
+    thumbnails: int
+    files: int
+
+
+def _is_plain_name(name: str) -> bool:
+    """Tell whether *name* can be used as a file name, it comes from the
+    archive so it must not point out of its folder."""
+    return bool(name) and Path(name).name == name and name not in (".", "..")
+
+
+def _check_canceled(feedback: Optional[QgsFeedback]):
+    if feedback is not None and feedback.isCanceled():
+        raise DownloadError("Bundle canceled")
+
+
+def _extract(archive: zipfile.ZipFile, name: str, destination: Path):
+    """Copy the entry *name* of *archive* to *destination*, without holding
+    the whole file in memory."""
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    with archive.open(name) as src, atomic_write(destination) as f:
+        shutil.copyfileobj(src, f)
+
+
+def _set_progress(feedback: Optional[QgsFeedback], done: int, total: int):
+    if feedback is not None and total:
+        feedback.setProgress(100 * done / total)
+
+
+def export_bundle(
+    bundle_file: Path,
+    resource_uuids: Optional[Iterable[str]] = None,
+    feedback: Optional[QgsFeedback] = None,
+) -> BundleSummary:
+    """Pack the catalog, the thumbnails of its resources and the files of the
+    selected resources into a single archive, to be imported on workstations
+    without access to the QGIS Hub.
+
+    The catalog is downloaded when it is not cached yet, so are the missing
+    thumbnails and the files. The archive is a zip file holding an
+    ``index.json`` describing its content.
+
+    Args:
+        bundle_file (Path): The archive to write.
+        resource_uuids (Iterable[str], optional): The resources whose file is
+            packed. Defaults to none, only the catalog and the thumbnails are
+            packed then.
+        feedback (QgsFeedback, optional): Receives the progress, and cancels
+            the export when canceled.
+
+    Returns:
+        BundleSummary: The number of resources, thumbnails and files packed.
+
+    Raises:
+        DownloadError: If the catalog or a file cannot be downloaded, or the
+            archive cannot be written.
+    """
+    catalog = get_all_resources()
+    resources = catalog.get("results", [])
+    validators = catalog_validators()
+    now = datetime.now(timezone.utc).isoformat()
+
+    selected = set(resource_uuids or ())
+    packed_resources = [
+        resource
+        for resource in resources
+        if resource.get("uuid") in selected and resource.get("file")
+    ]
+    steps = len(resources) + len(packed_resources)
+
+    index = {
+        "format": BUNDLE_FORMAT,
+        "created": now,
+        "synced": catalog_last_sync() or now,
+        "plugin_version": __version__,
+        "catalog": CATALOG_NAME,
+        "validators": None,
+        "thumbnails": [],
+        "files": {},
+    }
+    try:
+        with atomic_write(bundle_file) as raw, zipfile.ZipFile(
+            raw, "w", zipfile.ZIP_DEFLATED
+        ) as archive, tempfile.TemporaryDirectory() as tmp_dir:
+            # Already compressed
+            archive.write(cached_catalog_file(), CATALOG_NAME, zipfile.ZIP_STORED)
+            if validators:
+                archive.writestr(VALIDATORS_NAME, json.dumps(validators))
+                index["validators"] = VALIDATORS_NAME
+
+            for step, resource in enumerate(resources, 1):
+                _check_canceled(feedback)
+                uuid, url = resource.get("uuid"), resource.get("thumbnail")
+                thumbnail = resource_thumbnail_cache_path(url, uuid)
+                if thumbnail is not None:
+                    try:
+                        if not is_resource_thumbnail_cached(url, uuid):
+                            download_resource_thumbnail(url, uuid)
+                    except DownloadError as exc:
+                        PlgLogger.log(f"Thumbnail not bundled: {exc}")
+                    # The original image and its PNG conversion, if any, a
+                    # single file when the original is a PNG
+                    for path in dict.fromkeys(
+                        (thumbnail, thumbnail.with_suffix(".png"))
+                    ):
+                        if path.exists():
+                            name = f"{THUMBNAILS_FOLDER}/{path.name}"
+                            # Images are already compressed
+                            archive.write(path, name, zipfile.ZIP_STORED)
+                            index["thumbnails"].append(
+                                {"uuid": uuid, "url": url, "name": name}
+                            )
+                _set_progress(feedback, step, steps)
+
+            for step, resource in enumerate(packed_resources, len(resources) + 1):
+                _check_canceled(feedback)
+                url = resource["file"]
+                downloaded = Path(tmp_dir, offline_file_path(url).name)
+                download_file(url, downloaded)
+                name = f"{FILES_FOLDER}/{resource['uuid']}/{downloaded.name}"
+                archive.write(downloaded, name)
+                index["files"][url] = name
+                downloaded.unlink()
+                _set_progress(feedback, step, steps)
+
+            archive.writestr(INDEX_NAME, json.dumps(index, indent=2))
+    except OSError as exc:
+        raise DownloadError(f"Failed to write the bundle: {exc}") from exc
+
+    return BundleSummary(len(resources), len(index["thumbnails"]), len(index["files"]))
+
+
+def import_bundle(
+    bundle_file: Path, feedback: Optional[QgsFeedback] = None
+) -> BundleSummary:
+    """Populate the local cache from an archive written by
+    :func:`export_bundle`, so the resource browser works without access to
+    the QGIS Hub.
+
+    The cached catalog is replaced with the one of the archive, which counts
+    as synchronized when it was exported. The packed files are then copied
+    instead of downloaded.
+
+    Args:
+        bundle_file (Path): The archive to read.
+        feedback (QgsFeedback, optional): Receives the progress, and cancels
+            the import when canceled. The catalog is imported first, so a
+            canceled import leaves a consistent cache.
+
+    Returns:
+        BundleSummary: The number of resources, thumbnails and files imported.
+
+    Raises:
+        DownloadError: If the archive is unreadable, or of a newer format.
+    """
+    try:
+        with zipfile.ZipFile(bundle_file) as archive:
+            index = json.loads(archive.read(INDEX_NAME))
+            if not isinstance(index, dict) or not isinstance(index.get("format"), int):
+                raise DownloadError("Not a QGIS Hub bundle")
+            if index["format"] > BUNDLE_FORMAT:
+                raise DownloadError(
+                    "The bundle was exported by a newer version of the plugin"
+                )
+
+            catalog = json.loads(gzip.decompress(archive.read(index["catalog"])))
+            if not isinstance(catalog.get("results"), list):
+                raise DownloadError("The catalog of the bundle is invalid")
+
+            validators = None
+            if index.get("validators"):
+                validators = json.loads(archive.read(index["validators"]))
+            replace_cached_catalog(catalog, validators, index["synced"])
+
+            thumbnails = index.get("thumbnails", [])
+            files = index.get("files", {})
+            steps = len(thumbnails) + len(files)
+            imported_thumbnails = 0
+            for step, entry in enumerate(thumbnails, 1):
+                _check_canceled(feedback)
+                uuid = entry.get("uuid") or ""
+                destination = resource_thumbnail_cache_path(entry.get("url"), uuid)
+                if destination is not None and _is_plain_name(uuid):
+                    # The original image or its PNG conversion
+                    destination = destination.with_suffix(Path(entry["name"]).suffix)
+                    _extract(archive, entry["name"], destination)
+                    imported_thumbnails += 1
+                _set_progress(feedback, step, steps)
+
+            for step, (url, name) in enumerate(files.items(), len(thumbnails) + 1):
+                _check_canceled(feedback)
+                _extract(archive, name, offline_file_path(url))
+                _set_progress(feedback, step, steps)
+    except (
+        OSError,
+        KeyError,
+        ValueError,
+        zipfile.BadZipFile,
+        gzip.BadGzipFile,
+        EOFError,
+        zlib.error,
+    ) as exc:
+        raise DownloadError(f"Failed to import the bundle: {exc}") from exc
+
+    return BundleSummary(len(catalog["results"]), imported_thumbnails, len(files))
+
+
+class BundleTask(QgsTask):
+    """Export or import an offline bundle in the background.
+
+    Exactly one of ``bundleDone`` (with the :class:`BundleSummary`) or
+    ``bundleFailed`` is emitted on the thread owning the task. The progress
+    is reported through the ``progressChanged`` signal of ``QgsTask``.
+    """
+
+    bundleDone = pyqtSignal(object)
+    bundleFailed = pyqtSignal(str)
+
+    def __init__(
+        self,
+        bundle_file: Path,
+        export: bool,
+        resource_uuids: Optional[Iterable[str]] = None,
+    ):
+        super().__init__(
+            "Exporting QGIS Hub bundle" if export else "Importing QGIS Hub bundle"
+        )
+        self.bundle_file = Path(bundle_file)
+        self.export = export
+        self.resource_uuids = list(resource_uuids or ())
+        self.summary = None
+        self.error = ""
+        self.feedback = QgsFeedback()
+        self.feedback.progressChanged.connect(self.setProgress)
+
+    def cancel(self):
+        self.feedback.cancel()
+        super().cancel()
+
+    def run(self) -> bool:
+        try:
+            if self.export:
+                self.summary = export_bundle(
+                    self.bundle_file, self.resource_uuids, self.feedback
+                )
+            else:
+                self.summary = import_bundle(self.bundle_file, self.feedback)
+        except Exception as exc:  # noqa: BLE001
+            self.error = str(exc)
+            return False
+        return True
+
+    def finished(self, result: bool):
+        if result:
+            self.bundleDone.emit(self.summary)
+        else:
+            PlgLogger.log(f"{self.description()} failed: {self.error}")
+            self.bundleFailed.emit(self.error or "Canceled")
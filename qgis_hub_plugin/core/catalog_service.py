@@ -0,0 +1,64 @@
+import threading
+from collections.abc import Hashable
+from typing import Any, Callable, Optional
+
+
+class CatalogService:
+    """Process-wide cache of the parsed catalog data.
+
+    Every entry is stored with the version of the file it was read from, e.g.
+    its modification time and size, and is reused by every dialog and task of
+    the QGIS session until that version changes. Cached values are shared:
+    callers must not modify them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[Hashable, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str, version: Optional[Hashable], load: Callable[[], Any]):
+        """Return the value cached under *name*, loading it again when it was
+        cached for another version.
+
+        Args:
+            name (str): The entry name, e.g. the path of the file.
+            version (Hashable, optional): The current version of the file.
+                Nothing is cached without a version, e.g. for a missing file.
+            load (Callable): Called to read the value when it is not cached.
+        """
+        if not version:
+            return load()
+
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == version:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # Loading can be slow, do not block the other consumers meanwhile
+        value = load()
+        self.put(name, version, value)
+        return value
+
+    def put(self, name: str, version: Optional[Hashable], value: Any):
+        """Cache a value that was just written, so it is not read back."""
+        with self._lock:
+            if version:
+                self._entries[name] = (version, value)
+            else:
+                self._entries.pop(name, None)
+
+    def invalidate(self, name: Optional[str] = None):
+        """Forget one entry, or all of them."""
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(name, None)
+
+
+# Shared by every consumer of the catalog in the QGIS session
+catalog_service = CatalogService()
@@ -0,0 +1,83 @@
+import marshal
+import zlib
+from pathlib import Path
+from typing import Optional
+
+from qgis_hub_plugin.utilities.files import atomic_write
+
+# Bump when the layout changes, older snapshots are then ignored
+SNAPSHOT_VERSION = 3
+
+# Fields the resource list needs. The others, mostly the long HTML
+# descriptions and the dependencies, are read from the catalog store when a
+# resource is previewed.
+LIST_FIELDS = (
+    "uuid",
+    "name",
+    "creator",
+    "resource_type",
+    "resource_subtype",
+    "resource_subtypes",
+    "download_count",
+    "upload_date",
+    "file",
+    "thumbnail",
+)
+
+# Stands for a field the resource does not have, marshal only stores
+# plain values so it cannot be a unique object.
+_MISSING = ("__missing__",)
+
+
+def list_record(resource: dict) -> dict:
+    """Return the fields of a resource the resource list needs."""
+    return {key: resource[key] for key in LIST_FIELDS if key in resource}
+
+
+def write_snapshot(snapshot_file: Path, resources: list[dict], source_version: str):
+    """Write the list fields of the resources to a snapshot file.
+
+    The fields are stored column by column with marshal, which loads plain
+    Python values much faster than the JSON parser, in a single read. The
+    columns are compressed with the fastest zlib level, which costs little
+    to decompress.
+
+    Args:
+        snapshot_file (Path): The snapshot file.
+        resources (list[dict]): The resources, in catalog order.
+        source_version (str): Version of the catalog the resources come from.
+    """
+    columns = tuple(
+        tuple(resource.get(key, _MISSING) for resource in resources)
+        for key in LIST_FIELDS
+    )
+    data = marshal.dumps((SNAPSHOT_VERSION, source_version, LIST_FIELDS, columns))
+    with atomic_write(snapshot_file) as f:
+        f.write(zlib.compress(data, 1))
+
+
+def load_snapshot(snapshot_file: Path, source_version: str) -> Optional[list[dict]]:
+    """Load the resources of a snapshot file.
+
+    Args:
+        snapshot_file (Path): The snapshot file.
+        source_version (str): Version of the catalog the snapshot must match.
+
+    Returns:
+        Optional[list[dict]]: The list fields of the resources, or None when
+            the snapshot is missing, outdated or unreadable (its marshal
+            format also depends on the Python version).
+    """
+    try:
+        with open(snapshot_file, "rb") as f:
+            data = zlib.decompress(f.read())
+        version, snapshot_source, fields, columns = marshal.loads(data)
+    except (OSError, zlib.error, EOFError, ValueError, TypeError):
+        return None
+    if version != SNAPSHOT_VERSION or snapshot_source != source_version:
+        return None
+
+    return [
+        {key: value for key, value in zip(fields, row) if value != _MISSING}
+        for row in zip(*columns)
+    ]
@@ -0,0 +1,324 @@
+import json
+import sqlite3
+import zlib
+from collections.abc import Iterable
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Union
+
+from qgis_hub_plugin.core.catalog_service import catalog_service
+from qgis_hub_plugin.core.catalog_snapshot import (
+    list_record,
+    load_snapshot,
+    write_snapshot,
+)
+from qgis_hub_plugin.utilities.common import normalize_resource_subtypes
+
+# Bump when the schema changes, the store is then rebuilt from the catalog
+SCHEMA_VERSION = 4
+
+# Largest dictionary zlib uses, and the number of records it is sampled from
+DICTIONARY_SIZE = 32768
+DICTIONARY_SAMPLES = 64
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS creators (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS resources (
+    position INTEGER PRIMARY KEY,
+    uuid TEXT UNIQUE,
+    resource_type TEXT,
+    name TEXT NOT NULL,
+    creator_id INTEGER REFERENCES creators (id),
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resources_type ON resources (resource_type);
+CREATE INDEX IF NOT EXISTS resources_creator ON resources (creator_id);
+CREATE TABLE IF NOT EXISTS resource_subtypes (
+    position INTEGER NOT NULL REFERENCES resources (position) ON DELETE CASCADE,
+    subtype TEXT NOT NULL,
+    PRIMARY KEY (position, subtype)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS resource_subtypes_subtype ON resource_subtypes (subtype);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class CatalogStore:
+    """Indexed local copy of the QGIS Hub catalog, stored in SQLite.
+
+    Resources keep the catalog order and are stored as the JSON record
+    returned by the API, next to the columns used to count and search them.
+    Names and creators are stored case folded for the search, the creators
+    once each, so their text is only matched once.
+    The records are compressed one by one with a dictionary sampled from the
+    catalog, which compresses them almost as well as the whole catalog.
+    An on-disk store also keeps a snapshot of the fields the resource list
+    needs, to open the browser without decoding every record.
+    """
+
+    def __init__(self, path: Union[Path, str]):
+        self.path = path
+        self.snapshot_file = (
+            None if str(path) == ":memory:" else Path(path).with_suffix(".snapshot")
+        )
+        self.connection = sqlite3.connect(str(path))
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        # The pages freed when the catalog shrinks are given back to the
+        # disk. Only taken into account before anything is written to a new
+        # file, or by a VACUUM.
+        self.connection.execute("PRAGMA auto_vacuum = FULL")
+        if self.snapshot_file is not None:
+            # Readers keep working while the background refresh writes
+            self.connection.execute("PRAGMA journal_mode = WAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            with self.connection:
+                for table in ("resource_subtypes", "resources", "creators", "metadata"):
+                    self.connection.execute(f"DROP TABLE IF EXISTS {table}")
+            self.connection.execute("VACUUM")
+        with self.connection:
+            self.connection.executescript(_SCHEMA)
+            self.connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.connection.close()
+
+    @property
+    def source_version(self) -> Optional[str]:
+        """Version of the cached catalog the store was built from."""
+        row = self.connection.execute(
+            "SELECT value FROM metadata WHERE key = 'source_version'"
+        ).fetchone()
+        return row[0] if row else None
+
+    def replace_all(self, resources: list[dict], source_version: str = ""):
+        """Replace the stored catalog with *resources* in a single transaction."""
+        dictionary = _dictionary(resources)
+        with self.connection:
+            self.connection.execute("DELETE FROM resource_subtypes")
+            self.connection.execute("DELETE FROM resources")
+            self.connection.execute("DELETE FROM creators")
+
+            creator_ids = {}
+            for position, resource in enumerate(resources):
+                creator = _search_key(resource.get("creator"))
+                if creator not in creator_ids:
+                    creator_ids[creator] = self.connection.execute(
+                        "INSERT INTO creators (name) VALUES (?)", (creator,)
+                    ).lastrowid
+
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO resources (position, uuid, "
+                    "resource_type, name, creator_id, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        position,
+                        resource.get("uuid"),
+                        resource.get("resource_type"),
+                        _search_key(resource.get("name")),
+                        creator_ids[creator],
+                        _compress(resource, dictionary),
+                    ),
+                )
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO resource_subtypes (position, subtype) "
+                    "VALUES (?, ?)",
+                    [
+                        (position, subtype)
+                        for subtype in normalize_resource_subtypes(resource)
+                        if subtype
+                    ],
+                )
+
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                [("source_version", source_version), ("dictionary", dictionary)],
+            )
+
+        if self.snapshot_file is not None:
+            # The write-ahead log holds a copy of every page written, it is
+            # otherwise kept at that size as long as a browser is open
+            self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            records = [list_record(resource) for resource in resources]
+            self._write_snapshot(records, source_version)
+            # Open browsers pick up the new list without reading it back
+            catalog_service.put(str(self.snapshot_file), source_version, records)
+
+    def _write_snapshot(self, resources: list[dict], source_version: str):
+        try:
+            write_snapshot(self.snapshot_file, resources, source_version)
+        except (OSError, ValueError):
+            # Only a faster way to open the browser, the store is the reference
+            self.snapshot_file.unlink(missing_ok=True)
+
+    def count(self, resource_types: Optional[Iterable[str]] = None) -> int:
+        """Count the resources, optionally only those of the given types."""
+        if resource_types is None:
+            query, params = "SELECT COUNT(*) FROM resources", []
+        else:
+            params = list(resource_types)
+            query = (
+                "SELECT COUNT(*) FROM resources "
+                f"WHERE resource_type IN ({_placeholders(params)})"
+            )
+        return self.connection.execute(query, params).fetchone()[0]
+
+    def resource_types(self) -> dict[str, int]:
+        """Return the number of resources of every resource type."""
+        rows = self.connection.execute(
+            "SELECT resource_type, COUNT(*) FROM resources "
+            "WHERE resource_type IS NOT NULL AND resource_type != '' "
+            "GROUP BY resource_type ORDER BY MIN(position)"
+        )
+        return dict(rows.fetchall())
+
+    def subtype_counts(self, resource_types: Iterable[str]) -> dict[str, int]:
+        """Return the number of resources of every subtype of the given types,
+        in order of first appearance in the catalog."""
+        params = list(resource_types)
+        rows = self.connection.execute(
+            "SELECT s.subtype, COUNT(*) FROM resource_subtypes s "
+            "JOIN resources r ON r.position = s.position "
+            f"WHERE r.resource_type IN ({_placeholders(params)}) "
+            "GROUP BY s.subtype ORDER BY MIN(r.position)",
+            params,
+        )
+        return dict(rows.fetchall())
+
+    def search(
+        self,
+        resource_types: Optional[Iterable[str]] = None,
+        subtype: Optional[str] = None,
+        text: str = "",
+    ) -> set[str]:
+        """Return the UUIDs of the resources matching every given filter.
+
+        Args:
+            resource_types (Iterable[str], optional): Only these types.
+            subtype (str, optional): Only resources having this subtype.
+            text (str): Only resources whose name or creator contains this
+                text, case insensitively.
+        """
+        clauses, params = [], []
+        if resource_types is not None:
+            types = list(resource_types)
+            clauses.append(f"resource_type IN ({_placeholders(types)})")
+            params.extend(types)
+        if subtype is not None:
+            clauses.append(
+                "position IN "
+                "(SELECT position FROM resource_subtypes WHERE subtype = ?)"
+            )
+            params.append(subtype)
+        text = _search_key(text)
+        if text:
+            clauses.append(
+                "(instr(name, ?) > 0 OR creator_id IN "
+                "(SELECT id FROM creators WHERE instr(name, ?) > 0))"
+            )
+            params.extend([text, text])
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.connection.execute(f"SELECT uuid FROM resources {where}", params)
+        return {uuid for (uuid,) in rows}
+
+    def resources(self) -> list[dict]:
+        """Return the stored resources in catalog order."""
+        with self._read_transaction():
+            dictionary = self._dictionary()
+            rows = self.connection.execute(
+                "SELECT data FROM resources ORDER BY position"
+            ).fetchall()
+        return [_decompress(data, dictionary) for (data,) in rows]
+
+    def list_resources(self) -> list[dict]:
+        """Return the fields of the stored resources the resource list needs,
+        in catalog order. Read from the snapshot when it is up to date, once
+        per version for the whole QGIS session. The list is shared, do not
+        modify it."""
+        if self.snapshot_file is None:
+            return self._load_list_resources()
+        return catalog_service.get(
+            str(self.snapshot_file), self.source_version, self._load_list_resources
+        )
+
+    def _load_list_resources(self) -> list[dict]:
+        source_version = self.source_version or ""
+        if self.snapshot_file is not None:
+            resources = load_snapshot(self.snapshot_file, source_version)
+            if resources is not None:
+                return resources
+
+        resources = [list_record(resource) for resource in self.resources()]
+        if self.snapshot_file is not None:
+            self._write_snapshot(resources, source_version)
+        return resources
+
+    def resource(self, uuid: str) -> Optional[dict]:
+        with self._read_transaction():
+            dictionary = self._dictionary()
+            row = self.connection.execute(
+                "SELECT data FROM resources WHERE uuid = ?", (uuid,)
+            ).fetchone()
+        return _decompress(row[0], dictionary) if row else None
+
+    @contextmanager
+    def _read_transaction(self):
+        """Read the records and the dictionary they were compressed with from
+        the same version of the catalog, while a refresh may replace both."""
+        self.connection.execute("BEGIN")
+        try:
+            yield
+        finally:
+            self.connection.execute("COMMIT")
+
+    def _dictionary(self) -> bytes:
+        row = self.connection.execute(
+            "SELECT value FROM metadata WHERE key = 'dictionary'"
+        ).fetchone()
+        return row[0] if row else b""
+
+
+def _dictionary(resources: list[dict]) -> bytes:
+    """Return a compression dictionary made of records spread over the
+    catalog. The strings they share, the field names, the URLs and the
+    usual words of the descriptions, are then only stored once."""
+    step = max(1, len(resources) // DICTIONARY_SAMPLES)
+    samples = b"".join(
+        json.dumps(resource).encode("utf-8") for resource in resources[::step]
+    )
+    # zlib favours the end of the dictionary
+    return samples[-DICTIONARY_SIZE:]
+
+
+def _compress(resource: dict, dictionary: bytes) -> bytes:
+    compressor = (
+        zlib.compressobj(zdict=dictionary) if dictionary else zlib.compressobj()
+    )
+    return (
+        compressor.compress(json.dumps(resource).encode("utf-8")) + compressor.flush()
+    )
+
+
+def _decompress(data: bytes, dictionary: bytes) -> dict:
+    decompressor = (
+        zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+    )
+    return json.loads(decompressor.decompress(data) + decompressor.flush())
+
+
+def _search_key(text: Optional[str]) -> str:
+    return (text or "").strip().casefold()
+
+
+def _placeholders(values: list) -> str:
+    return ", ".join("?" * len(values))
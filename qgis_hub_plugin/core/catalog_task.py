@@ -0,0 +1,267 @@
+import threading
+from datetime import timedelta
+from typing import Callable, Optional
+
+from qgis.core import QgsApplication, QgsFeedback, QgsTask
+from qgis.PyQt.QtCore import pyqtSignal
+
+from qgis_hub_plugin.core.api_client import (
+    API_UNAVAILABLE_MESSAGE,
+    catalog_is_stale,
+    get_all_resources,
+    sync_resources,
+)
+from qgis_hub_plugin.toolbelt import PlgLogger
+from qgis_hub_plugin.utilities.common import (
+    download_resource_thumbnail,
+    is_resource_thumbnail_cached,
+    resource_thumbnail_cache_path,
+)
+from qgis_hub_plugin.utilities.exception import DownloadError
+from qgis_hub_plugin.utilities.single_flight import refresh_flights
+
+# Seconds between two checks of the cancellation while waiting for the
+# refresh of another task
+REFRESH_WAIT_INTERVAL = 0.1
+
+
+class _PageRelay:
+    """Hand the pages of a shared refresh to every task waiting for it, the
+    pages received before a task joined first."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pages: list[list] = []
+        self._listeners: list[Callable[[list], None]] = []
+        # Whether the refresh stopped because its own task was canceled
+        self.canceled = False
+
+    def publish(self, resources: list):
+        with self._lock:
+            self._pages.append(resources)
+            for listener in self._listeners:
+                listener(resources)
+
+    def subscribe(self, listener: Callable[[list], None]):
+        with self._lock:
+            for resources in self._pages:
+                listener(resources)
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[list], None]):
+        with self._lock:
+            self._listeners.remove(listener)
+
+
+class CatalogRefreshTask(QgsTask):
+    """Revalidate the cached catalog against the QGIS Hub in the background.
+
+    The signals are emitted on the thread owning the task (the GUI thread),
+    ``pageReceived`` once per downloaded page and then one of
+    ``catalogRefreshed``, ``refreshFailed`` or ``refreshCanceled``. Unless
+    *full* is set, only the resources uploaded since the last sync are
+    downloaded when possible. The download progress is reported through the
+    ``progressChanged`` signal of ``QgsTask``. When the whole catalog is
+    downloaded, it is downloaded one of the *resource_types* at a time, the
+    first ones first.
+
+    Tasks running at the same time, e.g. the background refresh, the startup
+    prefetch and the resource browser, share a single refresh: a task started
+    while an identical one runs waits for its catalog and receives its pages.
+    """
+
+    pageReceived = pyqtSignal(list)
+    catalogRefreshed = pyqtSignal(dict)
+    refreshFailed = pyqtSignal(str)
+    refreshCanceled = pyqtSignal()
+
+    def __init__(
+        self,
+        description: str = "Refreshing QGIS Hub resources",
+        full: bool = False,
+        resource_types: Optional[list[str]] = None,
+    ):
+        super().__init__(description)
+        self.full = full
+        self.resource_types = resource_types
+        self.catalog = None
+        self.error = ""
+        self.feedback = QgsFeedback()
+        self.feedback.progressChanged.connect(self.setProgress)
+
+    def cancel(self):
+        # Aborts the requests in flight instead of waiting for them
+        self.feedback.cancel()
+        super().cancel()
+
+    def run(self) -> bool:
+        try:
+            self.catalog = self._shared_refresh()
+        except Exception as exc:  # noqa: BLE001
+            self.error = str(exc)
+            return False
+        return self.catalog is not None
+
+    def _shared_refresh(self) -> Optional[dict]:
+        """Refresh the catalog, or wait for the identical refresh of another
+        task. A refresh stopped by the cancellation of its own task is run
+        again by the tasks waiting for it."""
+        listener = self.pageReceived.emit
+        while True:
+            started = False
+
+            def start_flight():
+                nonlocal started
+                started = True
+                return _PageRelay()
+
+            flight = refresh_flights.join(self.full, start_flight)
+            relay = flight.handle
+            relay.subscribe(listener)
+            try:
+                if started:
+                    try:
+                        catalog = self._refresh(relay.publish)
+                    except Exception as exc:
+                        relay.canceled = self.feedback.isCanceled()
+                        refresh_flights.land(flight, exc)
+                        raise
+                    refresh_flights.land(flight, catalog)
+                    return catalog
+
+                while not flight.wait(REFRESH_WAIT_INTERVAL):
+                    if self.feedback.isCanceled():
+                        raise DownloadError("Download canceled")
+            finally:
+                relay.unsubscribe(listener)
+
+            if not isinstance(flight.result, Exception):
+                return flight.result
+            if not relay.canceled:
+                raise flight.result
+
+    def _refresh(self, on_page: Callable[[list], None]) -> Optional[dict]:
+        if self.full:
+            return get_all_resources(
+                force_update=True,
+                on_page=on_page,
+                feedback=self.feedback,
+                resource_types=self.resource_types,
+            )
+        return sync_resources(
+            on_page=on_page,
+            feedback=self.feedback,
+            resource_types=self.resource_types,
+        )
+
+    def finished(self, result: bool):
+        if result:
+            self.catalogRefreshed.emit(self.catalog)
+        elif self.isCanceled():
+            PlgLogger.log("Refreshing resources canceled")
+            self.refreshCanceled.emit()
+        else:
+            PlgLogger.log(f"Failed to refresh resources: {self.error}")
+            self.refreshFailed.emit(self.error or API_UNAVAILABLE_MESSAGE)
+
+
+class CatalogPrefetchTask(CatalogRefreshTask):
+    """Warm the caches used by the resource browser, so that its first opening
+    does not wait on the network.
+
+    The catalog is synchronized when it is older than *ttl*, then the missing
+    thumbnails of its resources are downloaded. A thumbnail failing to
+    download is only logged, the resource browser tries it again.
+    """
+
+    def __init__(
+        self,
+        ttl: timedelta,
+        description: str = "Prefetching QGIS Hub resources",
+    ):
+        super().__init__(description)
+        self.ttl = ttl
+        self.thumbnails_downloaded = 0
+
+    def run(self) -> bool:
+        if catalog_is_stale(self.ttl):
+            if not super().run():
+                return False
+        else:
+            try:
+                self.catalog = get_all_resources(cache_only=True)
+            except DownloadError as exc:
+                self.error = str(exc)
+                return False
+            if self.catalog is None:
+                return False
+
+        missing = [
+            resource
+            for resource in self.catalog.get("results", [])
+            if resource_thumbnail_cache_path(
+                resource.get("thumbnail"), resource.get("uuid")
+            )
+            is not None
+            and not is_resource_thumbnail_cached(
+                resource.get("thumbnail"), resource.get("uuid")
+            )
+        ]
+        for index, resource in enumerate(missing):
+            if self.isCanceled():
+                return False
+            try:
+                download_resource_thumbnail(
+                    resource.get("thumbnail"), resource.get("uuid")
+                )
+                self.thumbnails_downloaded += 1
+            except DownloadError as exc:
+                PlgLogger.log(f"Failed to prefetch a thumbnail: {exc}")
+            self.setProgress(100 * (index + 1) / len(missing))
+        return True
+
+
+def get_all_resources_async(
+    on_finished: Callable[[dict], None],
+    on_failed: Optional[Callable[[str], None]] = None,
+    on_progress: Optional[Callable[[float], None]] = None,
+    on_page: Optional[Callable[[list], None]] = None,
+    on_canceled: Optional[Callable[[], None]] = None,
+    full: bool = False,
+    resource_types: Optional[list[str]] = None,
+) -> CatalogRefreshTask:
+    """Refresh the catalog in the background, without blocking the caller.
+
+    The callbacks are called on the GUI thread. Headless consumers need a
+    running Qt event loop for them to be called.
+
+    Args:
+        on_finished (Callable): Called with the up to date catalog.
+        on_failed (Callable, optional): Called with the error message when the
+            QGIS Hub cannot be reached.
+        on_progress (Callable, optional): Called with the download progress,
+            in percent.
+        on_page (Callable, optional): Called with the resources of each page as
+            soon as it is downloaded.
+        on_canceled (Callable, optional): Called when the task is canceled,
+            instead of ``on_finished`` or ``on_failed``.
+        full (bool): Revalidate the whole catalog instead of downloading the
+            resources uploaded since the last sync. Defaults to False.
+        resource_types (list[str], optional): Download the whole catalog one
+            resource type at a time, the first ones first.
+
+    Returns:
+        CatalogRefreshTask: The running task, ``cancel()`` stops it.
+    """
+    task = CatalogRefreshTask(full=full, resource_types=resource_types)
+    task.catalogRefreshed.connect(on_finished)
+    if on_failed is not None:
+        task.refreshFailed.connect(on_failed)
+    if on_progress is not None:
+        task.progressChanged.connect(on_progress)
+    if on_page is not None:
+        task.pageReceived.connect(on_page)
+    if on_canceled is not None:
+        task.refreshCanceled.connect(on_canceled)
+    QgsApplication.taskManager().addTask(task)
+    return task
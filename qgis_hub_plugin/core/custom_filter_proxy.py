@@ -4,6 +4,7 @@ from qgis_hub_plugin.gui.constants import (
     ResourceSubtypeRole,
     ResourceTypeRole,
     SortingRole,
+    UuidRole,
 )
 from qgis_hub_plugin.toolbelt import PlgLogger
 
@@ -13,6 +14,9 @@ class MultiRoleFilterProxyModel(QSortFilterProxyModel):
         super().__init__(parent)
         self.roles_to_filter = []
         self.checkbox_states = {}
+        # UUIDs of the rows to show, found in the catalog store. The other
+        # filters are only used while it is None.
+        self.accepted_uuids = None
         self.log = PlgLogger().log
 
     # Custom sorting by integer
@@ -37,8 +41,16 @@ class MultiRoleFilterProxyModel(QSortFilterProxyModel):
         self.checkbox_states = checkbox_states
         self.invalidateFilter()
 
+    def setAcceptedUuids(self, accepted_uuids):
+        self.accepted_uuids = accepted_uuids
+        self.invalidateFilter()
+
     def filterAcceptsRow(self, source_row, source_parent):
         model = self.sourceModel()
+        if self.accepted_uuids is not None:
+            index = model.index(source_row, 0, source_parent)
+            return model.data(index, UuidRole) in self.accepted_uuids
+
         if not self.roles_to_filter or not self.checkbox_states:
             return True
 
@@ -0,0 +1,139 @@
+import codecs
+import json
+import re
+
+# Characters changing the nesting level, and the start of strings which may
+# contain them
+_TOKEN = re.compile(r'[{}\[\]"]')
+# Rest of a string after its opening quote
+_STRING_END = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# Between two resources of the results array
+_SEPARATOR = re.compile(r"[\s,]*")
+
+_DECODER = json.JSONDecoder()
+
+
+class ResultsStreamParser:
+    """Incremental parser of a catalog page, e.g. ``{"total": 2, "results":
+    [{...}, {...}]}``, fed with the bytes of the body as they arrive.
+
+    The resources of the top-level ``results`` array are decoded as soon as
+    they are complete, the other members of the page once it is complete.
+    """
+
+    def __init__(self, key: str = "results"):
+        self.key = key
+        self.resources: list[dict] = []
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        # Next character of the buffer to scan
+        self._pos = 0
+        self._depth = 0
+        self._last_key = None
+        self._in_results = False
+        self._results_done = False
+        # The page without its resources, and how much of the buffer is in it
+        self._skeleton = []
+        self._copied = 0
+
+    def feed(self, data: bytes) -> list[dict]:
+        """Parse the next bytes of the body.
+
+        Returns:
+            list[dict]: The resources completed by these bytes.
+
+        Raises:
+            ValueError: If the body is not valid UTF-8 or not a JSON page. An
+                invalid resource is only reported by finish(), until then it
+                cannot be told apart from a resource not received yet.
+        """
+        self._buffer += self._decoder.decode(data)
+        resources = self._scan()
+        self.resources.extend(resources)
+        return resources
+
+    def finish(self) -> dict:
+        """Return the whole page once its body is completely fed.
+
+        Raises:
+            ValueError: If the body is incomplete or not valid JSON.
+        """
+        self._buffer += self._decoder.decode(b"", final=True)
+        self.resources.extend(self._scan(final=True))
+        if self._depth != 0:
+            raise ValueError("Incomplete JSON document")
+        page = json.loads("".join(self._skeleton) + self._buffer[self._copied :])
+        if self._results_done and isinstance(page, dict):
+            page[self.key] = self.resources
+        return page
+
+    def _scan(self, final: bool = False) -> list[dict]:
+        buffer = self._buffer
+        pos = self._pos
+        resources = []
+        while True:
+            if self._in_results:
+                pos = _SEPARATOR.match(buffer, pos).end()
+                if pos == len(buffer):
+                    break
+                if buffer[pos] == "]":
+                    # End of the results array, the rest is in the skeleton
+                    self._in_results = False
+                    self._results_done = True
+                    self._depth -= 1
+                    self._copied = pos
+                    pos += 1
+                    continue
+                if buffer[pos] != "{":
+                    raise ValueError(f"Expected a resource at {pos}")
+                # A resource fails to decode until it is completely received
+                try:
+                    resource, pos = _DECODER.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    break
+                resources.append(resource)
+                continue
+
+            match = _TOKEN.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            index = match.start()
+            char = match.group()
+            if char == '"':
+                end = _STRING_END.match(buffer, index + 1)
+                if end is None:
+                    # Wait for the end of the string
+                    pos = index
+                    break
+                if self._depth == 1:
+                    self._last_key = buffer[index + 1 : end.end() - 1]
+                pos = end.end()
+                continue
+
+            if char in "{[":
+                if (
+                    char == "["
+                    and self._depth == 1
+                    and self._last_key == self.key
+                    and not self._results_done
+                ):
+                    # The resources are kept out of the skeleton
+                    self._in_results = True
+                    self._skeleton.append(buffer[self._copied : index + 1])
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth < 0:
+                    raise ValueError("Unbalanced JSON document")
+            pos = index + 1
+
+        # Drop what is parsed
+        if not self._in_results:
+            self._skeleton.append(buffer[self._copied : pos])
+        self._buffer = buffer[pos:]
+        self._pos = 0
+        self._copied = 0
+        return resources
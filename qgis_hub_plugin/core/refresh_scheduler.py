@@ -0,0 +1,95 @@
+import random
+from datetime import timedelta
+
+from qgis.core import QgsApplication
+from qgis.PyQt.QtCore import QObject, QTimer
+
+from qgis_hub_plugin.core.api_client import catalog_is_stale
+from qgis_hub_plugin.core.catalog_task import CatalogPrefetchTask, CatalogRefreshTask
+from qgis_hub_plugin.toolbelt import PlgLogger, PlgOptionsManager
+
+# Every check is delayed by up to this fraction of the interval, either way,
+# so that QGIS clients started together do not query the QGIS Hub together.
+REFRESH_JITTER = 0.2
+# Below the default priority of the task manager, the tasks started by the
+# user go first
+PREFETCH_PRIORITY = -1
+
+
+def jittered_interval(interval_minutes: int) -> int:
+    """Return the delay before the next check in milliseconds."""
+    jitter = random.uniform(-REFRESH_JITTER, REFRESH_JITTER)
+    return int(interval_minutes * 60000 * (1 + jitter))
+
+
+class CatalogRefreshScheduler(QObject):
+    """Refresh the cached catalog in the background while QGIS is running.
+
+    Every ``refresh_interval`` minutes, give or take the jitter, the catalog
+    is synchronized if it is older than ``catalog_ttl``. The settings are
+    read again before every check, a change applies from the next one, or
+    right away with ``apply_settings()``.
+
+    When ``prefetch_on_startup`` is enabled, ``prefetch()`` also warms the
+    catalog and thumbnail caches once QGIS has finished loading.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.log = PlgLogger().log
+        self.task = None
+        # Interval of the scheduled check, in minutes
+        self.interval = 0
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.check)
+
+    def start(self):
+        """Schedule the next check, unless the automatic refresh is disabled."""
+        self.interval = PlgOptionsManager.get_plg_settings().refresh_interval
+        if self.interval <= 0:
+            self.timer.stop()
+            return
+        self.timer.start(jittered_interval(self.interval))
+
+    def apply_settings(self):
+        """Reschedule the next check when the refresh interval was changed,
+        e.g. to enable the automatic refresh again."""
+        interval = PlgOptionsManager.get_plg_settings().refresh_interval
+        if interval != self.interval:
+            self.start()
+
+    def stop(self):
+        self.timer.stop()
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    def check(self):
+        settings = PlgOptionsManager.get_plg_settings()
+        if self.task is None and catalog_is_stale(
+            timedelta(minutes=settings.catalog_ttl)
+        ):
+            self.log("Refreshing the outdated resource catalog in the background")
+            self.task = CatalogRefreshTask("Refreshing QGIS Hub resources")
+            self.task.catalogRefreshed.connect(self.on_task_done)
+            self.task.refreshFailed.connect(self.on_task_done)
+            self.task.refreshCanceled.connect(self.on_task_done)
+            QgsApplication.taskManager().addTask(self.task)
+        self.start()
+
+    def prefetch(self):
+        """Start warming the caches of the resource browser in the background,
+        unless disabled or another refresh is running."""
+        settings = PlgOptionsManager.get_plg_settings()
+        if not settings.prefetch_on_startup or self.task is not None:
+            return
+        self.log("Prefetching the resource catalog and thumbnails")
+        self.task = CatalogPrefetchTask(timedelta(minutes=settings.catalog_ttl))
+        self.task.catalogRefreshed.connect(self.on_task_done)
+        self.task.refreshFailed.connect(self.on_task_done)
+        self.task.refreshCanceled.connect(self.on_task_done)
+        QgsApplication.taskManager().addTask(self.task, PREFETCH_PRIORITY)
+
+    def on_task_done(self, *args):
+        self.task = None
@@ -7,14 +7,24 @@ Plugin settings form integrated into QGIS 'Options' menu.
 # standard
 from functools import partial
 from pathlib import Path
+from typing import Callable, Optional
 
 # PyQGIS
 from qgis.core import QgsApplication
 from qgis.gui import QgsOptionsPageWidget, QgsOptionsWidgetFactory
 from qgis.PyQt import uic
-from qgis.PyQt.QtCore import QUrl
+from qgis.PyQt.QtCore import Qt, QUrl
 from qgis.PyQt.QtGui import QDesktopServices, QIcon
-from qgis.PyQt.QtWidgets import QMessageBox
+from qgis.PyQt.QtWidgets import (
+    QDialog,
+    QDialogButtonBox,
+    QFileDialog,
+    QLineEdit,
+    QListWidget,
+    QListWidgetItem,
+    QMessageBox,
+    QVBoxLayout,
+)
 
 # project
 from qgis_hub_plugin.__about__ import (
@@ -24,9 +34,15 @@ from qgis_hub_plugin.__about__ import (
     __uri_tracker__,
     __version__,
 )
+from qgis_hub_plugin.core.api_client import get_all_resources
+from qgis_hub_plugin.core.bundle import BUNDLE_SUFFIX, BundleTask
 from qgis_hub_plugin.toolbelt import PlgLogger, PlgOptionsManager
 from qgis_hub_plugin.toolbelt.preferences import PlgSettingsStructure
 from qgis_hub_plugin.utilities.common import clear_cache
+from qgis_hub_plugin.utilities.download_manager import download_manager
+from qgis_hub_plugin.utilities.endpoints import endpoint_selector, parse_endpoints
+from qgis_hub_plugin.utilities.exception import DownloadError
+from qgis_hub_plugin.utilities.metrics import transfer_metrics
 
 # ############################################################################
 # ########## Globals ###############
@@ -43,10 +59,12 @@ FORM_CLASS, _ = uic.loadUiType(Path(__file__).parent / f"{Path(__file__).stem}.u
 class ConfigOptionsPage(FORM_CLASS, QgsOptionsPageWidget):
     """Settings form embedded into QGIS 'options' menu."""
 
-    def __init__(self, parent):
+    def __init__(self, parent, on_apply: Optional[Callable[[], None]] = None):
         super().__init__(parent)
         self.log = PlgLogger().log
         self.plg_settings = PlgOptionsManager()
+        # Applies the saved settings to the running plugin
+        self.on_apply = on_apply
 
         # load UI and set objectName
         self.setupUi(self)
@@ -76,6 +94,30 @@ class ConfigOptionsPage(FORM_CLASS, QgsOptionsPageWidget):
         )
         self.btn_clear_cache.pressed.connect(self.clear_cache)
 
+        self.bundle_task = None
+        self.btn_export_bundle.setIcon(
+            QIcon(QgsApplication.iconPath("mActionFileSave.svg"))
+        )
+        self.btn_export_bundle.pressed.connect(self.export_bundle)
+        self.btn_import_bundle.setIcon(
+            QIcon(QgsApplication.iconPath("mActionFileOpen.svg"))
+        )
+        self.btn_import_bundle.pressed.connect(self.import_bundle)
+
+        self.btn_refresh_metrics.setIcon(
+            QIcon(QgsApplication.iconPath("mActionRefresh.svg"))
+        )
+        self.btn_refresh_metrics.pressed.connect(self.show_transfer_metrics)
+        self.btn_export_metrics.setIcon(
+            QIcon(QgsApplication.iconPath("mActionFileSave.svg"))
+        )
+        self.btn_export_metrics.pressed.connect(self.export_transfer_metrics)
+        self.btn_reset_metrics.setIcon(
+            QIcon(QgsApplication.iconPath("mActionUndo.svg"))
+        )
+        self.btn_reset_metrics.pressed.connect(self.reset_transfer_metrics)
+        self.show_transfer_metrics()
+
         # load previously saved settings
         self.load_settings()
 
@@ -85,12 +127,28 @@ class ConfigOptionsPage(FORM_CLASS, QgsOptionsPageWidget):
         dialog is accepted."""
         settings = self.plg_settings.get_plg_settings()
 
+        # catalog
+        settings.catalog_ttl = self.sbx_catalog_ttl.value()
+        settings.refresh_interval = self.sbx_refresh_interval.value()
+        settings.hub_mirrors = ", ".join(parse_endpoints(self.lne_hub_mirrors.text()))
+        endpoint_selector.set_mirrors(parse_endpoints(settings.hub_mirrors))
+        settings.prefetch_on_startup = self.opt_prefetch_on_startup.isChecked()
+
+        # downloads
+        settings.max_downloads = self.sbx_max_downloads.value()
+        settings.max_downloads_per_host = self.sbx_max_downloads_per_host.value()
+        download_manager.set_limits(
+            settings.max_downloads, settings.max_downloads_per_host
+        )
+
         # misc
         settings.debug_mode = self.opt_debug.isChecked()
         settings.version = __version__
 
         # dump new settings into QgsSettings
         self.plg_settings.save_from_object(settings)
+        if self.on_apply is not None:
+            self.on_apply()
 
         if __debug__:
             self.log(
@@ -102,6 +160,16 @@ class ConfigOptionsPage(FORM_CLASS, QgsOptionsPageWidget):
         """Load options from QgsSettings into UI form."""
         settings = self.plg_settings.get_plg_settings()
 
+        # catalog
+        self.sbx_catalog_ttl.setValue(settings.catalog_ttl)
+        self.sbx_refresh_interval.setValue(settings.refresh_interval)
+        self.lne_hub_mirrors.setText(settings.hub_mirrors)
+        self.opt_prefetch_on_startup.setChecked(settings.prefetch_on_startup)
+
+        # downloads
+        self.sbx_max_downloads.setValue(settings.max_downloads)
+        self.sbx_max_downloads_per_host.setValue(settings.max_downloads_per_host)
+
         # global
         self.opt_debug.setChecked(settings.debug_mode)
         self.lbl_version_saved_value.setText(settings.version)
@@ -144,6 +212,212 @@ class ConfigOptionsPage(FORM_CLASS, QgsOptionsPageWidget):
             ),
         )
 
+    def export_bundle(self):
+        """Export the catalog, the thumbnails and optionally the files of the
+        resources picked by the user to an offline bundle, in the
+        background."""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            self.tr("Export QGIS Hub bundle"),
+            f"qgis_hub{BUNDLE_SUFFIX}",
+            self.tr("QGIS Hub bundle (*{suffix})").format(suffix=BUNDLE_SUFFIX),
+        )
+        if not file_path:
+            return
+
+        resource_uuids = []
+        if self.opt_bundle_files.isChecked():
+            try:
+                catalog = get_all_resources(cache_only=True) or {}
+            except DownloadError:
+                catalog = {}
+            if not catalog.get("results"):
+                self.log(
+                    message=self.tr(
+                        "Open the resource browser once to download the catalog "
+                        "before picking the resource files to bundle."
+                    ),
+                    log_level=1,
+                    push=True,
+                )
+                return
+            resource_uuids = self.select_bundle_resources(catalog["results"])
+            if resource_uuids is None:
+                return
+        self.start_bundle_task(BundleTask(file_path, True, resource_uuids))
+
+    def select_bundle_resources(self, resources: list) -> Optional[list]:
+        """Let the user pick the resources whose file is bundled, none by
+        default since the files can be large.
+
+        Returns:
+            list: The UUIDs of the picked resources, None when canceled.
+        """
+        dialog = QDialog(self)
+        dialog.setWindowTitle(self.tr("Resource files to bundle"))
+        layout = QVBoxLayout(dialog)
+        search = QLineEdit(dialog)
+        search.setPlaceholderText(self.tr("Filter by name or type"))
+        layout.addWidget(search)
+        resource_list = QListWidget(dialog)
+        layout.addWidget(resource_list)
+        for resource in sorted(
+            resources,
+            key=lambda r: (r.get("resource_type") or "", r.get("name") or ""),
+        ):
+            if not resource.get("file"):
+                continue
+            item = QListWidgetItem(
+                f"{resource.get('name')} ({resource.get('resource_type')})"
+            )
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Unchecked)
+            item.setData(Qt.ItemDataRole.UserRole, resource.get("uuid"))
+            resource_list.addItem(item)
+
+        def filter_items(text):
+            for row in range(resource_list.count()):
+                item = resource_list.item(row)
+                item.setHidden(text.lower() not in item.text().lower())
+
+        search.textChanged.connect(filter_items)
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel,
+            dialog,
+        )
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+
+        if not dialog.exec():
+            return None
+        return [
+            resource_list.item(row).data(Qt.ItemDataRole.UserRole)
+            for row in range(resource_list.count())
+            if resource_list.item(row).checkState() == Qt.CheckState.Checked
+        ]
+
+    def import_bundle(self):
+        """Import an offline bundle into the cache, in the background."""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            self.tr("Import QGIS Hub bundle"),
+            "",
+            self.tr("QGIS Hub bundle (*{suffix})").format(suffix=BUNDLE_SUFFIX),
+        )
+        if not file_path:
+            return
+        self.start_bundle_task(BundleTask(file_path, False))
+
+    def start_bundle_task(self, task: BundleTask):
+        """Run a bundle task, reporting its outcome in the message bar since
+        the options dialog may be closed by then."""
+        self.bundle_task = task
+        self.btn_export_bundle.setEnabled(False)
+        self.btn_import_bundle.setEnabled(False)
+
+        def on_done(summary):
+            self.log(
+                message=self.tr(
+                    "{task}: {resources} resources, {thumbnails} thumbnails, "
+                    "{files} files."
+                ).format(
+                    task=task.description(),
+                    resources=summary.resources,
+                    thumbnails=summary.thumbnails,
+                    files=summary.files,
+                ),
+                log_level=3,
+                push=True,
+            )
+
+        def on_failed(error: str):
+            self.log(
+                message=self.tr("{task} failed: {err}").format(
+                    task=task.description(), err=error
+                ),
+                log_level=2,
+                push=True,
+            )
+
+        def on_ended(*args):
+            try:
+                self.bundle_task = None
+                self.btn_export_bundle.setEnabled(True)
+                self.btn_import_bundle.setEnabled(True)
+            except RuntimeError:
+                # The options dialog was closed meanwhile
+                pass
+
+        task.bundleDone.connect(on_done)
+        task.bundleFailed.connect(on_failed)
+        task.taskCompleted.connect(on_ended)
+        task.taskTerminated.connect(on_ended)
+        QgsApplication.taskManager().addTask(task)
+
+    def show_transfer_metrics(self):
+        """Show the summary of the requests sent to the QGIS Hub, overall and
+        per host."""
+
+        def seconds(value) -> str:
+            return "-" if value is None else f"{value * 1000:.0f} ms"
+
+        summary = transfer_metrics.summary()
+        lines = []
+        for name, stats in (
+            (self.tr("All hosts"), summary["overall"]),
+            *summary["hosts"].items(),
+        ):
+            outcomes = ", ".join(
+                f"{outcome} {count}"
+                for outcome, count in sorted(stats["outcomes"].items())
+            )
+            throughput = stats["throughput"]
+            lines.append(
+                self.tr(
+                    "{name}: {requests} requests ({outcomes}), {size:.1f} MB "
+                    "received at {speed}\n"
+                    "    median {duration} (p95 {p95}), first byte {ttfb}, "
+                    "TLS {tls}"
+                ).format(
+                    name=name,
+                    requests=stats["requests"],
+                    outcomes=outcomes or "-",
+                    size=stats["bytes_received"] / 1024 / 1024,
+                    speed=(
+                        "-" if throughput is None else f"{throughput / 1024:.0f} kB/s"
+                    ),
+                    duration=seconds(stats["duration_median"]),
+                    p95=seconds(stats["duration_p95"]),
+                    ttfb=seconds(stats["first_byte_median"]),
+                    tls=seconds(stats["tls_median"]),
+                )
+            )
+        self.txt_transfer_metrics.setPlainText("\n".join(lines))
+
+    def export_transfer_metrics(self):
+        """Save the transfer metrics to a JSON file."""
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            self.tr("Export network metrics"),
+            "qgis_hub_metrics.json",
+            self.tr("JSON (*.json)"),
+        )
+        if not file_path:
+            return
+        try:
+            transfer_metrics.export(Path(file_path))
+        except OSError as exc:
+            QMessageBox.warning(
+                self,
+                self.tr("Export network metrics"),
+                self.tr("Failed to export the metrics: {err}").format(err=exc),
+            )
+
+    def reset_transfer_metrics(self):
+        transfer_metrics.reset()
+        self.show_transfer_metrics()
+
     def reset_settings(self):
         """Reset settings to default values (set in preferences.py module)."""
         default_settings = PlgSettingsStructure()
@@ -158,9 +432,15 @@ class ConfigOptionsPage(FORM_CLASS, QgsOptionsPageWidget):
 class PlgOptionsFactory(QgsOptionsWidgetFactory):
     """Factory for options widget."""
 
-    def __init__(self):
-        """Constructor."""
+    def __init__(self, on_apply: Optional[Callable[[], None]] = None):
+        """Constructor.
+
+        :param on_apply: Called once the settings are saved, to apply them to \
+        the running plugin.
+        :type on_apply: Callable, optional
+        """
         super().__init__()
+        self.on_apply = on_apply
 
     def icon(self) -> QIcon:
         """Returns plugin icon, used to as tab icon in QGIS options tab widget.
@@ -179,7 +459,7 @@ class PlgOptionsFactory(QgsOptionsWidgetFactory):
         :return: options page for tab widget
         :rtype: ConfigOptionsPage
         """
-        return ConfigOptionsPage(parent)
+        return ConfigOptionsPage(parent, self.on_apply)
 
     def title(self) -> str:
         """Returns plugin title, used to name the tab in QGIS options tab widget.
@@ -1,6 +1,8 @@
 import os
+import sqlite3
 import tempfile
 import zipfile
+from datetime import timedelta
 from functools import partial
 from pathlib import Path
 
@@ -37,7 +39,10 @@ from qgis.PyQt.QtWidgets import (
 )
 
 from qgis_hub_plugin.__about__ import __uri_homepage__
-from qgis_hub_plugin.core.api_client import get_all_resources
+from qgis_hub_plugin.core.api_client import catalog_is_stale, get_catalog_store
+from qgis_hub_plugin.core.catalog_snapshot import list_record
+from qgis_hub_plugin.core.catalog_store import CatalogStore
+from qgis_hub_plugin.core.catalog_task import CatalogRefreshTask
 from qgis_hub_plugin.core.custom_filter_proxy import MultiRoleFilterProxyModel
 from qgis_hub_plugin.gui.constants import (
     CreatorRole,
@@ -54,8 +59,10 @@ from qgis_hub_plugin.utilities.common import (
     download_file,
     download_resource_thumbnail,
     is_resource_thumbnail_cached,
-    normalize_resource_subtypes,
+    resource_thumbnail_cache_path,
 )
+from qgis_hub_plugin.utilities.download_manager import download_manager
+from qgis_hub_plugin.utilities.download_queue import DONE
 from qgis_hub_plugin.utilities.exception import DownloadError
 from qgis_hub_plugin.utilities.qgis_util import show_busy_cursor
 
@@ -101,7 +108,22 @@ class ResourceBrowserDialog(QDialog, UI_CLASS):
 
         # Resources
         self.resources = []
+        # Indexed catalog queried by the category tree, the search and the
+        # preview
+        self.catalog_store = CatalogStore(":memory:")
         self.selected_resource = None
+        self._thumbnail_progress_bar = None
+        self._thumbnail_progress_widget = None
+        # List fields of the resources shown in the model, and their items,
+        # keyed by uuid
+        self.displayed_resources = {}
+        self.resource_items = {}
+        # Uuids of the resources whose thumbnail is being downloaded, keyed
+        # by download job
+        self.thumbnail_jobs = {}
+        download_manager.downloadFinished.connect(self.on_download_finished)
+        self.refresh_task = None
+        self.streaming_pages = False
         self.filter_states = {}
         self.update_filter_states()
 
@@ -110,7 +132,11 @@ class ResourceBrowserDialog(QDialog, UI_CLASS):
         self.proxy_model = MultiRoleFilterProxyModel()
         self.proxy_model.setSourceModel(self.resource_model)
 
-        # Now setup tree widget which depends on proxy_model
+        # Now setup tree widget which depends on proxy_model. Connected once,
+        # the tree is rebuilt on every refresh.
+        self.treeWidgetCategories.itemSelectionChanged.connect(
+            self.on_tree_selection_changed
+        )
         self.setup_resource_type_tree()
 
         self.listViewResources.setModel(self.proxy_model)
@@ -161,6 +187,7 @@ class ResourceBrowserDialog(QDialog, UI_CLASS):
             lambda: self.populate_resources(force_update=True)
         )
         self.buttonBox.rejected.connect(self.store_setting)
+        self.buttonBox.rejected.connect(self.close_catalog_store)
 
         # Match with the size of the thumbnail
         self.iconSizeSlider.setMinimum(20)
@@ -172,8 +199,34 @@ class ResourceBrowserDialog(QDialog, UI_CLASS):
 
     def closeEvent(self, event):
         self.store_setting()
+        self.close_catalog_store()
         super().closeEvent(event)
 
+    def close_catalog_store(self):
+        """Close the catalog store of the closed browser, and stop following
+        the shared downloads. A refresh still running completes in the
+        background, without updating it, the task stays referenced until
+        then."""
+        try:
+            download_manager.downloadFinished.disconnect(self.on_download_finished)
+        except TypeError:
+            # Already disconnected by a previous close
+            pass
+        task = self.refresh_task
+        if task is not None:
+            for signal in (
+                task.pageReceived,
+                task.catalogRefreshed,
+                task.refreshFailed,
+                task.refreshCanceled,
+            ):
+                try:
+                    signal.disconnect()
+                except TypeError:
+                    # Already disconnected by a previous close
+                    pass
+        self.catalog_store.close()
+
     def show_success_message(self, text):
         return self.message_bar.pushMessage(self.tr("Success"), text, Qgis.Success, 5)
 
@@ -259,76 +312,277 @@ class ResourceBrowserDialog(QDialog, UI_CLASS):
         if geometry is not None:
             self.restoreGeometry(geometry)
 
-    @show_busy_cursor
     def populate_resources(self, force_update=False):
+        """Show the cached catalog right away, then revalidate it against the
+        QGIS Hub in a background task when it is older than the catalog TTL.
+        Opening the browser never waits on the network: without a cache, rows
+        are shown page by page as they arrive.
+        """
         self.log(f"Populating resources {force_update}")
-        if force_update or not self.resources:
+        if not force_update:
             try:
-                response = get_all_resources(force_update=force_update)
-            except DownloadError as e:
-                self.log(f"Failed to retrieve resources: {e}")
-                self.show_error_message(str(e))
-                return
+                previous_store = self.catalog_store
+                self.catalog_store = get_catalog_store()
+                previous_store.close()
+                self.resources = self.catalog_store.list_resources()
+            except sqlite3.Error as e:
+                self.log(f"Failed to read cached resources: {e}")
 
-            if response is None:
-                self.show_warning_message("Error populating the resources")
-                return
+            # Check for new resource types that don't exist in constants.py
+            self.register_new_resource_types()
+
+            self.reset_resource_model()
+            self.add_resource_rows(self.resources)
+            self.finish_thumbnail_progress()
 
-            self.resources = response.get("results", {})
+            # Setup resource type tree after resources are loaded
+            self.setup_resource_type_tree()
 
+            self.resize_columns()
+            self.update_title_bar()
+
+        # A cached catalog younger than the TTL is used as is
+        ttl = timedelta(minutes=self.plg_settings.get_plg_settings().catalog_ttl)
+        if force_update or not self.resources or catalog_is_stale(ttl):
+            self.start_catalog_refresh(user_requested=force_update)
+
+    def start_catalog_refresh(self, user_requested=False):
+        if self.refresh_task is not None:
+            return
+
+        # A reload asked by the user revalidates the whole catalog, opening
+        # the browser only syncs the resources uploaded since the last time.
+        task = CatalogRefreshTask(
+            self.tr("Refreshing QGIS Hub resources"),
+            full=user_requested,
+            resource_types=self.resource_types_by_priority(),
+        )
+        task.pageReceived.connect(self.on_catalog_page_received)
+        task.catalogRefreshed.connect(
+            partial(self.on_catalog_refreshed, user_requested)
+        )
+        task.refreshFailed.connect(
+            partial(self.on_catalog_refresh_failed, user_requested)
+        )
+        task.refreshCanceled.connect(self.on_catalog_refresh_canceled)
+        self.refresh_task = task
+        self.reloadPushButton.setEnabled(False)
+        QgsApplication.taskManager().addTask(task)
+
+    def resource_types_by_priority(self):
+        """Return the known resource types, those of the selected category
+        first, so that they are shown first when the catalog is downloaded."""
+        selected_items = self.treeWidgetCategories.selectedItems()
+        selected_data = (
+            selected_items[0].data(0, Qt.ItemDataRole.UserRole)
+            if selected_items
+            else None
+        )
+        if isinstance(selected_data, dict):
+            first = [selected_data.get("type")]
+        elif isinstance(selected_data, list):
+            first = list(selected_data)
+        else:
+            first = []
+
+        resource_types = list(first)
+        for types in ResoureTypeCategories.values():
+            for resource_type in types:
+                if resource_type not in resource_types:
+                    resource_types.append(resource_type)
+        return resource_types
+
+    def on_catalog_page_received(self, resources):
+        # Pages are only streamed into an empty browser, an already displayed
+        # catalog is updated once the refresh is complete.
+        if self.displayed_resources and not self.streaming_pages:
+            return
+        if not self.streaming_pages:
+            self.streaming_pages = True
+            # The store holds the rows once the refresh is complete
+            self.on_filter_text_changed(self.lineEditSearch.text())
+        self.add_resource_rows(
+            [r for r in resources if r.get("uuid") not in self.displayed_resources]
+        )
+        self.update_title_bar()
+
+    def on_catalog_refreshed(self, user_requested, catalog):
+        streamed = self.streaming_pages
+        self.refresh_task = None
+        self.streaming_pages = False
+        self.reloadPushButton.setEnabled(True)
+
+        resources = catalog.get("results", [])
+        added, removed, changed = self.apply_resource_changes(resources, streamed)
+        self.finish_thumbnail_progress()
+        self.log(
+            f"Resources refreshed: {added} added, {removed} removed, {changed} changed"
+        )
+
+        if user_requested:
+            self.show_success_message("Successfully update the resources")
+
+    def on_catalog_refresh_failed(self, user_requested, message):
+        self.refresh_task = None
+        self.streaming_pages = False
+        self.reloadPushButton.setEnabled(True)
+        self.finish_thumbnail_progress()
+
+        # Keep showing the cached catalog, only bother the user when the
+        # refresh was requested or there is nothing to show.
+        if user_requested or not self.resources:
+            self.show_error_message(message)
+
+    def on_catalog_refresh_canceled(self):
+        # Canceled from the task manager, keep what is displayed
+        self.refresh_task = None
+        self.streaming_pages = False
+        self.reloadPushButton.setEnabled(True)
+        self.finish_thumbnail_progress()
+
+    def apply_resource_changes(self, resources, streamed=False):
+        """Update the open model to match *resources*, touching only the rows
+        of resources that were added, removed or changed. The category tree
+        is rebuilt when the rows or the catalog store changed, or when the
+        rows were *streamed* in page by page without it.
+
+        Returns:
+            tuple[int, int, int]: Number of added, removed and changed rows.
+        """
+        new_resources = {r.get("uuid"): list_record(r) for r in resources}
+        removed = changed = 0
+        changed_items = []
+        for row in reversed(range(self.resource_model.rowCount())):
+            uuid = self.resource_model.item(row, 0).uuid
+            resource = new_resources.get(uuid)
+            if resource is None:
+                self.resource_model.removeRow(row)
+                del self.displayed_resources[uuid]
+                del self.resource_items[uuid]
+                removed += 1
+            elif resource != self.displayed_resources[uuid]:
+                self.resource_model.removeRow(row)
+                resource_row = self.make_resource_row(resource)
+                self.resource_model.insertRow(row, resource_row)
+                self.displayed_resources[uuid] = resource
+                changed_items.append(resource_row[0])
+                changed += 1
+        self.download_thumbnails(changed_items)
+
+        added_resources = [
+            r
+            for uuid, r in new_resources.items()
+            if uuid not in self.displayed_resources
+        ]
+        self.add_resource_rows(added_resources)
+
+        self.resources = resources
+        store_changed = self.catalog_store.source_version != self.tree_source_version
+        if store_changed:
+            # The details kept by the unchanged rows may be outdated
+            for item in self.resource_items.values():
+                item.forget_details()
+        if added_resources or removed or changed or streamed or store_changed:
             # Check for new resource types that don't exist in constants.py
             self.register_new_resource_types()
+            self.setup_resource_type_tree()
+            self.resize_columns()
+        self.update_title_bar()
+
+        return len(added_resources), removed, changed
 
+    def reset_resource_model(self):
         self.resource_model.clear()
         self.resource_model.setHorizontalHeaderLabels(
             ["Name", "Creator", "Download", "Uploaded"]
         )
+        self.displayed_resources = {}
+        self.resource_items = {}
 
-        missing_thumbnail_uuids = {
-            r.get("uuid")
-            for r in self.resources
-            if r.get("thumbnail")
-            and not r.get("thumbnail").endswith("qgis-icon-32x32.png")
-            and not is_resource_thumbnail_cached(r.get("thumbnail"), r.get("uuid"))
-        }
-        progress_bar, progress_widget = self._start_thumbnail_progress(
-            len(missing_thumbnail_uuids)
+    def load_resource_details(self, uuid):
+        # Read from the store open at preview time, it follows the refreshes
+        try:
+            return self.catalog_store.resource(uuid)
+        except sqlite3.Error as e:
+            self.log(f"Failed to read resource {uuid}: {e}")
+            return None
+
+    def make_resource_row(self, resource):
+        # The missing thumbnail is downloaded in the background, see
+        # download_thumbnails
+        item = ResourceItem(
+            list_record(resource), self.load_resource_details, download_thumbnail=False
         )
-        downloaded = 0
-
-        for resource in self.resources:
-            needs_download = resource.get("uuid") in missing_thumbnail_uuids
-            item = ResourceItem(resource)
-            author = QStandardItem(item.creator)
-            download_count = AttributeSortingItem(
-                str(item.download_count), item.download_count
-            )
-            pretty_date = item.upload_date.strftime("%d %B %Y").lstrip("0")
-            upload_date = AttributeSortingItem(pretty_date, item.upload_date)
-            self.resource_model.appendRow([item, author, download_count, upload_date])
-
-            if progress_bar is not None and needs_download:
-                downloaded += 1
-                progress_bar.setValue(downloaded)
-                # Throttle event-loop pumping: per-item processEvents can
-                # re-enter selection/repaint handlers while the model is
-                # mid-populate. Every 10 items keeps the progress bar
-                # responsive without that risk.
-                if downloaded % 10 == 0:
-                    QgsApplication.processEvents()
-
-        if progress_bar is not None:
-            QgsApplication.processEvents()
-        self._finish_thumbnail_progress(progress_widget)
-
-        if force_update:
-            self.show_success_message("Successfully update the resources")
-
-        # Setup resource type tree after resources are loaded
-        self.setup_resource_type_tree()
+        self.resource_items[item.uuid] = item
+        author = QStandardItem(item.creator)
+        download_count = AttributeSortingItem(
+            str(item.download_count), item.download_count
+        )
+        pretty_date = item.upload_date.strftime("%d %B %Y").lstrip("0")
+        upload_date = AttributeSortingItem(pretty_date, item.upload_date)
+        return [item, author, download_count, upload_date]
+
+    def add_resource_rows(self, resources):
+        """Append the given resources to the model, and download their
+        missing thumbnails in the background."""
+        items = []
+        for resource in resources:
+            resource_row = self.make_resource_row(resource)
+            self.resource_model.appendRow(resource_row)
+            self.displayed_resources[resource.get("uuid")] = list_record(resource)
+            items.append(resource_row[0])
+        self.download_thumbnails(items)
+
+    def download_thumbnails(self, items):
+        """Queue the download of the missing thumbnails of the given items,
+        each one is shown as soon as it is downloaded. The thumbnail progress
+        bar grows with every call so the rows of a catalog streamed page by
+        page share a single progress bar."""
+        queued = 0
+        for item in items:
+            thumbnail_path = resource_thumbnail_cache_path(item.thumbnail, item.uuid)
+            if thumbnail_path is None or is_resource_thumbnail_cached(
+                item.thumbnail, item.uuid
+            ):
+                continue
+            thumbnail_path.parent.mkdir(parents=True, exist_ok=True)
+            job = download_manager.submit(item.thumbnail, thumbnail_path, force=False)
+            if job not in self.thumbnail_jobs:
+                self.thumbnail_jobs[job] = item.uuid
+                queued += 1
+
+        if queued:
+            if self._thumbnail_progress_bar is None:
+                (
+                    self._thumbnail_progress_bar,
+                    self._thumbnail_progress_widget,
+                ) = self._start_thumbnail_progress(queued)
+            else:
+                self._thumbnail_progress_bar.setMaximum(
+                    self._thumbnail_progress_bar.maximum() + queued
+                )
 
-        self.resize_columns()
-        self.update_title_bar()
+    def on_download_finished(self, job):
+        uuid = self.thumbnail_jobs.pop(job, None)
+        if uuid is None:
+            return
+        if self._thumbnail_progress_bar is not None:
+            self._thumbnail_progress_bar.setValue(
+                self._thumbnail_progress_bar.value() + 1
+            )
+        item = self.resource_items.get(uuid)
+        if item is not None and job.state == DONE:
+            # Converted to PNG when Qt cannot decode it
+            item.set_thumbnail(download_resource_thumbnail(item.thumbnail, uuid))
+        self.finish_thumbnail_progress()
+
+    def finish_thumbnail_progress(self):
+        # Closed once the last thumbnail is downloaded
+        if self.thumbnail_jobs:
+            return
+        self._finish_thumbnail_progress(self._thumbnail_progress_widget)
+        self._thumbnail_progress_bar = None
+        self._thumbnail_progress_widget = None
 
     def update_filter_states(self):
         """
@@ -375,19 +629,10 @@ class ResourceBrowserDialog(QDialog, UI_CLASS):
                     self.filter_states[subtype_key] = True
 
                     # Now set other subtypes to False
-                    if self.resources:
-                        for resource in self.resources:
-                            if resource.get("resource_type") == resource_type:
-                                # Handle both old and new API formats
-                                resource_subtypes = normalize_resource_subtypes(
-                                    resource
-                                )
-
-                                # Set all other subtypes to False
-                                for subtype in resource_subtypes:
-                                    if subtype and subtype != selected_subtype:
-                                        other_subtype_key = f"{resource_type}:{subtype}"
-                                        self.filter_states[other_subtype_key] = False
+                    for subtype in self.catalog_store.subtype_counts([resource_type]):
+                        if subtype != selected_subtype:
+                            other_subtype_key = f"{resource_type}:{subtype}"
+                            self.filter_states[other_subtype_key] = False
                 else:
                     self.filter_states[resource_type] = False
 
@@ -411,6 +656,9 @@ class ResourceBrowserDialog(QDialog, UI_CLASS):
         self.on_filter_text_changed(current_text)
 
     def on_filter_text_changed(self, text):
+        # Set first, the filters below are then only used for the rows
+        # streamed in before the store holds them
+        self.proxy_model.setAcceptedUuids(self.search_catalog_store(text))
         self.proxy_model.setFilterRegularExpression(
             QRegularExpression(
                 text, QRegularExpression.PatternOption.CaseInsensitiveOption
@@ -421,6 +669,38 @@ class ResourceBrowserDialog(QDialog, UI_CLASS):
 
         self.update_title_bar()
 
+    def search_catalog_store(self, text):
+        """Return the UUIDs of the resources of the selected category whose
+        name or creator contains *text*, looked up in the catalog store.
+
+        Returns:
+            Optional[set[str]]: None when every row is shown, or while the
+            rows are streamed in and filtered one by one.
+        """
+        if self.streaming_pages:
+            return None
+
+        selected_items = self.treeWidgetCategories.selectedItems()
+        selected_data = (
+            selected_items[0].data(0, Qt.ItemDataRole.UserRole)
+            if selected_items
+            else None
+        )
+        resource_types = subtype = None
+        if isinstance(selected_data, list):
+            resource_types = selected_data
+        elif isinstance(selected_data, dict):
+            resource_types = [selected_data.get("type")]
+            subtype = selected_data.get("subtype")
+        if resource_types is None and not text.strip():
+            return None
+
+        try:
+            return self.catalog_store.search(resource_types, subtype, text)
+        except sqlite3.Error as e:
+            self.log(f"Failed to search cached resources: {e}")
+            return None
+
     @pyqtSlot("QItemSelection", "QItemSelection")
     def on_resource_selection_changed(self, selected, deselected):
         self.update_selected_resource()
@@ -556,7 +836,7 @@ class ResourceBrowserDialog(QDialog, UI_CLASS):
                     self.labelDependencies,
                 )
 
-        self.textBrowserDescription.setHtml(resource.description)
+        self.textBrowserDescription.setHtml(resource.description or "")
 
     def hide_preview(self):
         self.groupBoxPreview.hide()
@@ -878,7 +1158,8 @@ class ResourceBrowserDialog(QDialog, UI_CLASS):
             )
 
     def update_title_bar(self):
-        num_total_resources = len(self.resources)
+        # Rows streamed in before the catalog is complete count as well
+        num_total_resources = len(self.displayed_resources)
         num_selected_resources = self.proxy_model.rowCount()
         window_title = self.tr(
             f"QGIS Hub Explorer ({num_selected_resources} of {num_total_resources})"
@@ -930,6 +1211,14 @@ class ResourceBrowserDialog(QDialog, UI_CLASS):
         The tree will have a main "Resource Types" item with child items for each resource type.
         Resource subtypes will be shown as children of their type.
         """
+        # Remember the selected category to restore it after a refresh
+        selected_items = self.treeWidgetCategories.selectedItems()
+        previous_selection = (
+            selected_items[0].data(0, Qt.ItemDataRole.UserRole)
+            if selected_items
+            else None
+        )
+
         # Clear the tree widget
         self.treeWidgetCategories.clear()
 
@@ -937,9 +1226,11 @@ class ResourceBrowserDialog(QDialog, UI_CLASS):
         self.treeWidgetCategories.invisibleRootItem()
 
         self.tree_items = {}
+        # Rebuilt once the store holds another version of the catalog
+        self.tree_source_version = self.catalog_store.source_version
 
         # Add the "All Types" root item with total count
-        total_resources = len(self.resources) if self.resources else 0
+        total_resources = self.catalog_store.count()
         all_types_item = QTreeWidgetItem(
             self.treeWidgetCategories, [f"All Types ({total_resources})"]
         )
@@ -958,25 +1249,17 @@ class ResourceBrowserDialog(QDialog, UI_CLASS):
                 known_types.append(resource_type)
 
         # Check if we have any unknown resource types in the resources
-        unknown_resource_types = {}
-        if self.resources:
-            for resource in self.resources:
-                resource_type = resource.get("resource_type")
-                if resource_type and resource_type not in known_types:
-                    if resource_type not in unknown_resource_types:
-                        unknown_resource_types[resource_type] = 0
-                    unknown_resource_types[resource_type] += 1
+        type_counts = self.catalog_store.resource_types()
+        unknown_resource_types = {
+            resource_type: count
+            for resource_type, count in type_counts.items()
+            if resource_type not in known_types
+        }
 
         # Add categories as children - now using the constant from constants.py
         for category_name, types in ResoureTypeCategories.items():
             # Count resources in this category
-            category_count = 0
-            if self.resources:
-                category_count = sum(
-                    1
-                    for resource in self.resources
-                    if resource.get("resource_type") in types
-                )
+            category_count = sum(type_counts.get(t, 0) for t in types)
 
             # Only show categories that have resources
             if category_count > 0:
@@ -990,40 +1273,23 @@ class ResourceBrowserDialog(QDialog, UI_CLASS):
                 category_item.setFont(0, font)
                 self.tree_items[category_name] = category_item
 
-                # Collect subtypes for this category
-                if self.resources:
-                    subtypes_dict = {}
-                    # First pass - collect all subtypes and their counts
-                    for resource in self.resources:
-                        resource_type = resource.get("resource_type")
-
-                        # Handle both old and new API formats
-                        resource_subtypes = normalize_resource_subtypes(resource)
-
-                        # If the resource type belongs to this category and has subtypes
-                        if resource_type in types:
-                            for subtype in resource_subtypes:
-                                if subtype:
-                                    if subtype not in subtypes_dict:
-                                        subtypes_dict[subtype] = 0
-                                    subtypes_dict[subtype] += 1
-
-                    # Second pass - add subtype items to the tree
-                    for subtype, count in subtypes_dict.items():
-                        subtype_label = f"{subtype} ({count})"
-                        subtype_item = QTreeWidgetItem(category_item, [subtype_label])
-
-                        # Store the resource type and subtype for filtering
-                        subtype_data = {
-                            "type": types[
-                                0
-                            ],  # Assuming one type per category for simplicity
-                            "subtype": subtype,
-                        }
-                        subtype_item.setData(0, Qt.ItemDataRole.UserRole, subtype_data)
-
-                        # Add the subtype to the tree_items dictionary for later reference
-                        self.tree_items[f"{category_name}:{subtype}"] = subtype_item
+                # Add the subtypes of this category to the tree
+                subtypes_dict = self.catalog_store.subtype_counts(types)
+                for subtype, count in subtypes_dict.items():
+                    subtype_label = f"{subtype} ({count})"
+                    subtype_item = QTreeWidgetItem(category_item, [subtype_label])
+
+                    # Store the resource type and subtype for filtering
+                    subtype_data = {
+                        "type": types[
+                            0
+                        ],  # Assuming one type per category for simplicity
+                        "subtype": subtype,
+                    }
+                    subtype_item.setData(0, Qt.ItemDataRole.UserRole, subtype_data)
+
+                    # Add the subtype to the tree_items dictionary for later reference
+                    self.tree_items[f"{category_name}:{subtype}"] = subtype_item
 
         # Add dynamic categories for any new resource types found
         for unknown_type, count in unknown_resource_types.items():
@@ -1040,42 +1306,27 @@ class ResourceBrowserDialog(QDialog, UI_CLASS):
             self.tree_items[category_name] = category_item
 
             # Also add subtypes for unknown types
-            if self.resources:
-                subtypes_dict = {}
-                # Collect all subtypes and their counts
-                for resource in self.resources:
-                    resource_type = resource.get("resource_type")
-
-                    # Handle both old and new API formats
-                    resource_subtypes = normalize_resource_subtypes(resource)
-
-                    # If this resource is of the unknown type and has subtypes
-                    if resource_type == unknown_type:
-                        for subtype in resource_subtypes:
-                            if subtype:
-                                if subtype not in subtypes_dict:
-                                    subtypes_dict[subtype] = 0
-                                subtypes_dict[subtype] += 1
-
-                # Add subtype items to the tree
-                for subtype, count in subtypes_dict.items():
-                    subtype_label = f"{subtype} ({count})"
-                    subtype_item = QTreeWidgetItem(category_item, [subtype_label])
-
-                    # Store the resource type and subtype for filtering
-                    subtype_data = {"type": unknown_type, "subtype": subtype}
-                    subtype_item.setData(0, Qt.ItemDataRole.UserRole, subtype_data)
+            subtypes_dict = self.catalog_store.subtype_counts([unknown_type])
+            for subtype, count in subtypes_dict.items():
+                subtype_label = f"{subtype} ({count})"
+                subtype_item = QTreeWidgetItem(category_item, [subtype_label])
 
-                    # Add the subtype to the tree_items dictionary
-                    self.tree_items[f"{category_name}:{subtype}"] = subtype_item
+                # Store the resource type and subtype for filtering
+                subtype_data = {"type": unknown_type, "subtype": subtype}
+                subtype_item.setData(0, Qt.ItemDataRole.UserRole, subtype_data)
 
-        # Connect the selection changed signal
-        self.treeWidgetCategories.itemSelectionChanged.connect(
-            self.on_tree_selection_changed
-        )
+                # Add the subtype to the tree_items dictionary
+                self.tree_items[f"{category_name}:{subtype}"] = subtype_item
 
         # Select the "All Types" item by default
-        self.treeWidgetCategories.setCurrentItem(all_types_item)
+        current_item = all_types_item
+        for tree_item in self.tree_items.values():
+            if previous_selection not in (None, "all") and (
+                tree_item.data(0, Qt.ItemDataRole.UserRole) == previous_selection
+            ):
+                current_item = tree_item
+                break
+        self.treeWidgetCategories.setCurrentItem(current_item)
 
         # Resize the tree widget to fit the content
         self.resize_tree_widget()
@@ -1156,9 +1407,6 @@ class ResourceBrowserDialog(QDialog, UI_CLASS):
         Dynamically register new resource types found in the API response.
         This allows the plugin to handle new resource types without code changes.
         """
-        if not self.resources:
-            return
-
         # Get existing resource types from ResoureType class
         existing_types = {
             getattr(ResoureType, attr)
@@ -1167,11 +1415,11 @@ class ResourceBrowserDialog(QDialog, UI_CLASS):
         }
 
         # Find new resource types in the API response
-        new_types = set()
-        for resource in self.resources:
-            resource_type = resource.get("resource_type")
-            if resource_type and resource_type not in existing_types:
-                new_types.add(resource_type)
+        new_types = {
+            resource_type
+            for resource_type in self.catalog_store.resource_types()
+            if resource_type not in existing_types
+        }
 
         # Add new resource types to both the ResoureType class and ResoureTypeCategories
         for new_type in new_types:
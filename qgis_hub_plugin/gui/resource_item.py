@@ -1,4 +1,6 @@
 from datetime import datetime
+from pathlib import Path
+from typing import Callable, Optional
 
 from qgis.PyQt.QtCore import Qt
 from qgis.PyQt.QtGui import QIcon, QPainter, QPixmap, QStandardItem
@@ -9,16 +11,39 @@ from qgis_hub_plugin.gui.constants import (
     ResourceSubtypeRole,
     ResourceTypeRole,
     SortingRole,
+    UuidRole,
 )
 from qgis_hub_plugin.utilities.common import (
     download_resource_thumbnail,
     get_icon,
+    is_resource_thumbnail_cached,
     normalize_resource_subtypes,
 )
 
+# Fields only the preview needs, they are loaded on demand
+DETAIL_FIELDS = ("description", "dependencies")
+
 
 class ResourceItem(QStandardItem):
-    def __init__(self, params: dict):
+    def __init__(
+        self,
+        params: dict,
+        load_details: Optional[Callable[[str], Optional[dict]]] = None,
+        download_thumbnail: bool = True,
+    ):
+        """Item of the resource list.
+
+        Args:
+            params (dict): The resource. The list record of the catalog is
+                enough, the fields of DETAIL_FIELDS it lacks are loaded the
+                first time they are used and kept until
+                :meth:`forget_details`.
+            load_details (Callable, optional): Returns the full resource of a
+                UUID, e.g. from the catalog store.
+            download_thumbnail (bool): Download the thumbnail when it is not
+                cached. Otherwise the default icon is shown until the
+                thumbnail is given to :meth:`set_thumbnail`. Defaults to True.
+        """
         super().__init__()
 
         self.resource_type = params.get("resource_type")
@@ -37,20 +62,52 @@ class ResourceItem(QStandardItem):
             upload_date_string = upload_date_string[:-1] + "+00:00"
         self.upload_date = datetime.fromisoformat(upload_date_string)
         self.download_count = params.get("download_count")
-        self.description = params.get("description")
-        self.dependencies = params.get("dependencies")
+        self._details = {key: params[key] for key in DETAIL_FIELDS if key in params}
+        self._load_details = load_details
+        self._loaded_details = None
         self.file = params.get("file")
         self.thumbnail = params.get("thumbnail")
 
         self.setText(self.name[:50] + "..." if len(self.name) > 50 else self.name)
         self.setToolTip(f"{self.name} by {self.creator}")
-        thumbnail_path = download_resource_thumbnail(self.thumbnail, self.uuid)
-        self.setIcon(self._make_uniform_icon(thumbnail_path))
+        thumbnail_path = None
+        if download_thumbnail or is_resource_thumbnail_cached(
+            self.thumbnail, self.uuid
+        ):
+            thumbnail_path = download_resource_thumbnail(self.thumbnail, self.uuid)
+        self.set_thumbnail(thumbnail_path)
 
         self.setData(self.resource_type, ResourceTypeRole)
         self.setData(self.name, NameRole)
         self.setData(self.creator, CreatorRole)
         self.setData(self.resource_subtypes, ResourceSubtypeRole)
+        self.setData(self.uuid, UuidRole)
+
+    @property
+    def description(self) -> Optional[str]:
+        return self._detail("description")
+
+    @property
+    def dependencies(self):
+        return self._detail("dependencies")
+
+    def set_thumbnail(self, thumbnail_path: Optional[Path]):
+        self.setIcon(self._make_uniform_icon(thumbnail_path))
+
+    def forget_details(self):
+        """Load the details again on next use, e.g. once the catalog changed."""
+        self._loaded_details = None
+
+    def _detail(self, key: str):
+        if key in self._details or self._load_details is None:
+            return self._details.get(key)
+        if self._loaded_details is None:
+            resource = self._load_details(self.uuid)
+            if resource is None:
+                return None
+            # Decoded once, the preview reads them several times
+            self._loaded_details = {key: resource.get(key) for key in DETAIL_FIELDS}
+        return self._loaded_details.get(key)
 
     @staticmethod
     def _make_uniform_icon(thumbnail_path, target_size=512):
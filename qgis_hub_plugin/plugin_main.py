@@ -11,7 +11,7 @@ from pathlib import Path
 # PyQGIS
 from qgis.core import QgsApplication, QgsSettings
 from qgis.gui import QgisInterface
-from qgis.PyQt.QtCore import QCoreApplication, QLocale, QTranslator, QUrl
+from qgis.PyQt.QtCore import QCoreApplication, QLocale, Qt, QTranslator, QUrl
 from qgis.PyQt.QtGui import QDesktopServices, QIcon
 from qgis.PyQt.QtWidgets import QAction
 
@@ -22,10 +22,13 @@ from qgis_hub_plugin.__about__ import (
     __title__,
     __uri_homepage__,
 )
+from qgis_hub_plugin.core.refresh_scheduler import CatalogRefreshScheduler
 from qgis_hub_plugin.gui.dlg_settings import PlgOptionsFactory
 from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
-from qgis_hub_plugin.toolbelt import PlgLogger
+from qgis_hub_plugin.toolbelt import PlgLogger, PlgOptionsManager
 from qgis_hub_plugin.utilities.common import get_icon
+from qgis_hub_plugin.utilities.download_manager import download_manager
+from qgis_hub_plugin.utilities.endpoints import endpoint_selector, parse_endpoints
 
 # ############################################################################
 # ########## Classes ###############
@@ -60,8 +63,14 @@ class QgisHubPluginPlugin:
     def initGui(self):
         """Set up plugin UI elements."""
 
+        settings = PlgOptionsManager.get_plg_settings()
+        endpoint_selector.set_mirrors(parse_endpoints(settings.hub_mirrors))
+        download_manager.set_limits(
+            settings.max_downloads, settings.max_downloads_per_host
+        )
+
         # settings page within the QGIS preferences menu
-        self.options_factory = PlgOptionsFactory()
+        self.options_factory = PlgOptionsFactory(on_apply=self.apply_settings)
         self.iface.registerOptionsWidgetFactory(self.options_factory)
 
         # Toolbar
@@ -121,6 +130,17 @@ class QgisHubPluginPlugin:
             self.action_help_plugin_menu_documentation
         )
 
+        # -- Background refresh of the outdated catalog
+        self.refresh_scheduler = CatalogRefreshScheduler(self.iface.mainWindow())
+        self.refresh_scheduler.start()
+        # Opt-in prefetch, once QGIS has finished loading to not slow it down
+        self.iface.initializationCompleted.connect(self.refresh_scheduler.prefetch)
+
+    def apply_settings(self):
+        """Apply the settings saved in the options page to the background
+        refresh."""
+        self.refresh_scheduler.apply_settings()
+
     def tr(self, message: str) -> str:
         """Get the translation for a string using Qt translation API.
 
@@ -146,6 +166,12 @@ class QgisHubPluginPlugin:
         # -- Clean up preferences panel in QGIS settings
         self.iface.unregisterOptionsWidgetFactory(self.options_factory)
 
+        # -- Stop the background refresh
+        self.iface.initializationCompleted.disconnect(self.refresh_scheduler.prefetch)
+        self.refresh_scheduler.stop()
+        self.refresh_scheduler.deleteLater()
+        del self.refresh_scheduler
+
         # remove actions
         del self.action_settings
         del self.action_help
@@ -175,4 +201,6 @@ class QgisHubPluginPlugin:
             self.iface.mainWindow(),
             self.iface,
         )
+        # A new browser is opened every time, the closed ones are deleted
+        dialog.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         dialog.show()
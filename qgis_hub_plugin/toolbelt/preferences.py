@@ -31,6 +31,18 @@ class PlgSettingsStructure:
     # State
     download_location: str = "~/Downloads"
 
+    # Catalog, durations in minutes
+    catalog_ttl: int = 60
+    refresh_interval: int = 60
+    # Mirrors of the QGIS Hub, comma separated root URLs
+    hub_mirrors: str = ""
+    # Warm the catalog and thumbnail caches once QGIS has finished loading
+    prefetch_on_startup: bool = False
+
+    # Background downloads running at the same time, overall and per host
+    max_downloads: int = 6
+    max_downloads_per_host: int = 4
+
     # UI
     icon_size: int = 64
     download_checkbox: bool = False
@@ -1,19 +1,67 @@
+import hashlib
+import json
 import os
 import shutil
+import time
 from pathlib import Path
 from typing import List, Optional, Tuple
+from urllib.parse import urlparse
 
-from qgis.core import QgsApplication, QgsNetworkAccessManager, QgsNetworkReplyContent
-from qgis.PyQt.QtCore import QFile, QIODevice, QUrl
+from qgis.core import QgsApplication, QgsFeedback, QgsNetworkAccessManager
+from qgis.PyQt.QtCore import QEventLoop, QMetaObject, Qt, QTimer, QUrl
 from qgis.PyQt.QtGui import QIcon, QImageReader
 from qgis.PyQt.QtNetwork import QNetworkReply, QNetworkRequest
 
 from qgis_hub_plugin.__about__ import DIR_PLUGIN_ROOT
 from qgis_hub_plugin.toolbelt import PlgLogger
+from qgis_hub_plugin.utilities.endpoints import endpoint_selector
 from qgis_hub_plugin.utilities.exception import DownloadError
+from qgis_hub_plugin.utilities.files import atomic_copy, atomic_write, replace_file
+from qgis_hub_plugin.utilities.metrics import (
+    OUTCOME_COALESCED,
+    OUTCOME_ERROR,
+    OUTCOME_HTTP_CACHE,
+    OUTCOME_LOCAL,
+    OUTCOME_NETWORK,
+    OUTCOME_OFFLINE,
+    TransferRecord,
+    transfer_metrics,
+)
+from qgis_hub_plugin.utilities.retry import (
+    RETRYABLE_STATUS_CODES,
+    circuit_breaker,
+    retry_policy,
+)
+from qgis_hub_plugin.utilities.single_flight import download_flights
 
 QGIS_HUB_DIR = Path(QgsApplication.qgisSettingsDirPath(), "qgis_hub")
 
+# Hosts whose HTTP/2 connection failed, they are then requested over HTTP/1.1
+# for the rest of the session.
+_HTTP1_ONLY_HOSTS = set()
+
+# Size of the chunks written while a file downloads, and the most Qt keeps
+# in memory before they are written
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_BUFFER_SIZE = 1024 * 1024
+# Suffix of the files being downloaded, kept when a download is interrupted
+# so that it can be resumed
+PART_SUFFIX = ".part"
+
+# Network errors that may go away by asking again
+_TRANSIENT_ERRORS = (
+    QNetworkReply.NetworkError.ConnectionRefusedError,
+    QNetworkReply.NetworkError.RemoteHostClosedError,
+    QNetworkReply.NetworkError.HostNotFoundError,
+    QNetworkReply.NetworkError.TimeoutError,
+    # Raised when the transfer timeout aborts the request
+    QNetworkReply.NetworkError.OperationCanceledError,
+    QNetworkReply.NetworkError.TemporaryNetworkFailureError,
+    QNetworkReply.NetworkError.NetworkSessionFailedError,
+    QNetworkReply.NetworkError.ProxyTimeoutError,
+    QNetworkReply.NetworkError.UnknownNetworkError,
+)
+
 # Image formats Qt can decode in this build (e.g. {"jpg", "png", "webp"}).
 # Qt5 ships the webp plugin; Qt6 in QGIS 4 does NOT include it.
 # Computed once at import time to avoid probing on every thumbnail.
@@ -82,12 +130,426 @@ def get_icon_path(icon_name: str) -> str:
     return os.path.join(DIR_PLUGIN_ROOT, "resources", "images", icon_name)
 
 
+def build_network_request(
+    url: str, timeout: int = 30000, headers: Optional[dict[str, str]] = None
+) -> QNetworkRequest:
+    """Build the request used for every call made to the QGIS Hub.
+
+    HTTP/2 is allowed so that the catalog pages and the burst of thumbnails
+    share a single multiplexed connection. Qt negotiates it and falls back to
+    HTTP/1.1 with servers that do not support it. Compressed transfer needs
+    nothing here: Qt sends ``Accept-Encoding: gzip, deflate`` and decompresses
+    the reply itself, as long as that header is not set by hand.
+
+    Args:
+        url (str): The URL to request.
+        timeout (int): The transfer timeout in milliseconds. Defaults to 30000.
+        headers (dict[str, str], optional): Extra raw headers to send, e.g. the
+            conditional headers used to revalidate a cached response.
+
+    Returns:
+        QNetworkRequest: The configured request.
+    """
+    request = QNetworkRequest(QUrl(url))
+    request.setTransferTimeout(timeout)
+    request.setAttribute(
+        QNetworkRequest.Attribute.Http2AllowedAttribute,
+        QUrl(url).host() not in _HTTP1_ONLY_HOSTS,
+    )
+    for name, value in (headers or {}).items():
+        request.setRawHeader(name.encode("latin-1"), value.encode("latin-1"))
+    return request
+
+
+def retry_without_http2(reply: QNetworkReply, url: str) -> bool:
+    """Tell whether a failed request should be sent again over HTTP/1.1.
+
+    Servers and proxies with a broken HTTP/2 implementation fail with a
+    protocol error. Their host is then only requested over HTTP/1.1. Other
+    errors, e.g. a connection dropped by an unstable network, are left to
+    the retry policy, they do not tell anything about HTTP/2.
+    """
+    if reply.error() != QNetworkReply.NetworkError.ProtocolFailure:
+        return False
+    if not reply.request().attribute(QNetworkRequest.Attribute.Http2AllowedAttribute):
+        return False
+    host = QUrl(url).host()
+    PlgLogger.log(f"HTTP/2 failed with {host}, falling back to HTTP/1.1")
+    _HTTP1_ONLY_HOSTS.add(host)
+    return True
+
+
+def is_transient_failure(reply: QNetworkReply) -> bool:
+    """Tell whether a reply failed for a reason that may go away, e.g. a
+    timeout or a 503 Service Unavailable, rather than a 404 Not Found."""
+    if reply.error() == QNetworkReply.NetworkError.NoError:
+        return False
+    status = reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute)
+    # A successful response may still be cut by a network error
+    if isinstance(status, int) and status >= 400:
+        return status in RETRYABLE_STATUS_CODES
+    return reply.error() in _TRANSIENT_ERRORS
+
+
+def check_circuit(url: str):
+    """Fail fast when the host of *url* has been failing.
+
+    Raises:
+        DownloadError: If the circuit breaker of the host is open.
+    """
+    host = QUrl(url).host()
+    if not circuit_breaker.allow(host):
+        raise DownloadError(
+            f"{host} is unavailable, "
+            f"next attempt in {circuit_breaker.retry_in(host):.0f} s"
+        )
+
+
+def record_reply(reply: QNetworkReply, url: str) -> bool:
+    """Record the outcome of a reply in the circuit breaker of its host.
+
+    Returns:
+        bool: Whether the reply failed transiently and may be retried.
+    """
+    host = QUrl(url).host()
+    if is_transient_failure(reply):
+        circuit_breaker.record_failure(host)
+        return True
+    circuit_breaker.record_success(host)
+    return False
+
+
+def wait(seconds: float):
+    """Wait in a local event loop, so the GUI does not freeze."""
+    if seconds <= 0:
+        return
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+def wait_for_replies(
+    replies: list[QNetworkReply],
+    timeout: int,
+    feedback: Optional[QgsFeedback] = None,
+    streaming: bool = False,
+):
+    """Wait in a local event loop until one of *replies* finishes, or
+    receives data when *streaming*, for at most *timeout* milliseconds.
+
+    Unlike polling ``processEvents``, the loop sleeps until the network or
+    the GUI has something to process, so the GUI stays responsive without
+    keeping a CPU core busy. Canceling *feedback* ends the wait.
+    """
+    if any(reply.isFinished() for reply in replies):
+        return
+    if feedback is not None and feedback.isCanceled():
+        return
+
+    loop = QEventLoop()
+    timer = QTimer()
+    timer.setSingleShot(True)
+    signals = [timer.timeout]
+    for reply in replies:
+        signals.append(reply.finished)
+        if streaming:
+            signals.append(reply.readyRead)
+    if feedback is not None:
+        signals.append(feedback.canceled)
+    for signal in signals:
+        signal.connect(loop.quit)
+    timer.start(max(0, timeout))
+    loop.exec()
+    timer.stop()
+    for signal in signals:
+        signal.disconnect(loop.quit)
+
+
+def reply_header(reply: QNetworkReply, name: str) -> str:
+    """Return the value of a raw response header, or an empty string."""
+    value = reply.rawHeader(name.encode("latin-1"))
+    return bytes(value).decode("latin-1") if value else ""
+
+
+class ReplyTimer:
+    """Time the stages of a reply from its signals: the end of the TLS
+    handshake and the arrival of the response headers. Qt does not report
+    the name resolution, it is part of the time to the first byte."""
+
+    def __init__(self, reply: QNetworkReply):
+        self.started = time.monotonic()
+        self.tls: Optional[float] = None
+        self.first_byte: Optional[float] = None
+        self.bytes_received = 0
+        reply.encrypted.connect(self._on_encrypted)
+        reply.metaDataChanged.connect(self._on_meta_data)
+        reply.downloadProgress.connect(self._on_progress)
+
+    def _elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def _on_encrypted(self):
+        self.tls = self._elapsed()
+
+    def _on_meta_data(self):
+        if self.first_byte is None:
+            self.first_byte = self._elapsed()
+
+    def _on_progress(self, received: int, total: int):
+        self.bytes_received = max(self.bytes_received, received)
+
+
+class FileTransfer:
+    """Stream the body of a reply to *destination* in chunks, as it arrives.
+
+    Qt buffers at most ``DOWNLOAD_BUFFER_SIZE`` bytes of the body and pauses
+    the transfer until they are read, so the memory used stays the same
+    whatever the size of the file. The body is written to a ``.part`` file
+    next to *destination*, which replaces it once the reply succeeded.
+
+    When the server accepts byte ranges and identifies the file with a
+    validator, the ``.part`` file of an interrupted download is kept along
+    with the validator. The next transfer of the same URL then only asks
+    for the rest of the file, unless the file changed meanwhile.
+
+    Raises:
+        OSError: If the ``.part`` file cannot be opened.
+    """
+
+    def __init__(
+        self, nam: QgsNetworkAccessManager, request: QNetworkRequest, destination: Path
+    ):
+        self.destination = Path(destination)
+        self.part_file = self.destination.with_name(self.destination.name + PART_SUFFIX)
+        self.state_file = self.part_file.with_name(self.part_file.name + ".json")
+        self.url = request.url().toString()
+        # Bytes received by this transfer, and kept from a previous one
+        self.size = 0
+        self.offset = 0
+        self.written = False
+        # Set when the file could not be written, the reply is then aborted
+        self.write_error: Optional[OSError] = None
+        self._headers_read = False
+        # The body of an error response is not part of the file
+        self._discard_body = False
+
+        validator = self._resume_validator()
+        self._resumable = bool(validator)
+        if validator:
+            self.offset = self.part_file.stat().st_size
+            request.setRawHeader(b"Range", f"bytes={self.offset}-".encode("latin-1"))
+            # The server sends the whole file when it no longer matches
+            request.setRawHeader(b"If-Range", validator.encode("latin-1"))
+            # Ranges apply to the encoded body, and partial bodies are not
+            # worth caching
+            request.setRawHeader(b"Accept-Encoding", b"identity")
+            request.setAttribute(
+                QNetworkRequest.Attribute.CacheLoadControlAttribute,
+                QNetworkRequest.CacheLoadControl.AlwaysNetwork,
+            )
+            request.setAttribute(
+                QNetworkRequest.Attribute.CacheSaveControlAttribute, False
+            )
+        # Opened first, a request is not worth sending when it fails
+        self._file = open(self.part_file, "ab" if self.offset else "wb")
+        self.reply = nam.get(request)
+        self.reply.setReadBufferSize(DOWNLOAD_BUFFER_SIZE)
+        self.timer = ReplyTimer(self.reply)
+
+    def _resume_validator(self) -> str:
+        """Return the validator of the ``.part`` file left by an interrupted
+        transfer of the same URL, or an empty string when there is nothing
+        to resume."""
+        try:
+            with open(self.state_file, encoding="utf-8") as f:
+                state = json.load(f)
+            if self.part_file.stat().st_size <= 0:
+                return ""
+        except (OSError, ValueError):
+            return ""
+        if not isinstance(state, dict) or state.get("url") != self.url:
+            return ""
+        return state.get("validator") or ""
+
+    def _read_headers(self):
+        """Check whether the reply resumes the ``.part`` file, and keep what
+        is needed to resume it in turn."""
+        status = self.reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute)
+        if not isinstance(status, int):
+            return
+        self._headers_read = True
+        if not 200 <= status < 300:
+            # The part file and its validator are left as they were
+            self._discard_body = True
+            return
+
+        content_range = reply_header(self.reply, "Content-Range")
+        if not (status == 206 and content_range.startswith(f"bytes {self.offset}-")):
+            # The whole file, the part is outdated or the range was ignored
+            self._file.seek(0)
+            self._file.truncate()
+            self.offset = 0
+
+        etag = reply_header(self.reply, "ETag")
+        # Weak validators cannot be used to resume a download
+        validator = etag if etag and not etag.startswith("W/") else ""
+        validator = validator or reply_header(self.reply, "Last-Modified")
+        accepts_ranges = status == 206 or (
+            reply_header(self.reply, "Accept-Ranges").lower() == "bytes"
+        )
+        encoding = reply_header(self.reply, "Content-Encoding").lower()
+        self._resumable = (
+            accepts_ranges and bool(validator) and encoding in ("", "identity")
+        )
+        try:
+            if self._resumable:
+                with atomic_write(self.state_file, "w", encoding="utf-8") as f:
+                    json.dump({"url": self.url, "validator": validator}, f)
+            else:
+                self.state_file.unlink(missing_ok=True)
+        except OSError as exc:
+            self._resumable = False
+            PlgLogger.log(f"Unable to keep the download resumable: {exc}")
+
+    def failed(self) -> bool:
+        return (
+            self.reply.isFinished()
+            and self.reply.error() != QNetworkReply.NetworkError.NoError
+        )
+
+    def pump(self):
+        """Write the part of the body received so far."""
+        if self.write_error is not None or self.failed():
+            return
+        try:
+            while self.reply.bytesAvailable() > 0:
+                if not self._headers_read:
+                    self._read_headers()
+                chunk = self.reply.read(DOWNLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                if self._discard_body:
+                    continue
+                self._file.write(chunk)
+                self.size += len(chunk)
+        except OSError as exc:
+            self.write_error = exc
+            self.reply.abort()
+
+    def close(self):
+        """Replace the destination with the body of a successful reply. The
+        body of a reply failing transiently is kept to be resumed when
+        possible, and discarded otherwise."""
+        if not self.reply.isFinished():
+            self.reply.abort()
+        if self.write_error is None and not self.failed():
+            try:
+                if not self._headers_read:
+                    # An empty body
+                    self._read_headers()
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+                replace_file(self.part_file, self.destination)
+            except OSError as exc:
+                self.write_error = exc
+            else:
+                self.written = True
+                self.state_file.unlink(missing_ok=True)
+                return
+
+        self._file.close()
+        if (
+            self._resumable
+            and self.write_error is None
+            and is_transient_failure(self.reply)
+        ):
+            PlgLogger.log(
+                f"Download of {self.url} interrupted, "
+                f"{self.offset + self.size} bytes kept to resume it"
+            )
+            return
+        # The destination is left untouched
+        self.part_file.unlink(missing_ok=True)
+        self.state_file.unlink(missing_ok=True)
+
+
+def record_metrics(
+    url: str,
+    reply: Optional[QNetworkReply] = None,
+    timer: Optional[ReplyTimer] = None,
+    outcome: Optional[str] = None,
+    size: Optional[int] = None,
+):
+    """Record a request in the transfer metrics.
+
+    Args:
+        url (str): The requested URL.
+        reply (QNetworkReply, optional): The finished reply, None when
+            nothing was requested.
+        timer (ReplyTimer, optional): The timer of the reply.
+        outcome (str, optional): How the body was obtained. Defaults to the
+            outcome of the reply.
+        size (int, optional): The number of bytes received. Defaults to the
+            count of the timer.
+    """
+    record = TransferRecord(url=url, host=QUrl(url).host(), outcome=outcome or "")
+    if reply is not None:
+        status = reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute)
+        failed = reply.error() != QNetworkReply.NetworkError.NoError
+        if outcome is None:
+            if failed:
+                outcome = OUTCOME_ERROR
+            elif reply.attribute(QNetworkRequest.Attribute.SourceIsFromCacheAttribute):
+                outcome = OUTCOME_HTTP_CACHE
+            else:
+                outcome = OUTCOME_NETWORK
+        record = record._replace(
+            outcome=outcome,
+            status=status if isinstance(status, int) else None,
+            http2=bool(
+                reply.attribute(QNetworkRequest.Attribute.Http2WasUsedAttribute)
+            ),
+            error=reply.errorString() if failed else "",
+        )
+    if timer is not None:
+        record = record._replace(
+            duration=time.monotonic() - timer.started,
+            tls=timer.tls,
+            first_byte=timer.first_byte,
+            bytes_received=timer.bytes_received,
+        )
+    if size is not None:
+        record = record._replace(bytes_received=size)
+    transfer_metrics.record(record)
+
+
+def offline_file_path(url: str) -> Path:
+    """Return where the copy of the file at *url* imported from an offline
+    bundle is kept, in a folder named after the URL so that files with the
+    same name do not collide."""
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    name = Path(urlparse(url).path).name or "file"
+    return Path(QGIS_HUB_DIR, "offline", digest, name)
+
+
 def download_file(
     url: str, destination: Path, force: bool = True, timeout: int = 30000
 ) -> Optional[str]:
     """
     Download a file from the given URL to the specified destination using PyQGIS.
 
+    Transient failures are retried with backoff, and the request fails fast
+    while the circuit breaker of the host is open. Files of the QGIS Hub are
+    downloaded from its fastest healthy mirror, falling back to the others.
+    Concurrent downloads of the same URL, from other threads or re-entered
+    from the event loop, share a single request. When the download fails,
+    the copy of the file imported from an offline bundle is used instead, if
+    any, so that it never hides a newer version. The caller waits in a
+    local event loop woken up by the reply, which keeps the GUI responsive
+    without keeping a CPU core busy. The file is written in chunks as it
+    downloads, only a bounded part of it is kept in memory.
+
     Args:
         url (str): The URL of the file to download.
         destination (Path): The local path where the file should be saved.
@@ -102,53 +564,196 @@ def download_file(
         DownloadError: If any error occurs during the download process.
     """
     if not force and destination.exists():
+        record_metrics(url, outcome=OUTCOME_LOCAL)
         return destination
     nam = QgsNetworkAccessManager.instance()
-    request = QNetworkRequest(QUrl(url))
-    request.setTransferTimeout(timeout)
 
-    def handle_finished(reply: QgsNetworkReplyContent):
+    def handle_finished(transfer: FileTransfer, url: str, started: float):
+        reply = transfer.reply
         if reply.error() == QNetworkReply.NetworkError.NoError:
-            file = QFile(str(destination))
-            if file.open(QIODevice.OpenModeFlag.WriteOnly):
-                file.write(reply.readAll())
-                file.close()
-                return destination
-            else:
-                raise DownloadError(
-                    f"Failed to open file for writing: {file.errorString()}"
+            endpoint = endpoint_selector.endpoint_of(url)
+            if endpoint is not None:
+                endpoint_selector.record_transfer(
+                    endpoint, transfer.size, time.monotonic() - started
                 )
+            if transfer.destination != Path(destination):
+                # Downloaded by a concurrent caller to its own destination
+                try:
+                    atomic_copy(transfer.destination, destination)
+                except OSError as exc:
+                    raise DownloadError(
+                        f"Failed to open file for writing: {exc.strerror or exc}"
+                    ) from exc
+            return destination
         elif reply.error() == QNetworkReply.NetworkError.ContentNotFoundError:
             raise DownloadError(f"File not found (404 error): {url}")
         else:
             raise DownloadError(f"Download failed: {reply.errorString()}")
 
-    try:
-        reply = nam.get(request)
+    def start(request: QNetworkRequest) -> FileTransfer:
+        try:
+            return FileTransfer(nam, request, destination)
+        except OSError as exc:
+            raise DownloadError(
+                f"Failed to open file for writing: {exc.strerror or exc}"
+            ) from exc
+
+    # Return the transfer of the request, and whether this caller started
+    # it. Only that caller records the outcome of the transfer, the callers
+    # who joined it are recorded as coalesced.
+    def get(request: QNetworkRequest) -> tuple[FileTransfer, bool]:
+        url = request.url().toString()
+        started = False
+
+        def start_flight() -> FileTransfer:
+            nonlocal started
+            started = True
+            return start(request)
+
+        # Join the identical request in flight, if any
+        flight = download_flights.join(url, start_flight)
+
+        if flight.is_owner:
+            # Any caller of the thread may pump the transfer, e.g. a caller
+            # re-entered from the event loop below
+            transfer = flight.handle
+            try:
+                # The transfer timeout of the request ends a stalled reply
+                while not flight.done():
+                    transfer.pump()
+                    if transfer.reply.isFinished():
+                        break
+                    wait_for_replies([transfer.reply], timeout, streaming=True)
+            finally:
+                if not flight.done():
+                    transfer.close()
+                    download_flights.land(flight, transfer)
+        else:
+            # Woken up by the thread completing the flight
+            loop = QEventLoop()
+            download_flights.notify(
+                flight,
+                lambda: QMetaObject.invokeMethod(
+                    loop, "quit", Qt.ConnectionType.QueuedConnection
+                ),
+            )
+            if not flight.done():
+                loop.exec()
+
+        transfer = flight.result
+        if started:
+            record_metrics(url, transfer.reply, transfer.timer, size=transfer.size)
+        else:
+            record_metrics(url, outcome=OUTCOME_COALESCED)
+        return transfer, started
+
+    def download(url: str):
+        try:
+            attempt = 1
+            while True:
+                check_circuit(url)
+                started = time.monotonic()
+                transfer, owner = get(build_network_request(url, timeout))
+                if transfer.write_error is None and retry_without_http2(
+                    transfer.reply, url
+                ):
+                    transfer, owner = get(build_network_request(url, timeout))
+                if transfer.write_error is not None:
+                    # Not the fault of the server, asking again is pointless
+                    raise DownloadError(
+                        "Failed to write file: "
+                        f"{transfer.write_error.strerror or transfer.write_error}"
+                    )
+                # The circuit breaker counts a shared reply once
+                if owner:
+                    transient = record_reply(transfer.reply, url)
+                else:
+                    transient = is_transient_failure(transfer.reply)
+                if transient and retry_policy.should_retry(attempt):
+                    PlgLogger.log(
+                        f"Retrying {url} after: {transfer.reply.errorString()}"
+                    )
+                    wait(retry_policy.delay(attempt))
+                    attempt += 1
+                    continue
+
+                return handle_finished(transfer, url, started)
+        except Exception as e:
+            if isinstance(e, DownloadError):
+                raise e
+            else:
+                raise DownloadError(f"An unexpected error occurred: {str(e)}")
 
-        # Use a loop to process events and prevent GUI freezing
-        while not reply.isFinished():
-            QgsApplication.processEvents()
+    def copy_offline(offline_copy: Path):
+        if offline_copy.resolve() != Path(destination).resolve():
+            try:
+                atomic_copy(offline_copy, destination)
+            except OSError as exc:
+                raise DownloadError(
+                    f"Failed to open file for writing: {exc.strerror or exc}"
+                ) from exc
+        record_metrics(url, outcome=OUTCOME_OFFLINE, size=offline_copy.stat().st_size)
+        return destination
 
-        return handle_finished(reply)
-    except Exception as e:
-        if isinstance(e, DownloadError):
-            raise e
-        else:
-            raise DownloadError(f"An unexpected error occurred: {str(e)}")
+    # Files of the QGIS Hub are downloaded from the fastest healthy mirror
+    candidates = endpoint_selector.candidates(url)
+    for index, candidate in enumerate(candidates):
+        try:
+            return download(candidate)
+        except DownloadError as exc:
+            if index + 1 < len(candidates):
+                PlgLogger.log(
+                    f"Download from {candidate} failed, trying "
+                    f"{candidates[index + 1]}: {exc}"
+                )
+                continue
+            offline_copy = offline_file_path(url)
+            if not offline_copy.exists():
+                raise
+            PlgLogger.log(
+                f"Download of {url} failed, using the copy of the offline "
+                f"bundle: {exc}"
+            )
+            return copy_offline(offline_copy)
 
 
 def clear_cache() -> tuple[bool, int]:
-    """Delete the cached API response and all cached thumbnails.
+    """Delete the cached API response, the catalog store built from it, all
+    cached thumbnails and the files imported from offline bundles.
 
     Returns:
         Tuple[bool, int]: (response_file_removed, number_of_thumbnails_removed).
     """
     response_removed = False
-    response_file = Path(QGIS_HUB_DIR, "response.json")
-    if response_file.exists():
-        response_file.unlink()
-        response_removed = True
+    # Compressed cache and the uncompressed one of previous versions
+    for response_name in ("response.json.gz", "response.json"):
+        response_file = Path(QGIS_HUB_DIR, response_name)
+        if response_file.exists():
+            response_file.unlink()
+            response_removed = True
+
+    # Validators, sync state and the last known good copy are meaningless
+    # without the response
+    for sidecar_name in (
+        "response.validators.json",
+        "response.sync.json",
+        "response.last_good.json.gz",
+    ):
+        sidecar_file = Path(QGIS_HUB_DIR, sidecar_name)
+        if sidecar_file.exists():
+            sidecar_file.unlink()
+    # Temporary files left by writes interrupted by a crash
+    if QGIS_HUB_DIR.exists():
+        for temp_file in QGIS_HUB_DIR.glob(".*.tmp"):
+            temp_file.unlink(missing_ok=True)
+    # Catalog store with its write-ahead log, and the snapshot of the list
+    for store_name in (
+        "catalog.sqlite",
+        "catalog.sqlite-wal",
+        "catalog.sqlite-shm",
+        "catalog.snapshot",
+    ):
+        Path(QGIS_HUB_DIR, store_name).unlink(missing_ok=True)
 
     thumbnails_removed = 0
     thumbnail_dir = Path(QGIS_HUB_DIR, "thumbnails")
@@ -156,6 +761,11 @@ def clear_cache() -> tuple[bool, int]:
         thumbnails_removed = sum(1 for p in thumbnail_dir.rglob("*") if p.is_file())
         shutil.rmtree(thumbnail_dir)
 
+    # Files imported from offline bundles
+    offline_dir = Path(QGIS_HUB_DIR, "offline")
+    if offline_dir.exists():
+        shutil.rmtree(offline_dir)
+
     return response_removed, thumbnails_removed
 
 
@@ -242,7 +852,8 @@ def _convert_thumbnail_to_png(source: Path, target: Path) -> Optional[Path]:
     try:
         with _PILImage.open(source) as img:
             img.thumbnail((512, 512))
-            img.convert("RGBA").save(target, format="PNG", optimize=True)
+            with atomic_write(target) as f:
+                img.convert("RGBA").save(f, format="PNG", optimize=True)
         return target
     except Exception as exc:  # noqa: BLE001
         PlgLogger.log(f"Failed to convert thumbnail {source.name}: {exc}")
@@ -0,0 +1,157 @@
+from functools import partial
+from pathlib import Path
+
+from qgis.core import QgsApplication, QgsTask
+from qgis.PyQt.QtCore import QObject, QTimer, pyqtSignal
+
+from qgis_hub_plugin.toolbelt import PlgLogger
+from qgis_hub_plugin.utilities.common import download_file
+from qgis_hub_plugin.utilities.download_queue import DONE, DownloadJob, DownloadQueue
+from qgis_hub_plugin.utilities.exception import DownloadError
+
+
+class DownloadTask(QgsTask):
+    """Download the file of a job in the background with :func:`download_file`.
+
+    ``downloadFinished`` is emitted with the task on the thread owning it,
+    whether the download succeeded, failed or was canceled. The task is
+    hidden from the task manager, the progress of the downloads is
+    aggregated by the :class:`DownloadManager`.
+    """
+
+    downloadFinished = pyqtSignal(object)
+
+    def __init__(self, job: DownloadJob):
+        super().__init__(
+            f"Downloading {job.url}", QgsTask.Flag.CanCancel | QgsTask.Flag.Hidden
+        )
+        self.job = job
+        self.error = ""
+        self.size = 0
+
+    def run(self) -> bool:
+        if self.isCanceled():
+            return False
+        try:
+            download_file(self.job.url, self.job.destination, self.job.force)
+            self.size = self.job.destination.stat().st_size
+        except (DownloadError, OSError) as exc:
+            self.error = str(exc)
+            return False
+        return True
+
+    def finished(self, result: bool):
+        if not result and not self.error:
+            self.error = "Canceled"
+        self.downloadFinished.emit(self)
+
+
+class DownloadManager(QObject):
+    """Download files in the background, a bounded number at a time.
+
+    The files are queued and downloaded by tasks of the QGIS task manager,
+    at most *max_active* at the same time and *max_per_host* from the same
+    host, see :class:`DownloadQueue`. ``downloadFinished`` is emitted with
+    the job once its file is downloaded, failed or canceled, and
+    ``progressChanged`` with the :class:`DownloadProgress` of the jobs
+    queued since the manager was last idle. Both are emitted on the GUI
+    thread, never from :meth:`submit` itself.
+    """
+
+    downloadFinished = pyqtSignal(object)
+    progressChanged = pyqtSignal(object)
+
+    def __init__(self, max_active: int = 6, max_per_host: int = 4, parent=None):
+        super().__init__(parent)
+        self.queue = DownloadQueue(max_active, max_per_host)
+        # Referenced until finished, the task manager does not keep the
+        # Python side of the tasks alive
+        self._tasks: dict[DownloadJob, DownloadTask] = {}
+
+    def set_limits(self, max_active: int, max_per_host: int):
+        """Change the number of downloads running at the same time, overall
+        and per host."""
+        self.queue.set_limits(max_active, max_per_host)
+        self._start_ready()
+
+    def submit(
+        self, url: str, destination: Path, force: bool = True, priority: int = 0
+    ) -> DownloadJob:
+        """Queue the download of *url* to *destination*.
+
+        Args:
+            url (str): The URL of the file to download.
+            destination (Path): The local path where the file should be saved.
+            force (bool): If false, an existing destination is kept as is.
+                Defaults to True.
+            priority (int): Jobs of a higher priority start first. Defaults
+                to 0.
+
+        Returns:
+            DownloadJob: The job of the download, the one already queued or
+            running when the same file was submitted before.
+        """
+        job = DownloadJob(url, destination, force, priority)
+        if self._lookup(job):
+            job.state = DONE
+            QTimer.singleShot(0, partial(self.downloadFinished.emit, job))
+            return job
+
+        queued = self.queue.push(job)
+        if queued is job:
+            self.progressChanged.emit(self.queue.progress())
+        self._start_ready()
+        return queued
+
+    def _lookup(self, job: DownloadJob) -> bool:
+        """Tell whether the file of *job* is available without downloading
+        it, every job is looked up here before it is queued."""
+        if not job.force and job.destination.exists():
+            job.size = job.destination.stat().st_size
+            return True
+        return False
+
+    def cancel(self, job: DownloadJob) -> bool:
+        """Cancel a queued or running *job*. A running download ends once the
+        request in progress returns.
+
+        Returns:
+            bool: Whether the job was canceled before it started.
+        """
+        if self.queue.cancel(job):
+            QTimer.singleShot(0, partial(self._emit_canceled, job))
+            return True
+        task = self._tasks.get(job)
+        if task is not None:
+            task.cancel()
+        return False
+
+    def _emit_canceled(self, job: DownloadJob):
+        self.downloadFinished.emit(job)
+        self.progressChanged.emit(self.queue.progress())
+
+    def pending(self) -> int:
+        """Return the number of downloads queued or running."""
+        return self.queue.pending()
+
+    def _start_ready(self):
+        for job in self.queue.pop_ready():
+            task = DownloadTask(job)
+            task.downloadFinished.connect(self._on_task_finished)
+            self._tasks[job] = task
+            QgsApplication.taskManager().addTask(task)
+
+    def _on_task_finished(self, task: DownloadTask):
+        job = task.job
+        self._tasks.pop(job, None)
+        self.queue.finish(job, task.error, task.size)
+        if task.error:
+            PlgLogger.log(f"Download of {job.url} failed: {task.error}")
+        # The freed slots are taken before the listeners are called
+        self._start_ready()
+        self.downloadFinished.emit(job)
+        self.progressChanged.emit(self.queue.progress())
+
+
+# Shared by every background download of the QGIS session
+download_manager = DownloadManager()
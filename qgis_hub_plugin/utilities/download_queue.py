@@ -0,0 +1,178 @@
+import heapq
+import itertools
+import threading
+from pathlib import Path
+from typing import NamedTuple
+from urllib.parse import urlsplit
+
+# States of a job
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELED = "canceled"
+
+
+class DownloadJob:
+    """A file to download, waiting in a :class:`DownloadQueue` for a slot.
+
+    Jobs of a higher *priority* start first, those of the same priority in
+    the order they were queued.
+    """
+
+    def __init__(
+        self, url: str, destination: Path, force: bool = True, priority: int = 0
+    ):
+        self.url = url
+        self.destination = Path(destination)
+        self.force = force
+        self.priority = priority
+        self.host = urlsplit(url).hostname or ""
+        self.state = QUEUED
+        self.error = ""
+        # Size of the downloaded file
+        self.size = 0
+
+    @property
+    def key(self) -> tuple[str, Path]:
+        return self.url, self.destination
+
+    def finished(self) -> bool:
+        return self.state in (DONE, FAILED, CANCELED)
+
+    def __repr__(self) -> str:
+        return f"<DownloadJob {self.url} {self.state}>"
+
+
+class DownloadProgress(NamedTuple):
+    """Progress of the jobs queued since the queue was last idle, the
+    counters start again from zero with the next job queued then."""
+
+    total: int = 0
+    finished: int = 0
+    failed: int = 0
+    running: int = 0
+    bytes_received: int = 0
+
+    @property
+    def percent(self) -> float:
+        return 100 * self.finished / self.total if self.total else 100.0
+
+
+class DownloadQueue:
+    """Hold the jobs waiting for a download slot, and decide which ones start.
+
+    At most *max_active* jobs run at the same time, and at most
+    *max_per_host* of them download from the same host. A job whose host is
+    busy does not hold back the jobs of the other hosts. Queuing the file of
+    a job already queued or running returns that job instead, with the
+    highest of the two priorities.
+    """
+
+    def __init__(self, max_active: int = 6, max_per_host: int = 4):
+        self._lock = threading.Lock()
+        self._heap: list[tuple[int, int, DownloadJob]] = []
+        self._counter = itertools.count()
+        self._jobs: dict[tuple[str, Path], DownloadJob] = {}
+        self._active: dict[str, int] = {}
+        self._progress = DownloadProgress()
+        self.set_limits(max_active, max_per_host)
+
+    def set_limits(self, max_active: int, max_per_host: int):
+        """Change the limits, the running jobs are not interrupted."""
+        with self._lock:
+            self.max_active = max(1, max_active)
+            self.max_per_host = max(1, min(max_per_host, self.max_active))
+
+    def push(self, job: DownloadJob) -> DownloadJob:
+        """Queue *job*, or return the identical job queued or running."""
+        with self._lock:
+            existing = self._jobs.get(job.key)
+            if existing is not None:
+                if existing.state == QUEUED and job.priority > existing.priority:
+                    existing.priority = job.priority
+                    self._push(existing)
+                return existing
+            if not self._jobs:
+                # The queue was idle, the job starts a new batch
+                self._heap.clear()
+                self._progress = DownloadProgress()
+            job.state = QUEUED
+            self._jobs[job.key] = job
+            self._push(job)
+            self._progress = self._progress._replace(total=self._progress.total + 1)
+            return job
+
+    def _push(self, job: DownloadJob):
+        # Entries of jobs re-queued with a higher priority, or canceled, are
+        # skipped when popped
+        heapq.heappush(self._heap, (-job.priority, next(self._counter), job))
+
+    def pop_ready(self) -> list[DownloadJob]:
+        """Mark the jobs that may start now as running, and return them."""
+        ready = []
+        skipped = []
+        with self._lock:
+            while self._heap and self._running() < self.max_active:
+                entry = heapq.heappop(self._heap)
+                priority, _, job = entry
+                if job.state != QUEUED or -priority != job.priority:
+                    continue
+                if self._active.get(job.host, 0) >= self.max_per_host:
+                    skipped.append(entry)
+                    continue
+                job.state = RUNNING
+                self._active[job.host] = self._active.get(job.host, 0) + 1
+                ready.append(job)
+            for entry in skipped:
+                heapq.heappush(self._heap, entry)
+            self._progress = self._progress._replace(running=self._running())
+        return ready
+
+    def finish(self, job: DownloadJob, error: str = "", size: int = 0):
+        """Release the slot of a running *job*."""
+        with self._lock:
+            if job.state != RUNNING:
+                return
+            job.state = FAILED if error else DONE
+            job.error = error
+            job.size = size
+            self._release(job)
+            self._progress = self._progress._replace(
+                finished=self._progress.finished + 1,
+                failed=self._progress.failed + bool(error),
+                bytes_received=self._progress.bytes_received + size,
+                running=self._running(),
+            )
+
+    def cancel(self, job: DownloadJob) -> bool:
+        """Drop a queued *job*, running ones cannot be canceled.
+
+        Returns:
+            bool: Whether the job was dropped.
+        """
+        with self._lock:
+            if job.state != QUEUED or self._jobs.get(job.key) is not job:
+                return False
+            job.state = CANCELED
+            del self._jobs[job.key]
+            self._progress = self._progress._replace(total=self._progress.total - 1)
+            return True
+
+    def _release(self, job: DownloadJob):
+        del self._jobs[job.key]
+        self._active[job.host] -= 1
+        if not self._active[job.host]:
+            del self._active[job.host]
+
+    def _running(self) -> int:
+        return sum(self._active.values())
+
+    def progress(self) -> DownloadProgress:
+        with self._lock:
+            return self._progress
+
+    def pending(self) -> int:
+        """Return the number of jobs queued or running."""
+        with self._lock:
+            return len(self._jobs)
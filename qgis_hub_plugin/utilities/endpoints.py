@@ -0,0 +1,167 @@
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+
+from qgis_hub_plugin.utilities.retry import circuit_breaker
+
+OFFICIAL_ENDPOINT = "https://hub.qgis.org"
+
+# Size of a typical transfer, used to weigh the latency of an endpoint
+# against its throughput
+TYPICAL_TRANSFER_SIZE = 256 * 1024
+# Weight of the last measurement in the moving averages
+SMOOTHING = 0.3
+# Transfers too small to measure a throughput
+MIN_THROUGHPUT_SIZE = 32 * 1024
+
+
+def parse_endpoints(text: str) -> list[str]:
+    """Return the endpoint URLs listed in *text*, separated by commas, spaces
+    or new lines, e.g. ``"https://mirror.example.org, http://10.0.0.5:8000"``.
+    """
+    endpoints = []
+    for value in re.split(r"[\s,]+", text or ""):
+        value = value.strip().rstrip("/")
+        if urlsplit(value).scheme in ("http", "https") and value not in endpoints:
+            endpoints.append(value)
+    return endpoints
+
+
+@dataclass
+class EndpointStats:
+    """Moving averages of the measurements of an endpoint."""
+
+    latency: Optional[float] = None
+    throughput: Optional[float] = None
+    measured_at: Optional[float] = None
+
+
+def _average(previous: Optional[float], value: float) -> float:
+    if previous is None:
+        return value
+    return SMOOTHING * value + (1 - SMOOTHING) * previous
+
+
+class EndpointSelector:
+    """Rank the official QGIS Hub and its mirrors, fastest healthy one first.
+
+    An endpoint is the root URL of a server exposing the same paths as the
+    QGIS Hub, e.g. ``https://mirror.example.org`` for
+    ``https://mirror.example.org/api/v1/resources/``. Endpoints are ranked by
+    the expected time of a typical transfer, from their measured latency and
+    throughput. Endpoints whose circuit breaker is open come last, and are
+    only tried when every other one failed.
+    """
+
+    def __init__(
+        self,
+        official: str = OFFICIAL_ENDPOINT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.official = official
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._endpoints = [official]
+        self._stats: dict[str, EndpointStats] = {}
+
+    @property
+    def endpoints(self) -> list[str]:
+        with self._lock:
+            return list(self._endpoints)
+
+    def set_mirrors(self, mirrors: list[str]):
+        """Use *mirrors* next to the official QGIS Hub."""
+        with self._lock:
+            self._endpoints = [self.official] + [
+                mirror for mirror in mirrors if mirror != self.official
+            ]
+            self._stats = {
+                endpoint: stats
+                for endpoint, stats in self._stats.items()
+                if endpoint in self._endpoints
+            }
+
+    def record_latency(self, endpoint: str, seconds: float):
+        with self._lock:
+            stats = self._stats.setdefault(endpoint, EndpointStats())
+            stats.latency = _average(stats.latency, seconds)
+            stats.measured_at = self._clock()
+
+    def record_transfer(self, endpoint: str, size: int, seconds: float):
+        """Record a completed download of *size* bytes."""
+        if size < MIN_THROUGHPUT_SIZE or seconds <= 0:
+            return
+        with self._lock:
+            stats = self._stats.setdefault(endpoint, EndpointStats())
+            stats.throughput = _average(stats.throughput, size / seconds)
+            stats.measured_at = self._clock()
+
+    def stats(self, endpoint: str) -> EndpointStats:
+        with self._lock:
+            stats = self._stats.get(endpoint, EndpointStats())
+            return EndpointStats(stats.latency, stats.throughput, stats.measured_at)
+
+    def needs_probe(self, max_age: float) -> bool:
+        """Tell whether the latency of the mirrors must be measured again,
+        which is pointless without mirrors."""
+        with self._lock:
+            if len(self._endpoints) < 2:
+                return False
+            now = self._clock()
+            return any(
+                self._stats.get(endpoint) is None
+                or self._stats[endpoint].latency is None
+                or now - self._stats[endpoint].measured_at > max_age
+                for endpoint in self._endpoints
+            )
+
+    def expected_time(self, endpoint: str) -> Optional[float]:
+        """Return the expected seconds of a typical transfer, None while the
+        endpoint is not measured."""
+        stats = self.stats(endpoint)
+        if stats.latency is None:
+            return None
+        if not stats.throughput:
+            return stats.latency
+        return stats.latency + TYPICAL_TRANSFER_SIZE / stats.throughput
+
+    def ranked(self) -> list[str]:
+        """Return the endpoints, the one to use first."""
+        endpoints = self.endpoints
+
+        def key(item):
+            index, endpoint = item
+            expected = self.expected_time(endpoint)
+            return (
+                circuit_breaker.is_open(urlsplit(endpoint).hostname or ""),
+                expected is None,
+                expected or 0.0,
+                index,
+            )
+
+        return [endpoint for _, endpoint in sorted(enumerate(endpoints), key=key)]
+
+    def endpoint_of(self, url: str) -> Optional[str]:
+        """Return the endpoint *url* belongs to, if any."""
+        for endpoint in self.endpoints:
+            if url == endpoint or url.startswith(endpoint + "/"):
+                return endpoint
+        return None
+
+    def candidates(self, url: str) -> list[str]:
+        """Return *url* moved to each endpoint, in the order to try them.
+
+        URLs outside the known endpoints are returned as is.
+        """
+        endpoint = self.endpoint_of(url)
+        if endpoint is None:
+            return [url]
+        path = url[len(endpoint) :]
+        return [candidate + path for candidate in self.ranked()]
+
+
+# Shared by every request made to the QGIS Hub in the QGIS session
+endpoint_selector = EndpointSelector()
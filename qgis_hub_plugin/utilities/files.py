@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Iterator
+
+
+def _sync_directory(directory: Path):
+    """Flush the entries of *directory* to disk, so a rename survives a
+    crash. Directories cannot be opened on Windows, where renames are
+    journaled anyway."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_write(destination: Path, mode: str = "wb", **kwargs) -> Iterator[IO]:
+    """Open a temporary file which replaces *destination* once written.
+
+    The data is flushed to disk before the temporary file is renamed over
+    *destination*, so an interrupted write never leaves a truncated file:
+    readers see either the previous content or the new one. The temporary
+    file is removed when the block raises.
+
+    Args:
+        destination (Path): The file to write.
+        mode (str): The mode of the temporary file, "wb" or "w".
+        kwargs: Passed to ``open``, e.g. the encoding in text mode.
+    """
+    destination = Path(destination)
+    f = tempfile.NamedTemporaryFile(
+        mode,
+        prefix=f".{destination.name}.",
+        suffix=".tmp",
+        dir=destination.parent,
+        delete=False,
+        **kwargs,
+    )
+    try:
+        with f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(f.name, destination)
+    except BaseException:
+        Path(f.name).unlink(missing_ok=True)
+        raise
+    _sync_directory(destination.parent)
+
+
+def atomic_copy(source: Path, destination: Path):
+    """Copy *source* to *destination* with :func:`atomic_write`."""
+    with open(source, "rb") as src, atomic_write(destination) as dst:
+        shutil.copyfileobj(src, dst)
+
+
+def replace_file(source: Path, destination: Path):
+    """Rename *source* over *destination*, once *source* was flushed to
+    disk, so that readers see either file but never a truncated one."""
+    os.replace(source, destination)
+    _sync_directory(Path(destination).parent)
@@ -0,0 +1,131 @@
+import json
+import statistics
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from qgis_hub_plugin.utilities.files import atomic_write
+
+# How the body of a request was obtained
+OUTCOME_NETWORK = "network"
+# Answered by the QGIS network cache, possibly after a 304 Not Modified
+OUTCOME_HTTP_CACHE = "http_cache"
+# The destination file already existed, nothing was requested
+OUTCOME_LOCAL = "local"
+# Copied from an imported offline bundle, nothing was requested
+OUTCOME_OFFLINE = "offline"
+# Shared the request of a concurrent identical download
+OUTCOME_COALESCED = "coalesced"
+OUTCOME_ERROR = "error"
+
+
+class TransferRecord(NamedTuple):
+    """Measures of a single request. The durations are in seconds since the
+    request was sent, None when the stage was not observed, e.g. no TLS
+    handshake on a reused connection."""
+
+    url: str
+    host: str
+    outcome: str
+    status: Optional[int] = None
+    bytes_received: int = 0
+    duration: float = 0.0
+    tls: Optional[float] = None
+    first_byte: Optional[float] = None
+    http2: bool = False
+    error: str = ""
+    # Wall clock time the request ended, as a Unix timestamp
+    finished: float = 0.0
+
+
+def _percentile(values: list[float], percent: int) -> Optional[float]:
+    if not values:
+        return None
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def _aggregate(records: list[TransferRecord]) -> dict:
+    durations = [r.duration for r in records if r.outcome == OUTCOME_NETWORK]
+    first_bytes = [r.first_byte for r in records if r.first_byte is not None]
+    tls = [r.tls for r in records if r.tls is not None]
+    received = sum(r.bytes_received for r in records if r.outcome == OUTCOME_NETWORK)
+    outcomes = {}
+    for record in records:
+        outcomes[record.outcome] = outcomes.get(record.outcome, 0) + 1
+    return {
+        "requests": len(records),
+        "outcomes": outcomes,
+        "bytes_received": received,
+        "duration_median": _percentile(durations, 50),
+        "duration_p95": _percentile(durations, 95),
+        "first_byte_median": _percentile(first_bytes, 50),
+        "tls_median": _percentile(tls, 50),
+        # Over the network only, the other outcomes transfer nothing
+        "throughput": received / sum(durations) if sum(durations) > 0 else None,
+    }
+
+
+class MetricsRegistry:
+    """Keep the measures of the latest requests, and aggregate them overall
+    and per host.
+
+    Args:
+        max_records (int): Number of requests kept, the oldest ones are
+            dropped first.
+    """
+
+    def __init__(self, max_records: int = 1000):
+        self._lock = threading.Lock()
+        self._records: deque[TransferRecord] = deque(maxlen=max_records)
+        # Requests recorded since the reset, including the dropped ones
+        self.total = 0
+        self.since = time.time()
+
+    def record(self, record: TransferRecord):
+        if not record.finished:
+            record = record._replace(finished=time.time())
+        with self._lock:
+            self._records.append(record)
+            self.total += 1
+
+    def records(self) -> list[TransferRecord]:
+        with self._lock:
+            return list(self._records)
+
+    def reset(self):
+        with self._lock:
+            self._records.clear()
+            self.total = 0
+            self.since = time.time()
+
+    def summary(self) -> dict:
+        """Aggregate the requests kept, overall and per host."""
+        records = self.records()
+        hosts = {}
+        for record in records:
+            hosts.setdefault(record.host, []).append(record)
+        return {
+            "overall": _aggregate(records),
+            "hosts": {host: _aggregate(items) for host, items in hosts.items()},
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "since": self.since,
+            "total": self.total,
+            "summary": self.summary(),
+            "records": [record._asdict() for record in self.records()],
+        }
+
+    def export(self, destination: Path):
+        """Write the summary and the requests kept to a JSON file."""
+        with atomic_write(destination, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+# Shared by every request of the QGIS session
+transfer_metrics = MetricsRegistry()
@@ -0,0 +1,104 @@
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+# HTTP status codes worth retrying, the other errors will not go away by
+# asking again.
+RETRYABLE_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Bounded retries with exponential backoff and full jitter.
+
+    Only meant for idempotent requests, e.g. the GET requests made to the
+    QGIS Hub.
+    """
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def delay(self, attempt: int) -> float:
+        """Return the seconds to wait before retrying after *attempt* failed.
+
+        Args:
+            attempt (int): The number of the failed attempt, starting at 1.
+        """
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        # Full jitter, so clients failing together do not retry together
+        return random.uniform(0, backoff)
+
+    def should_retry(self, attempt: int) -> bool:
+        return attempt < self.max_attempts
+
+
+class CircuitBreaker:
+    """Fail fast on hosts that keep failing.
+
+    After *failure_threshold* consecutive failures the circuit of a host opens
+    and its requests fail immediately for *reset_timeout* seconds. Then a
+    single trial request is let through: the circuit closes again if it
+    succeeds, and stays open for another *reset_timeout* otherwise.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures: dict[str, int] = {}
+        self._opened_at: dict[str, float] = {}
+
+    def allow(self, host: str) -> bool:
+        """Tell whether a request to *host* can be sent."""
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return True
+            if self._clock() - opened_at < self.reset_timeout:
+                return False
+            # Let one trial request through, the others keep failing fast
+            self._opened_at[host] = self._clock()
+            return True
+
+    def retry_in(self, host: str) -> float:
+        """Return the seconds left before *host* is tried again."""
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return 0.0
+            return max(0.0, self.reset_timeout - (self._clock() - opened_at))
+
+    def is_open(self, host: str) -> bool:
+        with self._lock:
+            return host in self._opened_at
+
+    def record_success(self, host: str):
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+
+    def record_failure(self, host: str):
+        with self._lock:
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            if failures >= self.failure_threshold:
+                self._opened_at[host] = self._clock()
+
+    def reset(self):
+        with self._lock:
+            self._failures.clear()
+            self._opened_at.clear()
+
+
+# Shared by every request made to the QGIS Hub in the QGIS session
+retry_policy = RetryPolicy()
+circuit_breaker = CircuitBreaker()
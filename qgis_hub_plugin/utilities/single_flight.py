@@ -0,0 +1,97 @@
+import threading
+from collections.abc import Hashable
+from typing import Any, Callable, Optional
+
+
+class Flight:
+    """A call in progress, shared by every caller asking for its key."""
+
+    def __init__(self, key: Hashable, handle: Any):
+        self.key = key
+        # What the caller who started the flight needs to complete it, e.g.
+        # the network reply
+        self.handle = handle
+        self.owner = threading.get_ident()
+        self.result: Any = None
+        self._done = threading.Event()
+        self._callbacks: list[Callable[[], None]] = []
+
+    @property
+    def is_owner(self) -> bool:
+        """Tell whether the current thread started the flight, and must then
+        complete it."""
+        return threading.get_ident() == self.owner
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for another thread to complete the flight."""
+        return self._done.wait(timeout)
+
+
+class SingleFlight:
+    """Coalesce concurrent identical calls into a single one.
+
+    The first caller asking for a key starts a flight, the callers asking for
+    the same key until it lands join it and receive the same result. Any
+    caller of the thread that started the flight may complete it, e.g. a
+    caller re-entered from the event loop of the first one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: dict[Hashable, Flight] = {}
+        # Flights started, and callers who joined one instead
+        self.started = 0
+        self.coalesced = 0
+
+    def join(self, key: Hashable, start: Callable[[], Any]) -> Flight:
+        """Return the flight in progress for *key*, starting one with
+        *start* when there is none."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                self.coalesced += 1
+                return flight
+            flight = Flight(key, start())
+            self._flights[key] = flight
+            self.started += 1
+            return flight
+
+    def land(self, flight: Flight, result: Any) -> bool:
+        """Complete *flight* with *result*, unless it is already complete.
+
+        Returns:
+            bool: Whether this call completed the flight.
+        """
+        with self._lock:
+            if flight.done():
+                return False
+            flight.result = result
+            if self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+            flight._done.set()
+            callbacks, flight._callbacks = flight._callbacks, []
+        for callback in callbacks:
+            callback()
+        return True
+
+    def notify(self, flight: Flight, callback: Callable[[], None]):
+        """Call *callback* once *flight* is complete, right away when it
+        already is. It is called on the thread completing the flight."""
+        with self._lock:
+            if not flight.done():
+                flight._callbacks.append(callback)
+                return
+        callback()
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+
+# Shared by every file download of the QGIS session
+download_flights = SingleFlight()
+# Shared by every catalog refresh of the QGIS session
+refresh_flights = SingleFlight()
@@ -0,0 +1,20 @@
+#! python3  # noqa E265
+
+"""
+Shared pytest fixtures for the tests depending on QGIS.
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def no_background_catalog_refresh():
+    """Keep the resource browser from revalidating the catalog against the
+    real QGIS Hub when a dialog is created in a test."""
+    with patch(
+        "qgis_hub_plugin.gui.resource_browser.ResourceBrowserDialog"
+        ".start_catalog_refresh"
+    ) as mock_refresh:
+        yield mock_refresh
@@ -16,13 +16,17 @@ Usage from the repo root folder:
 """
 
 import json
+import tempfile
 import unittest
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from unittest.mock import MagicMock, mock_open, patch
+from unittest.mock import MagicMock, call, mock_open, patch
 
 import pytest
 
+from qgis_hub_plugin.core.api_client import CatalogFetch, CatalogPage
 from qgis_hub_plugin.utilities.exception import DownloadError
+from qgis_hub_plugin.utilities.files import atomic_write
 
 
 class TestApiClientMocked(unittest.TestCase):
@@ -31,14 +35,14 @@ class TestApiClientMocked(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures."""
         self.mock_cache_dir = Path("/tmp/qgis_test/qgis_hub")
-        self.mock_response_file = self.mock_cache_dir / "response.json"
+        self.mock_response_file = self.mock_cache_dir / "response.json.gz"
 
     @patch("qgis_hub_plugin.core.api_client.QgsApplication")
-    @patch("qgis_hub_plugin.core.api_client.download_file")
+    @patch("qgis_hub_plugin.core.api_client.fetch_catalog")
     @patch("pathlib.Path.exists")
     @patch("builtins.open", new_callable=mock_open)
     def test_get_all_resources_with_cache(
-        self, mock_file, mock_exists, mock_download, mock_qgs_app
+        self, mock_file, mock_exists, mock_fetch, mock_qgs_app
     ):
         """Test cache retrieval without network call."""
         from qgis_hub_plugin.core.api_client import get_all_resources
@@ -62,17 +66,20 @@ class TestApiClientMocked(unittest.TestCase):
                 }
             ],
         }
-        mock_file.return_value.read.return_value = json.dumps(mock_data)
-        mock_file.return_value.__enter__.return_value.read.return_value = json.dumps(
-            mock_data
-        )
-
         # Call function without force update
-        with patch("builtins.open", mock_open(read_data=json.dumps(mock_data))):
+        with patch(
+            "qgis_hub_plugin.core.api_client.gzip.open",
+            mock_open(read_data=json.dumps(mock_data)),
+        ) as mock_gzip_open:
             result = get_all_resources(force_update=False)
 
+        # Verify the compressed cache was read
+        mock_gzip_open.assert_called_once_with(
+            self.mock_response_file, "rt", encoding="utf-8"
+        )
+
         # Verify no download occurred
-        mock_download.assert_not_called()
+        mock_fetch.assert_not_called()
 
         # Verify cached data returned
         self.assertIsNotNone(result)
@@ -81,11 +88,11 @@ class TestApiClientMocked(unittest.TestCase):
         self.assertEqual(result["results"][0]["uuid"], "cached-uuid")
 
     @patch("qgis_hub_plugin.core.api_client.QgsApplication")
-    @patch("qgis_hub_plugin.core.api_client.download_file")
+    @patch("qgis_hub_plugin.core.api_client.fetch_catalog")
     @patch("pathlib.Path.exists")
     @patch("builtins.open", new_callable=mock_open)
     def test_get_all_resources_force_update(
-        self, mock_file, mock_exists, mock_download, mock_qgs_app
+        self, mock_file, mock_exists, mock_fetch, mock_qgs_app
     ):
         """Test forced API call bypasses cache."""
         from qgis_hub_plugin.core.api_client import get_all_resources
@@ -93,8 +100,6 @@ class TestApiClientMocked(unittest.TestCase):
         # Setup mock paths
         mock_qgs_app.qgisSettingsDirPath.return_value = "/tmp/qgis_test"
 
-        # Mock successful download
-        mock_download.return_value = True
         mock_exists.return_value = True
 
         # Mock fresh API response
@@ -110,47 +115,45 @@ class TestApiClientMocked(unittest.TestCase):
                 }
             ],
         }
+        mock_fetch.return_value = CatalogFetch(mock_data, {}, True)
 
-        with patch("builtins.open", mock_open(read_data=json.dumps(mock_data))):
+        with patch(
+            "qgis_hub_plugin.core.api_client.atomic_write", wraps=atomic_write
+        ) as mock_atomic_write:
             result = get_all_resources(force_update=True)
 
-        # Verify download was called with correct URL
-        mock_download.assert_called_once()
-        call_args = mock_download.call_args
-        self.assertIn("limit=1000", call_args[1]["url"])
-        self.assertIn("format=json", call_args[1]["url"])
+        # Verify the catalog was downloaded and written to the compressed cache
+        mock_fetch.assert_called_once()
+        mock_atomic_write.assert_any_call(self.mock_response_file)
 
         # Verify fresh data returned
         self.assertIsNotNone(result)
         self.assertEqual(result["total"], 10)
 
     @patch("qgis_hub_plugin.core.api_client.QgsApplication")
-    @patch("qgis_hub_plugin.core.api_client.download_file")
+    @patch("qgis_hub_plugin.core.api_client.fetch_catalog")
     @patch("pathlib.Path.exists")
-    def test_get_all_resources_download_failure(
-        self, mock_exists, mock_download, mock_qgs_app
+    @patch("builtins.open", new_callable=mock_open)
+    def test_get_all_resources_forwards_page_callback(
+        self, mock_file, mock_exists, mock_fetch, mock_qgs_app
     ):
-        """Test handling of download failures."""
+        """Test the page callback is handed to the catalog fetcher."""
         from qgis_hub_plugin.core.api_client import get_all_resources
 
-        # Setup mock paths
         mock_qgs_app.qgisSettingsDirPath.return_value = "/tmp/qgis_test"
-
-        # Mock download failure
-        mock_download.return_value = False
         mock_exists.return_value = False
+        mock_fetch.return_value = CatalogFetch({"total": 0, "results": []}, {}, True)
+        on_page = MagicMock()
 
-        # Call function with force update
-        result = get_all_resources(force_update=True)
+        get_all_resources(force_update=True, on_page=on_page)
 
-        # Verify None returned on failure
-        self.assertIsNone(result)
+        self.assertIs(mock_fetch.call_args[1]["on_page"], on_page)
 
     @patch("qgis_hub_plugin.core.api_client.QgsApplication")
-    @patch("qgis_hub_plugin.core.api_client.download_file")
+    @patch("qgis_hub_plugin.core.api_client.fetch_catalog")
     @patch("pathlib.Path.exists")
     def test_get_all_resources_no_cache_first_run(
-        self, mock_exists, mock_download, mock_qgs_app
+        self, mock_exists, mock_fetch, mock_qgs_app
     ):
         """Test first run when cache doesn't exist."""
         from qgis_hub_plugin.core.api_client import get_all_resources
@@ -161,17 +164,17 @@ class TestApiClientMocked(unittest.TestCase):
         # Mock cache doesn't exist
         mock_exists.return_value = False
 
-        # Mock successful download but file still doesn't exist after
-        mock_download.return_value = True
+        mock_fetch.return_value = CatalogFetch({"total": 0, "results": []}, {}, True)
 
-        result = get_all_resources(force_update=False)
+        with patch("builtins.open", mock_open()):
+            get_all_resources(force_update=False)
 
         # Should attempt download when cache missing
-        mock_download.assert_called_once()
+        mock_fetch.assert_called_once()
 
     @patch("qgis_hub_plugin.core.api_client.QgsApplication")
     @patch("pathlib.Path.exists")
-    @patch("builtins.open", new_callable=mock_open)
+    @patch("qgis_hub_plugin.core.api_client.gzip.open", new_callable=mock_open)
     def test_get_all_resources_json_parse_error(
         self, mock_file, mock_exists, mock_qgs_app
     ):
@@ -196,10 +199,10 @@ class TestApiClientMocked(unittest.TestCase):
         self.assertEqual(str(ctx.exception), API_UNAVAILABLE_MESSAGE)
 
     @patch("qgis_hub_plugin.core.api_client.QgsApplication")
-    @patch("qgis_hub_plugin.core.api_client.download_file")
+    @patch("qgis_hub_plugin.core.api_client.fetch_catalog")
     @patch("pathlib.Path.exists")
     def test_get_all_resources_download_error_user_message(
-        self, mock_exists, mock_download, mock_qgs_app
+        self, mock_exists, mock_fetch, mock_qgs_app
     ):
         from qgis_hub_plugin.core.api_client import (
             API_UNAVAILABLE_MESSAGE,
@@ -208,7 +211,7 @@ class TestApiClientMocked(unittest.TestCase):
 
         mock_qgs_app.qgisSettingsDirPath.return_value = "/tmp/qgis_test"
         mock_exists.return_value = False
-        mock_download.side_effect = DownloadError("File not found (404 error)")
+        mock_fetch.side_effect = DownloadError("File not found (404 error)")
 
         with self.assertRaises(DownloadError) as ctx:
             get_all_resources(force_update=True)
@@ -216,6 +219,836 @@ class TestApiClientMocked(unittest.TestCase):
         self.assertEqual(str(ctx.exception), API_UNAVAILABLE_MESSAGE)
 
 
+class TestCatalogPagination(unittest.TestCase):
+    """Test the paginated catalog fetcher."""
+
+    def setUp(self):
+        from qgis_hub_plugin.utilities.retry import RetryPolicy, circuit_breaker
+
+        patcher = patch(
+            "qgis_hub_plugin.core.api_client.retry_policy",
+            RetryPolicy(base_delay=0.0),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        circuit_breaker.reset()
+        self.addCleanup(circuit_breaker.reset)
+
+    @staticmethod
+    def _page(uuids, total=None, next_url=None, url=""):
+        data = {"next": next_url, "results": [{"uuid": uuid} for uuid in uuids]}
+        if total is not None:
+            data["total"] = total
+        return CatalogPage(url=url, data=data)
+
+    @patch("qgis_hub_plugin.core.api_client.fetch_pages")
+    def test_fetch_catalog_single_page(self, mock_fetch_pages):
+        """Test a catalog smaller than a page needs a single request."""
+        from qgis_hub_plugin.core.api_client import _page_url, fetch_catalog
+
+        first_url = _page_url(0)
+        mock_fetch_pages.return_value = {first_url: self._page(["a", "b"], total=2)}
+
+        catalog, validators, modified = fetch_catalog()
+
+        mock_fetch_pages.assert_called_once_with(
+            [first_url], None, cached_pages={}, feedback=None
+        )
+        self.assertTrue(modified)
+        self.assertEqual([r["uuid"] for r in catalog["results"]], ["a", "b"])
+        self.assertEqual(catalog["total"], 2)
+        self.assertIsNone(catalog["next"])
+
+    @patch("qgis_hub_plugin.core.api_client.PAGE_SIZE", 2)
+    @patch("qgis_hub_plugin.core.api_client.fetch_pages")
+    def test_fetch_catalog_remaining_pages_in_one_batch(self, mock_fetch_pages):
+        """Test the pages after the first one are requested together."""
+        from qgis_hub_plugin.core.api_client import _page_url, fetch_catalog
+
+        pages = {
+            _page_url(0): self._page(["a", "b"], total=5),
+            _page_url(2): self._page(["c", "d"], total=5),
+            _page_url(4): self._page(["e"], total=5),
+        }
+        mock_fetch_pages.side_effect = lambda urls, on_page, cached_pages, feedback: {
+            url: pages[url] for url in urls
+        }
+
+        catalog = fetch_catalog().catalog
+
+        self.assertEqual(mock_fetch_pages.call_count, 2)
+        self.assertEqual(
+            mock_fetch_pages.call_args_list[1][0][0], [_page_url(2), _page_url(4)]
+        )
+        self.assertEqual(
+            [r["uuid"] for r in catalog["results"]], ["a", "b", "c", "d", "e"]
+        )
+
+    @patch("qgis_hub_plugin.core.api_client.PAGE_SIZE", 2)
+    @patch("qgis_hub_plugin.core.api_client.fetch_pages")
+    def test_fetch_catalog_reports_progress(self, mock_fetch_pages):
+        """Test the feedback receives the share of resources downloaded."""
+        from qgis.core import QgsFeedback
+
+        from qgis_hub_plugin.core.api_client import _page_url, fetch_catalog
+
+        pages = {
+            _page_url(0): self._page(["a", "b"], total=4),
+            _page_url(2): self._page(["c", "d"], total=4),
+        }
+
+        def fake_fetch_pages(urls, on_page, cached_pages, feedback):
+            for url in urls:
+                if on_page is not None:
+                    on_page(pages[url].data["results"])
+            return {url: pages[url] for url in urls}
+
+        mock_fetch_pages.side_effect = fake_fetch_pages
+        feedback = QgsFeedback()
+        progress = []
+        feedback.progressChanged.connect(progress.append)
+        on_page = MagicMock()
+
+        fetch_catalog(on_page=on_page, feedback=feedback)
+
+        self.assertEqual(progress, [50.0, 100.0])
+        self.assertEqual(on_page.call_count, 2)
+
+    @patch("qgis_hub_plugin.core.api_client.PAGE_SIZE", 2)
+    @patch("qgis_hub_plugin.core.api_client.fetch_pages")
+    def test_fetch_catalog_drops_duplicates(self, mock_fetch_pages):
+        """Test resources shifted between two pages are only kept once."""
+        from qgis_hub_plugin.core.api_client import _page_url, fetch_catalog
+
+        pages = {
+            _page_url(0): self._page(["a", "b"], total=4),
+            _page_url(2): self._page(["b", "c"], total=4),
+        }
+        mock_fetch_pages.side_effect = lambda urls, on_page, cached_pages, feedback: {
+            url: pages[url] for url in urls
+        }
+
+        catalog = fetch_catalog().catalog
+
+        self.assertEqual([r["uuid"] for r in catalog["results"]], ["a", "b", "c"])
+
+    @patch("qgis_hub_plugin.core.api_client.PAGE_SIZE", 3)
+    @patch("qgis_hub_plugin.core.api_client.fetch_pages")
+    def test_fetch_catalog_page_size_capped(self, mock_fetch_pages):
+        """Test the offsets step by the size of the first page when the server
+        caps the page size."""
+        from qgis_hub_plugin.core.api_client import _page_url, fetch_catalog
+
+        pages = {
+            _page_url(0): self._page(["a", "b"], total=5),
+            _page_url(2): self._page(["c", "d"], total=5),
+            _page_url(4): self._page(["e"], total=5),
+        }
+        mock_fetch_pages.side_effect = lambda urls, on_page, cached_pages, feedback: {
+            url: pages[url] for url in urls
+        }
+
+        catalog = fetch_catalog().catalog
+
+        self.assertEqual(
+            mock_fetch_pages.call_args_list[1][0][0], [_page_url(2), _page_url(4)]
+        )
+        self.assertEqual(
+            [r["uuid"] for r in catalog["results"]], ["a", "b", "c", "d", "e"]
+        )
+
+    @patch("qgis_hub_plugin.core.api_client.PAGE_SIZE", 2)
+    @patch("qgis_hub_plugin.core.api_client.fetch_pages")
+    def test_fetch_catalog_incomplete_follows_next_links(self, mock_fetch_pages):
+        """Test the next links are followed when the pages miss resources."""
+        from qgis_hub_plugin.core.api_client import _page_url, fetch_catalog
+
+        pages = {
+            _page_url(0): self._page(["a", "b"], total=4, next_url="https://hub/p2"),
+            _page_url(2): self._page(["b", "c"], total=4),
+            "https://hub/p2": self._page(["c", "d"], total=4),
+        }
+
+        def fake_fetch_pages(urls, on_page, cached_pages, feedback):
+            for url in urls:
+                on_page(pages[url].data["results"])
+            return {url: pages[url] for url in urls}
+
+        mock_fetch_pages.side_effect = fake_fetch_pages
+        on_page = MagicMock()
+
+        catalog = fetch_catalog(on_page=on_page).catalog
+
+        self.assertEqual(mock_fetch_pages.call_args_list[-1][0][0], ["https://hub/p2"])
+        self.assertEqual([r["uuid"] for r in catalog["results"]], ["a", "b", "c", "d"])
+        # The resources already received are not handed again
+        self.assertEqual(on_page.call_args[0][0], [{"uuid": "d"}])
+
+    @patch("qgis_hub_plugin.core.api_client.PAGE_SIZE", 2)
+    @patch("qgis_hub_plugin.core.api_client.fetch_pages")
+    def test_fetch_catalog_by_resource_type(self, mock_fetch_pages):
+        """Test each resource type is downloaded separately, first type first."""
+        from qgis_hub_plugin.core.api_client import _page_url, fetch_catalog
+
+        pages = {
+            _page_url(0, limit=1): self._page(["m1"], total=4),
+            _page_url(0, resource_type="Style"): self._page(["s1", "s2"], total=3),
+            _page_url(2, resource_type="Style"): self._page(["s3"], total=3),
+            _page_url(0, resource_type="Model"): self._page(["m1"], total=1),
+        }
+
+        def fake_fetch_pages(urls, on_page, cached_pages, feedback):
+            for url in urls:
+                on_page(pages[url].data["results"])
+            return {url: pages[url] for url in urls}
+
+        mock_fetch_pages.side_effect = fake_fetch_pages
+        on_page = MagicMock()
+
+        catalog = fetch_catalog(on_page=on_page, resource_types=["Style", "Model"])
+
+        self.assertEqual(
+            mock_fetch_pages.call_args_list[0][0][0],
+            [
+                _page_url(0, resource_type="Style"),
+                _page_url(0, resource_type="Model"),
+                _page_url(0, limit=1),
+            ],
+        )
+        self.assertEqual(
+            mock_fetch_pages.call_args_list[1][0][0],
+            [_page_url(2, resource_type="Style")],
+        )
+        # The resource of the count page is not handed twice
+        self.assertEqual(
+            [r["uuid"] for batch in on_page.call_args_list for r in batch[0][0]],
+            ["s1", "s2", "m1", "s3"],
+        )
+        self.assertEqual(
+            [r["uuid"] for r in catalog.catalog["results"]], ["s1", "s2", "m1", "s3"]
+        )
+
+    @patch("qgis_hub_plugin.core.api_client.fetch_pages")
+    def test_fetch_catalog_by_resource_type_incomplete(self, mock_fetch_pages):
+        """Test the whole catalog is downloaded when a type is unknown."""
+        from qgis_hub_plugin.core.api_client import _page_url, fetch_catalog
+
+        pages = {
+            _page_url(0, limit=1): self._page(["n1"], total=2),
+            _page_url(0, resource_type="Style"): self._page(["s1"], total=1),
+            _page_url(0): self._page(["n1", "s1"], total=2),
+        }
+        mock_fetch_pages.side_effect = lambda urls, on_page, cached_pages, feedback: {
+            url: pages[url] for url in urls
+        }
+
+        catalog = fetch_catalog(resource_types=["Style"]).catalog
+
+        self.assertEqual(mock_fetch_pages.call_args_list[-1][0][0], [_page_url(0)])
+        self.assertEqual([r["uuid"] for r in catalog["results"]], ["n1", "s1"])
+
+    @patch("qgis_hub_plugin.core.api_client.fetch_pages")
+    def test_fetch_catalog_follows_next_links(self, mock_fetch_pages):
+        """Test the next links are followed when the size is unknown."""
+        from qgis_hub_plugin.core.api_client import _page_url, fetch_catalog
+
+        pages = {
+            _page_url(0): self._page(["a"], next_url="https://hub/page2"),
+            "https://hub/page2": self._page(["b"], next_url="https://hub/page3"),
+            "https://hub/page3": self._page(["c"]),
+        }
+        mock_fetch_pages.side_effect = lambda urls, on_page, cached_pages, feedback: {
+            url: pages[url] for url in urls
+        }
+
+        catalog = fetch_catalog().catalog
+
+        self.assertEqual(mock_fetch_pages.call_count, 3)
+        self.assertEqual([r["uuid"] for r in catalog["results"]], ["a", "b", "c"])
+
+    @patch("qgis_hub_plugin.core.api_client.QgsApplication")
+    @patch("qgis_hub_plugin.core.api_client.QgsNetworkAccessManager")
+    def test_fetch_pages_streams_each_page(self, mock_nam, mock_qgs_app):
+        """Test every downloaded page is handed to the callback."""
+        from qgis.PyQt.QtNetwork import QNetworkReply
+
+        from qgis_hub_plugin.core.api_client import fetch_pages
+
+        def make_reply(uuid):
+            reply = MagicMock()
+            reply.isFinished.return_value = True
+            reply.error.return_value = QNetworkReply.NetworkError.NoError
+            reply.readAll.return_value.data.return_value = json.dumps(
+                {"results": [{"uuid": uuid}]}
+            ).encode()
+            reply.rawHeader.return_value = b""
+            return reply
+
+        mock_nam.instance.return_value.get.side_effect = [
+            make_reply("a"),
+            make_reply("b"),
+        ]
+        on_page = MagicMock()
+
+        pages = fetch_pages(["https://hub/1", "https://hub/2"], on_page)
+
+        self.assertEqual(set(pages), {"https://hub/1", "https://hub/2"})
+        self.assertEqual(on_page.call_count, 2)
+
+    @patch("qgis_hub_plugin.core.api_client.wait_for_replies")
+    @patch("qgis_hub_plugin.core.api_client.QgsNetworkAccessManager")
+    def test_fetch_pages_streams_resources_while_downloading(self, mock_nam, mock_wait):
+        """Test resources are handed over before their page is complete."""
+        from qgis.PyQt.QtNetwork import QNetworkReply
+
+        from qgis_hub_plugin.core.api_client import fetch_pages
+
+        body = json.dumps(
+            {"total": 2, "results": [{"uuid": "a"}, {"uuid": "b"}]}
+        ).encode()
+        split = body.index(b'{"uuid": "b"')
+        reply = MagicMock()
+        reply.isFinished.side_effect = [False, True]
+        reply.error.return_value = QNetworkReply.NetworkError.NoError
+        reply.attribute.return_value = 200
+        reply.bytesAvailable.return_value = split
+        reply.readAll.return_value.data.side_effect = [body[:split], body[split:]]
+        reply.rawHeader.return_value = b""
+        mock_nam.instance.return_value.get.return_value = reply
+        on_page = MagicMock()
+
+        pages = fetch_pages(["https://hub/1"], on_page)
+
+        self.assertEqual(
+            on_page.call_args_list, [call([{"uuid": "a"}]), call([{"uuid": "b"}])]
+        )
+        self.assertEqual(
+            pages["https://hub/1"].data,
+            {"total": 2, "results": [{"uuid": "a"}, {"uuid": "b"}]},
+        )
+
+    @patch("qgis_hub_plugin.core.api_client.QgsApplication")
+    @patch("qgis_hub_plugin.core.api_client.QgsNetworkAccessManager")
+    def test_fetch_pages_error(self, mock_nam, mock_qgs_app):
+        """Test a failing page raises a DownloadError."""
+        from qgis.PyQt.QtNetwork import QNetworkReply
+
+        from qgis_hub_plugin.core.api_client import fetch_pages
+
+        reply = MagicMock()
+        reply.isFinished.return_value = True
+        reply.error.return_value = QNetworkReply.NetworkError.TimeoutError
+        reply.errorString.return_value = "Network timeout"
+        mock_nam.instance.return_value.get.return_value = reply
+
+        with self.assertRaises(DownloadError):
+            fetch_pages(["https://hub/1"])
+
+        # The page was retried before giving up
+        self.assertEqual(mock_nam.instance.return_value.get.call_count, 3)
+
+    @patch("qgis_hub_plugin.core.api_client.wait_for_replies")
+    @patch("qgis_hub_plugin.core.api_client.QgsNetworkAccessManager")
+    def test_fetch_pages_canceled(self, mock_nam, mock_wait):
+        """Test canceling the feedback aborts the requests in flight."""
+        from qgis.core import QgsFeedback
+
+        from qgis_hub_plugin.core.api_client import fetch_pages
+
+        reply = MagicMock()
+        reply.isFinished.return_value = False
+        mock_nam.instance.return_value.get.return_value = reply
+        feedback = QgsFeedback()
+        mock_wait.side_effect = lambda *args, **kwargs: feedback.cancel()
+
+        with self.assertRaises(DownloadError) as context:
+            fetch_pages(["https://hub/1"], feedback=feedback)
+
+        self.assertIn("canceled", str(context.exception))
+        reply.abort.assert_called_once()
+
+    @patch("qgis_hub_plugin.core.api_client.QgsApplication")
+    @patch("qgis_hub_plugin.core.api_client.QgsNetworkAccessManager")
+    def test_fetch_pages_retries_transient_failure(self, mock_nam, mock_qgs_app):
+        """Test a page answered with 503 is downloaded again."""
+        from qgis.PyQt.QtNetwork import QNetworkReply
+
+        from qgis_hub_plugin.core.api_client import fetch_pages
+
+        unavailable = MagicMock()
+        unavailable.isFinished.return_value = True
+        unavailable.error.return_value = (
+            QNetworkReply.NetworkError.ServiceUnavailableError
+        )
+        unavailable.attribute.return_value = 503
+        reply = MagicMock()
+        reply.isFinished.return_value = True
+        reply.error.return_value = QNetworkReply.NetworkError.NoError
+        reply.attribute.return_value = 200
+        reply.readAll.return_value.data.return_value = b'{"results": [{"uuid": "a"}]}'
+        reply.rawHeader.return_value = b""
+        mock_nam.instance.return_value.get.side_effect = [unavailable, reply]
+
+        pages = fetch_pages(["https://hub/1"])
+
+        self.assertEqual(pages["https://hub/1"].data["results"], [{"uuid": "a"}])
+
+    @patch("qgis_hub_plugin.core.api_client.QgsApplication")
+    @patch("qgis_hub_plugin.core.api_client.QgsNetworkAccessManager")
+    def test_fetch_pages_fails_fast_when_circuit_open(self, mock_nam, mock_qgs_app):
+        """Test no request is sent while the Hub keeps failing."""
+        from qgis_hub_plugin.core.api_client import fetch_pages
+        from qgis_hub_plugin.utilities.retry import circuit_breaker
+
+        for _ in range(circuit_breaker.failure_threshold):
+            circuit_breaker.record_failure("hub")
+
+        with self.assertRaises(DownloadError) as context:
+            fetch_pages(["https://hub/1"])
+
+        self.assertIn("unavailable", str(context.exception))
+        mock_nam.instance.return_value.get.assert_not_called()
+
+
+class TestCatalogRevalidation(unittest.TestCase):
+    """Test the conditional revalidation of the cached catalog."""
+
+    cached_catalog = {
+        "total": 2,
+        "results": [{"uuid": "a", "name": "A"}, {"uuid": "b", "name": "B"}],
+    }
+
+    def _validators(self):
+        from qgis_hub_plugin.core.api_client import _page_url
+
+        return {
+            "total": 2,
+            "pages": {
+                _page_url(0): {
+                    "etag": '"v1"',
+                    "last_modified": "Mon, 06 Jan 2025 10:00:00 GMT",
+                    "uuids": ["a", "b"],
+                }
+            },
+        }
+
+    def test_cached_pages_conditional_headers(self):
+        """Test cached pages are revalidated with both validators."""
+        from qgis_hub_plugin.core.api_client import _cached_pages, _page_url
+
+        cached_pages = _cached_pages(self.cached_catalog, self._validators())
+
+        page = cached_pages[_page_url(0)]
+        self.assertEqual([r["name"] for r in page.data["results"]], ["A", "B"])
+        self.assertEqual(
+            page.conditional_headers(),
+            {
+                "If-None-Match": '"v1"',
+                "If-Modified-Since": "Mon, 06 Jan 2025 10:00:00 GMT",
+            },
+        )
+
+    def test_cached_pages_skips_incomplete_pages(self):
+        """Test a page whose resources left the cache is not revalidated."""
+        from qgis_hub_plugin.core.api_client import _cached_pages
+
+        cached_catalog = {"results": [{"uuid": "a"}]}
+
+        self.assertEqual(_cached_pages(cached_catalog, self._validators()), {})
+
+    @patch("qgis_hub_plugin.core.api_client.fetch_pages")
+    def test_fetch_catalog_not_modified(self, mock_fetch_pages):
+        """Test a 304 on every page keeps the cached catalog."""
+        from dataclasses import replace
+
+        from qgis_hub_plugin.core.api_client import fetch_catalog
+
+        mock_fetch_pages.side_effect = lambda urls, on_page, cached_pages, feedback: {
+            url: replace(cached_pages[url], not_modified=True) for url in urls
+        }
+        validators = self._validators()
+
+        catalog, new_validators, modified = fetch_catalog(
+            cached_catalog=self.cached_catalog, validators=validators
+        )
+
+        self.assertFalse(modified)
+        self.assertIs(catalog, self.cached_catalog)
+        self.assertIs(new_validators, validators)
+
+    @patch("qgis_hub_plugin.core.api_client.fetch_pages")
+    def test_fetch_catalog_stores_new_validators(self, mock_fetch_pages):
+        """Test the validators of a modified page replace the old ones."""
+        from qgis_hub_plugin.core.api_client import _page_url, fetch_catalog
+
+        mock_fetch_pages.side_effect = lambda urls, on_page, cached_pages, feedback: {
+            url: CatalogPage(
+                url=url,
+                data={"total": 1, "results": [{"uuid": "c"}]},
+                etag='"v2"',
+            )
+            for url in urls
+        }
+
+        catalog, validators, modified = fetch_catalog(
+            cached_catalog=self.cached_catalog, validators=self._validators()
+        )
+
+        self.assertTrue(modified)
+        self.assertEqual([r["uuid"] for r in catalog["results"]], ["c"])
+        self.assertEqual(validators["pages"][_page_url(0)]["etag"], '"v2"')
+        self.assertEqual(validators["pages"][_page_url(0)]["uuids"], ["c"])
+
+    @patch("qgis_hub_plugin.core.api_client.QgsApplication")
+    @patch("qgis_hub_plugin.core.api_client.QgsNetworkAccessManager")
+    def test_fetch_pages_reuses_page_on_304(self, mock_nam, mock_qgs_app):
+        """Test a 304 answer returns the cached page and sends validators."""
+        from qgis.PyQt.QtNetwork import QNetworkReply
+
+        from qgis_hub_plugin.core.api_client import (
+            _cached_pages,
+            _page_url,
+            fetch_pages,
+        )
+
+        reply = MagicMock()
+        reply.isFinished.return_value = True
+        reply.error.return_value = QNetworkReply.NetworkError.NoError
+        reply.attribute.return_value = 304
+        mock_nam.instance.return_value.get.return_value = reply
+        cached_pages = _cached_pages(self.cached_catalog, self._validators())
+        on_page = MagicMock()
+
+        pages = fetch_pages([_page_url(0)], on_page, cached_pages=cached_pages)
+
+        page = pages[_page_url(0)]
+        self.assertTrue(page.not_modified)
+        self.assertEqual(len(page.data["results"]), 2)
+        on_page.assert_called_once_with(page.data["results"])
+        request = mock_nam.instance.return_value.get.call_args[0][0]
+        self.assertEqual(bytes(request.rawHeader(b"If-None-Match")), b'"v1"')
+        reply.readAll.assert_not_called()
+
+    @patch("qgis_hub_plugin.core.api_client._write_sidecar")
+    @patch("qgis_hub_plugin.core.api_client._write_response")
+    @patch("qgis_hub_plugin.core.api_client._load_sidecar")
+    @patch("qgis_hub_plugin.core.api_client._load_response")
+    @patch("qgis_hub_plugin.core.api_client.fetch_catalog")
+    @patch("qgis_hub_plugin.core.api_client.QgsApplication")
+    @patch("pathlib.Path.exists")
+    def test_get_all_resources_not_modified_keeps_cache(
+        self,
+        mock_exists,
+        mock_qgs_app,
+        mock_fetch,
+        mock_load_response,
+        mock_load_sidecar,
+        mock_write_response,
+        mock_write_sidecar,
+    ):
+        """Test the cache is not rewritten when nothing changed."""
+        from qgis_hub_plugin.core.api_client import (
+            SYNC_STATE_FILE_NAME,
+            get_all_resources,
+        )
+
+        mock_qgs_app.qgisSettingsDirPath.return_value = "/tmp/qgis_test"
+        mock_exists.return_value = True
+        mock_load_response.return_value = self.cached_catalog
+        mock_load_sidecar.return_value = self._validators()
+        mock_fetch.return_value = CatalogFetch(
+            self.cached_catalog, self._validators(), False
+        )
+
+        result = get_all_resources(force_update=True)
+
+        self.assertIs(result, self.cached_catalog)
+        self.assertEqual(mock_fetch.call_args[1]["validators"], self._validators())
+        mock_write_response.assert_not_called()
+        # Only the sync state is recorded
+        mock_write_sidecar.assert_called_once()
+        self.assertEqual(mock_write_sidecar.call_args[0][0].name, SYNC_STATE_FILE_NAME)
+
+
+class TestDeltaSync(unittest.TestCase):
+    """Test the incremental sync of the cached catalog."""
+
+    since = "2024-06-01T00:00:00+00:00"
+
+    cached_catalog = {
+        "total": 2,
+        "results": [
+            {"uuid": "old-1", "upload_date": "2024-05-01T00:00:00Z"},
+            {"uuid": "old-2", "upload_date": "2024-04-01T00:00:00Z"},
+        ],
+    }
+
+    @staticmethod
+    def _delta_pages(pages):
+        """Serve delta pages from a list of (resources, total, has_next)."""
+        from qgis_hub_plugin.core.api_client import _delta_page_url
+
+        by_url = {
+            _delta_page_url(number * 2): CatalogPage(
+                url=_delta_page_url(number * 2),
+                data={
+                    "total": total,
+                    "next": "next" if has_next else None,
+                    "results": resources,
+                },
+            )
+            for number, (resources, total, has_next) in enumerate(pages)
+        }
+        return lambda urls, feedback: {url: by_url[url] for url in urls}
+
+    def _fetch_delta(self, mock_fetch_pages, pages):
+        from qgis_hub_plugin.core.api_client import _parse_date, fetch_catalog_delta
+
+        mock_fetch_pages.side_effect = self._delta_pages(pages)
+        return fetch_catalog_delta(self.cached_catalog, _parse_date(self.since))
+
+    @patch("qgis_hub_plugin.core.api_client.PAGE_SIZE", 2)
+    @patch("qgis_hub_plugin.core.api_client.fetch_pages")
+    def test_delta_merges_new_resources(self, mock_fetch_pages):
+        """Test new resources are put first and known ones kept."""
+        catalog = self._fetch_delta(
+            mock_fetch_pages,
+            [
+                (
+                    [
+                        {"uuid": "new-1", "upload_date": "2024-06-10T00:00:00Z"},
+                        {"uuid": "old-1", "upload_date": "2024-05-01T00:00:00Z"},
+                    ],
+                    3,
+                    True,
+                )
+            ],
+        )
+
+        self.assertEqual(
+            [r["uuid"] for r in catalog["results"]], ["new-1", "old-1", "old-2"]
+        )
+        # The delta stopped at the first resource older than the last sync
+        self.assertEqual(mock_fetch_pages.call_count, 1)
+
+    @patch("qgis_hub_plugin.core.api_client.PAGE_SIZE", 2)
+    @patch("qgis_hub_plugin.core.api_client.fetch_pages")
+    def test_delta_follows_pages(self, mock_fetch_pages):
+        """Test the delta goes on while every resource is newer."""
+        catalog = self._fetch_delta(
+            mock_fetch_pages,
+            [
+                (
+                    [
+                        {"uuid": "new-1", "upload_date": "2024-06-10T00:00:00Z"},
+                        {"uuid": "new-2", "upload_date": "2024-06-09T00:00:00Z"},
+                    ],
+                    4,
+                    True,
+                ),
+                (
+                    [{"uuid": "old-1", "upload_date": "2024-05-01T00:00:00Z"}],
+                    4,
+                    True,
+                ),
+            ],
+        )
+
+        self.assertEqual(mock_fetch_pages.call_count, 2)
+        self.assertEqual(catalog["total"], 4)
+
+    @patch("qgis_hub_plugin.core.api_client.fetch_pages")
+    def test_delta_untrusted_when_unordered(self, mock_fetch_pages):
+        """Test a server ignoring the ordering falls back to a full fetch."""
+        catalog = self._fetch_delta(
+            mock_fetch_pages,
+            [
+                (
+                    [
+                        {"uuid": "old-2", "upload_date": "2024-04-01T00:00:00Z"},
+                        {"uuid": "new-1", "upload_date": "2024-06-10T00:00:00Z"},
+                    ],
+                    3,
+                    False,
+                )
+            ],
+        )
+
+        self.assertIsNone(catalog)
+
+    @patch("qgis_hub_plugin.core.api_client.fetch_pages")
+    def test_delta_untrusted_when_total_differs(self, mock_fetch_pages):
+        """Test removed resources make the delta fall back to a full fetch."""
+        catalog = self._fetch_delta(
+            mock_fetch_pages,
+            [([{"uuid": "old-1", "upload_date": "2024-05-01T00:00:00Z"}], 1, True)],
+        )
+
+        self.assertIsNone(catalog)
+
+    @patch("qgis_hub_plugin.core.api_client.PAGE_SIZE", 2)
+    @patch("qgis_hub_plugin.core.api_client.fetch_pages")
+    def test_delta_failover(self, mock_fetch_pages):
+        """Test the delta is downloaded from the next endpoint when the
+        fastest one fails."""
+        from qgis_hub_plugin.core.api_client import _parse_date, fetch_catalog_delta
+        from qgis_hub_plugin.utilities.endpoints import EndpointSelector
+
+        mirror = "https://mirror.example.org"
+        selector = EndpointSelector()
+        selector.set_mirrors([mirror])
+        selector.record_latency(selector.official, 1.0)
+        selector.record_latency(mirror, 0.1)
+        serve = self._delta_pages(
+            [
+                (
+                    [
+                        {"uuid": "new-1", "upload_date": "2024-06-10T00:00:00Z"},
+                        {"uuid": "old-1", "upload_date": "2024-05-01T00:00:00Z"},
+                    ],
+                    3,
+                    True,
+                )
+            ]
+        )
+
+        def fetch_pages(urls, feedback):
+            if urls[0].startswith(mirror):
+                raise DownloadError("Service Unavailable")
+            return serve(urls, feedback)
+
+        mock_fetch_pages.side_effect = fetch_pages
+        with patch("qgis_hub_plugin.core.api_client.endpoint_selector", selector):
+            catalog = fetch_catalog_delta(self.cached_catalog, _parse_date(self.since))
+
+        self.assertEqual(
+            [r["uuid"] for r in catalog["results"]], ["new-1", "old-1", "old-2"]
+        )
+        self.assertEqual(mock_fetch_pages.call_count, 2)
+
+    @patch("qgis_hub_plugin.core.api_client.get_all_resources")
+    @patch("qgis_hub_plugin.core.api_client.fetch_catalog_delta")
+    @patch("qgis_hub_plugin.core.api_client._write_sidecar")
+    @patch("qgis_hub_plugin.core.api_client._write_response")
+    @patch("qgis_hub_plugin.core.api_client._load_sidecar")
+    @patch("qgis_hub_plugin.core.api_client._load_response")
+    @patch("qgis_hub_plugin.core.api_client.QgsApplication")
+    @patch("pathlib.Path.exists")
+    def test_sync_resources_modes(
+        self,
+        mock_exists,
+        mock_qgs_app,
+        mock_load_response,
+        mock_load_sidecar,
+        mock_write_response,
+        mock_write_sidecar,
+        mock_delta,
+        mock_full,
+    ):
+        """Test when sync_resources uses a delta or a full download."""
+        from datetime import datetime, timedelta, timezone
+
+        from qgis_hub_plugin.core.api_client import sync_resources
+
+        mock_qgs_app.qgisSettingsDirPath.return_value = "/tmp/qgis_test"
+        mock_exists.return_value = True
+        mock_load_response.return_value = self.cached_catalog
+        recent = datetime.now(timezone.utc).isoformat()
+        old = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat()
+        merged = {"total": 3, "results": [{"uuid": "new"}]}
+
+        # Recent full sync: the delta is used
+        mock_load_sidecar.return_value = {
+            "last_sync": recent,
+            "last_full_sync": recent,
+        }
+        mock_delta.return_value = merged
+        self.assertIs(sync_resources(), merged)
+        mock_full.assert_not_called()
+        mock_write_response.assert_called_once()
+
+        # Untrusted delta: full download
+        mock_delta.return_value = None
+        sync_resources()
+        mock_full.assert_called_once()
+
+        # Old full sync: full download without trying a delta
+        mock_delta.reset_mock()
+        mock_load_sidecar.return_value = {"last_sync": recent, "last_full_sync": old}
+        sync_resources()
+        mock_delta.assert_not_called()
+        self.assertEqual(mock_full.call_count, 2)
+
+
+class TestCatalogFreshness(unittest.TestCase):
+    """Test the age of the cached catalog used by the TTL."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.folder = Path(self.tmp_dir.name)
+        patcher = patch(
+            "qgis_hub_plugin.core.api_client._response_folder",
+            return_value=self.folder,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _write_sync_state(self, last_sync):
+        (self.folder / "response.json.gz").write_bytes(b"")
+        with open(self.folder / "response.sync.json", "w") as f:
+            json.dump({"last_sync": last_sync.isoformat()}, f)
+
+    def test_missing_catalog_is_stale(self):
+        from qgis_hub_plugin.core.api_client import catalog_age, catalog_is_stale
+
+        self.assertIsNone(catalog_age())
+        self.assertTrue(catalog_is_stale(timedelta(days=365)))
+
+    def test_catalog_age(self):
+        from qgis_hub_plugin.core.api_client import catalog_is_stale
+
+        self._write_sync_state(datetime.now(timezone.utc) - timedelta(minutes=30))
+
+        self.assertFalse(catalog_is_stale(timedelta(hours=1)))
+        self.assertTrue(catalog_is_stale(timedelta(minutes=15)))
+        self.assertTrue(catalog_is_stale(timedelta(0)))
+
+
+class TestCatalogRecovery(unittest.TestCase):
+    """Test the recovery of a corrupted cached catalog."""
+
+    catalog = {"total": 1, "results": [{"uuid": "a", "name": "A"}]}
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.response_file = Path(self.tmp_dir.name, "response.json.gz")
+
+    def test_corrupted_catalog_restored_without_network(self):
+        from qgis_hub_plugin.core.api_client import _cached_response, _write_response
+        from qgis_hub_plugin.core.catalog_service import catalog_service
+
+        _write_response(self.response_file, self.catalog)
+        # Truncated as by a crash while writing it
+        data = self.response_file.read_bytes()
+        self.response_file.write_bytes(data[: len(data) // 2])
+        catalog_service.invalidate()
+
+        self.assertEqual(_cached_response(self.response_file), self.catalog)
+        self.assertEqual(self.response_file.read_bytes(), data)
+
+    def test_corrupted_catalog_without_copy(self):
+        from qgis_hub_plugin.core.api_client import _cached_response
+
+        self.response_file.write_bytes(b"not gzip")
+
+        with self.assertRaises(DownloadError):
+            _cached_response(self.response_file)
+
+
 @pytest.mark.parametrize(
     "force_update,cache_exists,expected_download_call",
     [
@@ -239,16 +1072,16 @@ def test_get_all_resources_parameterized(
     from qgis_hub_plugin.core.api_client import get_all_resources
 
     with patch("qgis_hub_plugin.core.api_client.QgsApplication") as mock_qgs:
-        with patch("qgis_hub_plugin.core.api_client.download_file") as mock_download:
+        with patch("qgis_hub_plugin.core.api_client.fetch_catalog") as mock_fetch:
             with patch("pathlib.Path.exists") as mock_exists:
                 # Setup
                 mock_qgs.qgisSettingsDirPath.return_value = "/tmp/qgis_test"
                 mock_exists.return_value = cache_exists
-                mock_download.return_value = True
+                mock_fetch.return_value = CatalogFetch(mock_api_full_response, {}, True)
 
                 # Mock file read
                 with patch(
-                    "builtins.open",
+                    "qgis_hub_plugin.core.api_client.gzip.open",
                     mock_open(read_data=json.dumps(mock_api_full_response)),
                 ):
                     if cache_exists and not force_update:
@@ -256,9 +1089,9 @@ def test_get_all_resources_parameterized(
 
                         # Verify
                         if expected_download_call:
-                            mock_download.assert_called_once()
+                            mock_fetch.assert_called_once()
                         else:
-                            mock_download.assert_not_called()
+                            mock_fetch.assert_not_called()
 
                         assert result is not None
                         assert result["total"] == 6
@@ -0,0 +1,386 @@
+#! python3  # noqa E265
+
+"""
+Benchmarks of the catalog cache and of the downloads. They measure the size
+of the cached catalog with and without compression, the size of the cache
+folder and of the snapshot used to open the resource browser, the memory
+used by the resource list, the transfer of the catalog and thumbnails from
+a local stand-in for the Hub, and the CPU time spent waiting for a download.
+They are marked as slow and print their measurements, run them with -s to
+see them.
+
+Usage from the repo root folder:
+
+    .. code-block:: bash
+        pytest tests/qgis/test_benchmarks.py -v -s -m slow
+"""
+
+import gzip
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+CATALOG_SIZE = 3000
+THUMBNAIL_COUNT = 100
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua map style layer "
+    "symbol label raster vector road river land cover elevation model"
+).split()
+
+
+def _description(i):
+    # Different for every resource, as compressible as written text
+    rng = random.Random(i)
+    words = rng.choices(WORDS, k=rng.randint(40, 400))
+    return f"<p>{' '.join(words)}</p>"
+
+
+def _catalog(size=CATALOG_SIZE):
+    return {
+        "total": size,
+        "results": [
+            {
+                "uuid": f"uuid-{i}",
+                "name": f"Resource {i}",
+                "creator": f"Creator {i % 50}",
+                "resource_type": "style",
+                "resource_subtypes": ["symbol"],
+                "download_count": i,
+                "upload_date": "2024-01-15T10:30:00Z",
+                "file": f"https://hub.qgis.org/files/{i}.zip",
+                "thumbnail": f"https://hub.qgis.org/thumbnails/{i}.png",
+                "dependencies": [],
+                "description": _description(i),
+            }
+            for i in range(size)
+        ],
+    }
+
+
+def _best_time(function, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+@pytest.mark.slow
+class TestCatalogLoadBenchmark(unittest.TestCase):
+    """Compare the time needed to load the catalog from each cache format."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.folder = Path(self.tmp_dir.name)
+        self.catalog = _catalog()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_compressed_vs_uncompressed_response(self):
+        from qgis_hub_plugin.core.api_client import _load_response, _write_response
+
+        legacy_folder = self.folder / "legacy"
+        legacy_folder.mkdir()
+        legacy_file = legacy_folder / "response.json"
+        with open(legacy_file, "w") as f:
+            json.dump(self.catalog, f)
+        # Also writes the last good copy, the store and the snapshot
+        cache_folder = self.folder / "cache"
+        cache_folder.mkdir()
+        response_file = cache_folder / "response.json.gz"
+        _write_response(response_file, self.catalog)
+
+        def load_legacy():
+            with open(legacy_file) as f:
+                return json.load(f)
+
+        legacy_time = _best_time(load_legacy)
+        response_time = _best_time(lambda: _load_response(response_file))
+
+        cache_files = {
+            path.name: path.stat().st_size for path in sorted(cache_folder.iterdir())
+        }
+        cache_size = sum(cache_files.values())
+        print(
+            f"\n{CATALOG_SIZE} resources: "
+            f"uncompressed {legacy_time * 1000:.1f} ms "
+            f"({legacy_file.stat().st_size // 1024} KiB), "
+            f"compressed {response_time * 1000:.1f} ms "
+            f"({response_file.stat().st_size // 1024} KiB)\n"
+            f"Cache folder {cache_size // 1024} KiB: "
+            + ", ".join(
+                f"{name} {size // 1024} KiB" for name, size in cache_files.items()
+            )
+        )
+        self.assertLess(cache_size, legacy_file.stat().st_size)
+
+    def test_snapshot_vs_response(self):
+        from qgis_hub_plugin.core.api_client import _load_response, _write_response
+        from qgis_hub_plugin.core.catalog_snapshot import load_snapshot, write_snapshot
+
+        response_file = self.folder / "response.json.gz"
+        _write_response(response_file, self.catalog)
+        snapshot_file = self.folder / "catalog.snapshot"
+        write_snapshot(snapshot_file, self.catalog["results"], "v1")
+
+        response_time = _best_time(lambda: _load_response(response_file))
+        snapshot_time = _best_time(lambda: load_snapshot(snapshot_file, "v1"))
+
+        print(
+            f"\n{CATALOG_SIZE} resources: "
+            f"response {response_time * 1000:.1f} ms "
+            f"({response_file.stat().st_size // 1024} KiB), "
+            f"snapshot {snapshot_time * 1000:.1f} ms "
+            f"({snapshot_file.stat().st_size // 1024} KiB)"
+        )
+        self.assertLess(snapshot_time, response_time)
+
+
+@pytest.mark.slow
+class TestResourceListMemoryBenchmark(unittest.TestCase):
+    """Compare the memory held by the items of the resource list when they
+    keep every field or only the list fields."""
+
+    ITEM_COUNT = 10000
+
+    def _items_memory(self, payload, project, load_details=None):
+        """Return the memory still held once the items are built from the
+        decoded catalog, which is then released."""
+        from qgis_hub_plugin.gui.resource_item import ResourceItem
+
+        tracemalloc.start()
+        items = [
+            ResourceItem(project(resource), load_details)
+            for resource in json.loads(payload)
+        ]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        self.assertEqual(len(items), self.ITEM_COUNT)
+        return size
+
+    @patch("qgis_hub_plugin.gui.resource_item.download_resource_thumbnail")
+    def test_lazy_details(self, mock_thumbnail):
+        from qgis_hub_plugin.core.catalog_snapshot import list_record
+
+        mock_thumbnail.return_value = None
+        resources = _catalog(self.ITEM_COUNT)["results"]
+        for resource in resources:
+            resource["dependencies"] = ["numpy", "pandas"]
+        payload = json.dumps(resources)
+
+        full_size = self._items_memory(payload, dict)
+        lazy_size = self._items_memory(payload, list_record, lambda uuid: None)
+
+        print(
+            f"\n{self.ITEM_COUNT} resources: "
+            f"full records {full_size // 1024} KiB, "
+            f"list records {lazy_size // 1024} KiB, "
+            f"saved {(full_size - lazy_size) // 1024} KiB"
+        )
+        self.assertLess(lazy_size, full_size)
+
+
+class _HubHandler(BaseHTTPRequestHandler):
+    """Serve catalog pages and thumbnails, counting the bytes sent."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.startswith("/thumbnails/"):
+            # Images are already compressed, random bytes behave the same
+            body = self.server.thumbnail
+            content_type = "image/png"
+        else:
+            query = parse_qs(url.query)
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", ["50"])[0])
+            catalog = self.server.catalog
+            page = {
+                "total": catalog["total"],
+                "results": catalog["results"][offset : offset + limit],
+            }
+            body = json.dumps(page).encode("utf-8")
+            content_type = "application/json"
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Cache-Control", "no-store")
+        accept_encoding = self.headers.get("Accept-Encoding", "")
+        if self.server.compress and "gzip" in accept_encoding:
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server.lock:
+            self.server.bytes_sent += len(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.mark.slow
+class TestTransferBenchmark(unittest.TestCase):
+    """Measure the bytes transferred and the wall time of a full catalog load,
+    followed by the thumbnails of the first resources, with and without
+    compressed transfer.
+
+    HTTP/2 is not measured: the stand-in server speaks HTTP/1.1 over plain
+    HTTP, with which Qt does not try HTTP/2. Its multiplexing only shows
+    against a server offering it over TLS, such as the QGIS Hub.
+    """
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.folder = Path(self.tmp_dir.name)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _HubHandler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        catalog = _catalog()
+        for resource in catalog["results"]:
+            resource["thumbnail"] = f"{self.base_url}/thumbnails/{resource['uuid']}.png"
+        self.server.catalog = catalog
+        self.server.thumbnail = os.urandom(8 * 1024)
+        self.server.lock = threading.Lock()
+        self.server.compress = False
+        self.server.bytes_sent = 0
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.tmp_dir.cleanup()
+
+    def _load(self, compress):
+        from qgis_hub_plugin.core.api_client import fetch_catalog
+        from qgis_hub_plugin.utilities.common import download_file
+
+        self.server.compress = compress
+        self.server.bytes_sent = 0
+        start = time.perf_counter()
+        with patch(
+            "qgis_hub_plugin.core.api_client.BASE_URL",
+            f"{self.base_url}/api/v1/resources/",
+        ):
+            catalog = fetch_catalog().catalog
+        for resource in catalog["results"][:THUMBNAIL_COUNT]:
+            download_file(
+                resource["thumbnail"], self.folder / f"{resource['uuid']}.png"
+            )
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(len(catalog["results"]), CATALOG_SIZE)
+        return self.server.bytes_sent, elapsed
+
+    def test_compressed_vs_plain_transfer(self):
+        plain_bytes, plain_time = self._load(compress=False)
+        compressed_bytes, compressed_time = self._load(compress=True)
+
+        print(
+            f"\n{CATALOG_SIZE} resources and {THUMBNAIL_COUNT} thumbnails: "
+            f"plain {plain_bytes // 1024} KiB in {plain_time * 1000:.0f} ms, "
+            f"compressed {compressed_bytes // 1024} KiB "
+            f"in {compressed_time * 1000:.0f} ms"
+        )
+        self.assertLess(compressed_bytes, plain_bytes / 4)
+
+
+class _SlowFileHandler(BaseHTTPRequestHandler):
+    """Serve a small file after the delay of the server, like a distant or
+    busy Hub."""
+
+    def do_GET(self):
+        time.sleep(self.server.delay)
+        body = b"x" * 1024
+        self.send_response(200)
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.mark.slow
+class TestDownloadCpuBenchmark(unittest.TestCase):
+    """Compare the CPU time spent waiting for slow downloads by the event
+    loop of download_file and by the polling loop it used before."""
+
+    DOWNLOADS = 5
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.folder = Path(self.tmp_dir.name)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowFileHandler)
+        self.server.delay = 0.3
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.tmp_dir.cleanup()
+
+    def _polling_download(self, url, destination):
+        from qgis.core import QgsApplication, QgsNetworkAccessManager
+
+        from qgis_hub_plugin.utilities.common import build_network_request
+
+        reply = QgsNetworkAccessManager.instance().get(build_network_request(url))
+        while not reply.isFinished():
+            QgsApplication.processEvents()
+        destination.write_bytes(bytes(reply.readAll()))
+        reply.deleteLater()
+
+    def _cpu_time(self, download):
+        start = time.process_time()
+        wall_start = time.perf_counter()
+        for i in range(self.DOWNLOADS):
+            # A new URL each time, the network cache must not answer
+            destination = self.folder / f"{download.__name__}-{i}.bin"
+            download(f"{self.base_url}/files/{download.__name__}/{i}", destination)
+            self.assertEqual(destination.stat().st_size, 1024)
+        return (
+            (time.process_time() - start) / self.DOWNLOADS,
+            (time.perf_counter() - wall_start) / self.DOWNLOADS,
+        )
+
+    def test_event_loop_vs_polling(self):
+        from qgis_hub_plugin.utilities.common import download_file
+
+        polling_cpu, polling_wall = self._cpu_time(self._polling_download)
+        event_cpu, event_wall = self._cpu_time(download_file)
+
+        print(
+            f"\nCPU time per download of {self.server.delay * 1000:.0f} ms: "
+            f"polling {polling_cpu * 1000:.0f} ms "
+            f"(wall {polling_wall * 1000:.0f} ms), "
+            f"event loop {event_cpu * 1000:.0f} ms "
+            f"(wall {event_wall * 1000:.0f} ms)"
+        )
+        self.assertLess(event_cpu, polling_cpu / 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,220 @@
+#! python3  # noqa E265
+
+"""
+Tests of the offline bundles, exported from a QGIS settings folder and
+imported into another one.
+
+Usage from the repo root folder:
+
+    .. code-block:: bash
+        # for whole test module
+        pytest tests/qgis/test_bundle.py -v
+"""
+
+import json
+import tempfile
+import threading
+import unittest
+import zipfile
+from contextlib import ExitStack
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+from qgis.testing import start_app
+
+start_app()
+
+CATALOG = {
+    "total": 2,
+    "results": [
+        {
+            "uuid": "uuid-1",
+            "name": "Resource 1",
+            "file": "https://hub.qgis.org/files/1/style.zip",
+            "thumbnail": "https://hub.qgis.org/thumbnails/1.jpg",
+        },
+        {
+            "uuid": "uuid-2",
+            "name": "Resource 2",
+            "file": "https://hub.qgis.org/files/2/model.zip",
+            "thumbnail": "https://hub.qgis.org/thumbnails/2.png",
+        },
+    ],
+}
+
+
+class TestBundle(unittest.TestCase):
+    """Test the round trip of a bundle between two settings folders."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.bundle_file = Path(self.tmp_dir.name, "hub.qgishub.zip")
+
+    def _settings_dir(self, name: str) -> ExitStack:
+        """Use a settings folder of the temporary directory."""
+        from qgis_hub_plugin.utilities import common
+
+        settings_dir = Path(self.tmp_dir.name, name)
+        stack = ExitStack()
+        qgs_app = stack.enter_context(
+            patch("qgis_hub_plugin.core.api_client.QgsApplication")
+        )
+        qgs_app.qgisSettingsDirPath.return_value = str(settings_dir)
+        stack.enter_context(
+            patch.object(common, "QGIS_HUB_DIR", Path(settings_dir, "qgis_hub"))
+        )
+        return stack
+
+    def _export(self, resource_uuids=()):
+        from qgis_hub_plugin.core.api_client import (
+            cached_catalog_file,
+            replace_cached_catalog,
+        )
+        from qgis_hub_plugin.core.bundle import export_bundle
+
+        def fake_download_file(url, destination, force=True, timeout=30000):
+            destination.write_bytes(f"content of {url}".encode("utf-8"))
+            return destination
+
+        def fake_download_thumbnail(url, uuid):
+            Path(folder, "thumbnails", f"{uuid}.png").write_bytes(b"png")
+
+        with self._settings_dir("online"), patch(
+            "qgis_hub_plugin.core.bundle.download_file",
+            side_effect=fake_download_file,
+        ), patch(
+            "qgis_hub_plugin.core.bundle.download_resource_thumbnail",
+            side_effect=fake_download_thumbnail,
+        ) as mock_thumbnail:
+            replace_cached_catalog(CATALOG, None, "2026-01-01T00:00:00+00:00")
+            folder = cached_catalog_file().parent
+            # Only the first thumbnail is cached, the second one is a PNG
+            Path(folder, "thumbnails").mkdir()
+            Path(folder, "thumbnails", "uuid-1.jpg").write_bytes(b"jpg")
+
+            summary = export_bundle(self.bundle_file, resource_uuids)
+
+        mock_thumbnail.assert_called_once_with(
+            "https://hub.qgis.org/thumbnails/2.png", "uuid-2"
+        )
+        return summary
+
+    def test_export(self):
+        summary = self._export(["uuid-2"])
+
+        self.assertEqual(tuple(summary), (2, 2, 1))
+        with zipfile.ZipFile(self.bundle_file) as archive:
+            index = json.loads(archive.read("index.json"))
+            # The PNG thumbnail is packed once
+            self.assertEqual(
+                [entry["name"] for entry in index["thumbnails"]],
+                ["thumbnails/uuid-1.jpg", "thumbnails/uuid-2.png"],
+            )
+            self.assertEqual(len(archive.namelist()), len(set(archive.namelist())))
+            self.assertEqual(index["synced"], "2026-01-01T00:00:00+00:00")
+            self.assertEqual(
+                index["files"],
+                {"https://hub.qgis.org/files/2/model.zip": "files/uuid-2/model.zip"},
+            )
+            self.assertEqual(
+                archive.read("thumbnails/uuid-1.jpg"),
+                b"jpg",
+            )
+
+    def test_import_works_offline(self):
+        from qgis_hub_plugin.core.api_client import catalog_age, get_all_resources
+        from qgis_hub_plugin.core.bundle import import_bundle
+        from qgis_hub_plugin.utilities.common import (
+            download_file,
+            is_resource_thumbnail_cached,
+        )
+        from qgis_hub_plugin.utilities.exception import DownloadError
+
+        self._export(["uuid-1", "uuid-2"])
+
+        with self._settings_dir("offline"), patch(
+            "qgis_hub_plugin.utilities.common.check_circuit",
+            side_effect=DownloadError("hub.qgis.org is unavailable"),
+        ):
+            summary = import_bundle(self.bundle_file)
+
+            self.assertEqual(tuple(summary), (2, 2, 2))
+            self.assertEqual(get_all_resources()["results"], CATALOG["results"])
+            self.assertIsNotNone(catalog_age())
+            self.assertTrue(
+                is_resource_thumbnail_cached(
+                    "https://hub.qgis.org/thumbnails/1.jpg", "uuid-1"
+                )
+            )
+            self.assertTrue(
+                is_resource_thumbnail_cached(
+                    "https://hub.qgis.org/thumbnails/2.png", "uuid-2"
+                )
+            )
+            # The resource files are copied when the QGIS Hub is unreachable
+            destination = Path(self.tmp_dir.name, "style.zip")
+            download_file("https://hub.qgis.org/files/1/style.zip", destination)
+            self.assertEqual(
+                destination.read_bytes(),
+                b"content of https://hub.qgis.org/files/1/style.zip",
+            )
+            # Not the others
+            with self.assertRaises(DownloadError):
+                download_file(
+                    "https://hub.qgis.org/files/3/other.zip",
+                    Path(self.tmp_dir.name, "other.zip"),
+                )
+
+    def test_network_preferred_to_the_bundle(self):
+        from qgis_hub_plugin.utilities.common import download_file, offline_file_path
+        from qgis_hub_plugin.utilities.retry import circuit_breaker
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Length", "13")
+                self.end_headers()
+                self.wfile.write(b"newer content")
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        circuit_breaker.reset()
+        url = f"http://127.0.0.1:{server.server_port}/files/1/style.zip"
+
+        with self._settings_dir("offline"):
+            offline_copy = offline_file_path(url)
+            offline_copy.parent.mkdir(parents=True)
+            offline_copy.write_bytes(b"bundled content")
+
+            destination = Path(self.tmp_dir.name, "style.zip")
+            download_file(url, destination)
+
+        self.assertEqual(destination.read_bytes(), b"newer content")
+
+    def test_import_invalid_bundle(self):
+        from qgis_hub_plugin.core.bundle import BUNDLE_FORMAT, import_bundle
+        from qgis_hub_plugin.utilities.exception import DownloadError
+
+        self.bundle_file.write_bytes(b"not a zip file")
+        with self._settings_dir("offline"):
+            with self.assertRaises(DownloadError):
+                import_bundle(self.bundle_file)
+
+        with zipfile.ZipFile(self.bundle_file, "w") as archive:
+            archive.writestr("index.json", json.dumps({"format": BUNDLE_FORMAT + 1}))
+        with self._settings_dir("offline"):
+            with self.assertRaises(DownloadError):
+                import_bundle(self.bundle_file)
+
+
+if __name__ == "__main__":
+    unittest.main()
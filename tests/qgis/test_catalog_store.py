@@ -0,0 +1,219 @@
+#! python3  # noqa E265
+
+"""
+Unit tests for the SQLite catalog store.
+
+Usage from the repo root folder:
+
+    .. code-block:: bash
+        # for whole test module
+        pytest tests/qgis/test_catalog_store.py -v
+"""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from qgis_hub_plugin.core.catalog_service import catalog_service
+from qgis_hub_plugin.core.catalog_store import CatalogStore
+
+
+def _resource(uuid, resource_type="style", subtypes=None, name=None, creator="Bob"):
+    return {
+        "uuid": uuid,
+        "name": name or f"Resource {uuid}",
+        "creator": creator,
+        "resource_type": resource_type,
+        "resource_subtypes": subtypes or [],
+        "upload_date": "2024-01-15T10:30:00Z",
+        "download_count": 1,
+        "description": "A description",
+    }
+
+
+class TestCatalogStore(unittest.TestCase):
+    """Test the queries of CatalogStore on an in-memory database."""
+
+    def setUp(self):
+        self.store = CatalogStore(":memory:")
+        self.resources = [
+            _resource("a", "style", ["symbol", "label"], creator="Alice"),
+            _resource("b", "model"),
+            _resource("c", "style", ["symbol"], name="Roads"),
+            _resource("d", "geopackage"),
+        ]
+        self.store.replace_all(self.resources, "v1")
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_resources_keep_catalog_order(self):
+        self.assertEqual(self.store.resources(), self.resources)
+        self.assertEqual(self.store.source_version, "v1")
+
+    def test_counts(self):
+        self.assertEqual(self.store.count(), 4)
+        self.assertEqual(self.store.count(["style", "model"]), 3)
+        self.assertEqual(
+            self.store.resource_types(), {"style": 2, "model": 1, "geopackage": 1}
+        )
+        self.assertEqual(
+            self.store.subtype_counts(["style"]), {"symbol": 2, "label": 1}
+        )
+        self.assertEqual(self.store.subtype_counts(["model"]), {})
+
+    def test_search(self):
+        self.assertEqual(self.store.search(), {"a", "b", "c", "d"})
+        self.assertEqual(self.store.search(["style", "model"]), {"a", "b", "c"})
+        self.assertEqual(self.store.search(["style"], "symbol"), {"a", "c"})
+        self.assertEqual(self.store.search(["style"], "label"), {"a"})
+        # Name or creator, case insensitively
+        self.assertEqual(self.store.search(text="ROADS"), {"c"})
+        self.assertEqual(self.store.search(text="alice"), {"a"})
+        self.assertEqual(self.store.search(["model"], text="bob"), {"b"})
+        # Not a pattern
+        self.assertEqual(self.store.search(text="%"), set())
+
+    def test_resource(self):
+        self.assertEqual(self.store.resource("b"), self.resources[1])
+        self.assertIsNone(self.store.resource("unknown"))
+
+    def test_old_api_subtype_format(self):
+        resource = _resource("e", "style")
+        del resource["resource_subtypes"]
+        resource["resource_subtype"] = "colorramp"
+        self.store.replace_all([resource])
+
+        self.assertEqual(self.store.subtype_counts(["style"]), {"colorramp": 1})
+
+    def test_replace_all_is_transactional(self):
+        broken = _resource("e")
+        broken["thumbnail"] = object()  # Not serializable
+
+        with self.assertRaises(TypeError):
+            self.store.replace_all([_resource("x"), broken], "v2")
+
+        self.assertEqual(self.store.resources(), self.resources)
+        self.assertEqual(self.store.source_version, "v1")
+
+
+class TestGetCatalogStore(unittest.TestCase):
+    """Test the store is kept in sync with the cached catalog."""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.folder = Path(self.tmp_dir.name)
+        patcher = patch(
+            "qgis_hub_plugin.core.api_client._response_folder",
+            return_value=self.folder,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_store_built_from_legacy_response(self):
+        from qgis_hub_plugin.core.api_client import _load_response, get_catalog_store
+
+        catalog = {"results": [_resource("a"), _resource("b", "model")]}
+        with open(self.folder / "response.json", "w") as f:
+            json.dump(catalog, f)
+
+        store = get_catalog_store()
+
+        self.assertEqual(store.resources(), catalog["results"])
+        store.close()
+        # The uncompressed cache of previous versions is compressed
+        self.assertFalse((self.folder / "response.json").exists())
+        self.assertEqual(_load_response(self.folder / "response.json.gz"), catalog)
+
+    def test_store_follows_written_response(self):
+        from qgis_hub_plugin.core.api_client import _write_response, get_catalog_store
+
+        _write_response(self.folder / "response.json.gz", {"results": [_resource("a")]})
+        store = get_catalog_store()
+        _write_response(self.folder / "response.json.gz", {"results": [_resource("b")]})
+
+        # The open store sees the catalog written by the refresh
+        self.assertEqual([r["uuid"] for r in store.resources()], ["b"])
+        store.close()
+
+    def test_list_resources_from_snapshot(self):
+        from qgis_hub_plugin.core.api_client import _write_response, get_catalog_store
+
+        _write_response(self.folder / "response.json.gz", {"results": [_resource("a")]})
+        store = get_catalog_store()
+        snapshot_file = self.folder / "catalog.snapshot"
+        self.assertTrue(snapshot_file.exists())
+
+        resources = store.list_resources()
+        self.assertEqual([r["uuid"] for r in resources], ["a"])
+        self.assertNotIn("description", resources[0])
+        self.assertEqual(store.resource("a")["description"], "A description")
+
+        # A missing snapshot is rebuilt from the store
+        snapshot_file.unlink()
+        catalog_service.invalidate()
+        self.assertEqual(store.list_resources(), resources)
+        self.assertTrue(snapshot_file.exists())
+        store.close()
+
+    def test_store_footprint(self):
+        """Test the write-ahead log is emptied and the freed pages are given
+        back once a smaller catalog is written, while a reader is open."""
+        store_file = self.folder / "catalog.sqlite"
+        store = CatalogStore(store_file)
+        reader = CatalogStore(store_file)
+
+        store.replace_all([_resource(str(i)) for i in range(500)], "v1")
+        size = store_file.stat().st_size
+        store.replace_all([_resource("a")], "v2")
+
+        self.assertEqual(Path(f"{store_file}-wal").stat().st_size, 0)
+        self.assertLess(store_file.stat().st_size, size)
+        self.assertEqual(reader.resources(), [_resource("a")])
+        reader.close()
+        store.close()
+
+    def test_catalog_shared_across_consumers(self):
+        from qgis_hub_plugin.core.api_client import (
+            _cached_response,
+            _write_response,
+            get_catalog_store,
+        )
+
+        response_file = self.folder / "response.json.gz"
+        _write_response(response_file, {"results": [_resource("a")]})
+        first_store, second_store = get_catalog_store(), get_catalog_store()
+
+        self.assertIs(first_store.list_resources(), second_store.list_resources())
+        with patch("qgis_hub_plugin.core.api_client._load_response") as mock_load:
+            self.assertIs(
+                _cached_response(response_file), _cached_response(response_file)
+            )
+        mock_load.assert_not_called()
+
+        # A new version of the catalog replaces the shared one
+        _write_response(response_file, {"results": [_resource("b")]})
+        self.assertEqual([r["uuid"] for r in first_store.list_resources()], ["b"])
+        self.assertEqual(_cached_response(response_file)["results"][0]["uuid"], "b")
+        first_store.close()
+        second_store.close()
+
+    def test_store_emptied_without_response(self):
+        from qgis_hub_plugin.core.api_client import _write_response, get_catalog_store
+
+        _write_response(self.folder / "response.json.gz", {"results": [_resource("a")]})
+        (self.folder / "response.json.gz").unlink()
+
+        store = get_catalog_store()
+
+        self.assertEqual(store.count(), 0)
+        store.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
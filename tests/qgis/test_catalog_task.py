@@ -0,0 +1,286 @@
+#! python3  # noqa E265
+
+"""
+Unit tests for the background catalog refresh task.
+
+Usage from the repo root folder:
+
+    .. code-block:: bash
+        # for whole test module
+        pytest tests/qgis/test_catalog_task.py -v
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from qgis.testing import start_app
+
+from qgis_hub_plugin.utilities.exception import DownloadError
+
+start_app()
+
+
+class TestCatalogRefreshTask(unittest.TestCase):
+    """Test CatalogRefreshTask without running it in the task manager."""
+
+    @patch("qgis_hub_plugin.core.catalog_task.sync_resources")
+    def test_run_success(self, mock_sync):
+        from qgis_hub_plugin.core.catalog_task import CatalogRefreshTask
+
+        catalog = {"results": [{"uuid": "a"}]}
+        mock_sync.return_value = catalog
+        task = CatalogRefreshTask()
+        refreshed = MagicMock()
+        task.catalogRefreshed.connect(refreshed)
+
+        result = task.run()
+        task.finished(result)
+
+        self.assertTrue(result)
+        mock_sync.assert_called_once()
+        refreshed.assert_called_once_with(catalog)
+
+    @patch("qgis_hub_plugin.core.catalog_task.sync_resources")
+    @patch("qgis_hub_plugin.core.catalog_task.get_all_resources")
+    def test_run_full(self, mock_api, mock_sync):
+        from qgis_hub_plugin.core.catalog_task import CatalogRefreshTask
+
+        mock_api.return_value = {"results": []}
+        task = CatalogRefreshTask(full=True)
+
+        self.assertTrue(task.run())
+        self.assertTrue(mock_api.call_args[1]["force_update"])
+        mock_sync.assert_not_called()
+
+    @patch("qgis_hub_plugin.core.catalog_task.sync_resources")
+    def test_run_streams_pages(self, mock_sync):
+        from qgis_hub_plugin.core.catalog_task import CatalogRefreshTask
+
+        def fake_sync_resources(on_page, feedback, resource_types):
+            on_page([{"uuid": "a"}])
+            return {"results": [{"uuid": "a"}]}
+
+        mock_sync.side_effect = fake_sync_resources
+        task = CatalogRefreshTask()
+        page_received = MagicMock()
+        task.pageReceived.connect(page_received)
+
+        task.run()
+
+        page_received.assert_called_once_with([{"uuid": "a"}])
+
+    @patch("qgis_hub_plugin.core.catalog_task.sync_resources")
+    def test_run_failure(self, mock_sync):
+        from qgis_hub_plugin.core.catalog_task import CatalogRefreshTask
+
+        mock_sync.side_effect = DownloadError("Hub unavailable")
+        task = CatalogRefreshTask()
+        failed = MagicMock()
+        task.refreshFailed.connect(failed)
+
+        result = task.run()
+        task.finished(result)
+
+        self.assertFalse(result)
+        failed.assert_called_once_with("Hub unavailable")
+
+    @patch("qgis_hub_plugin.core.catalog_task.sync_resources")
+    def test_cancel(self, mock_sync):
+        from qgis_hub_plugin.core.catalog_task import CatalogRefreshTask
+
+        task = CatalogRefreshTask()
+
+        def fake_sync_resources(on_page, feedback, resource_types):
+            task.cancel()
+            self.assertTrue(feedback.isCanceled())
+            raise DownloadError("Download canceled")
+
+        mock_sync.side_effect = fake_sync_resources
+        canceled, failed = MagicMock(), MagicMock()
+        task.refreshCanceled.connect(canceled)
+        task.refreshFailed.connect(failed)
+
+        task.finished(task.run())
+
+        canceled.assert_called_once_with()
+        failed.assert_not_called()
+
+    @patch("qgis_hub_plugin.core.catalog_task.sync_resources")
+    def test_concurrent_refreshes_shared(self, mock_sync):
+        """Test a task started during an identical refresh waits for it,
+        and receives the pages downloaded before it started."""
+        from qgis_hub_plugin.core.catalog_task import CatalogRefreshTask
+
+        catalog = {"results": [{"uuid": "a"}]}
+        page_sent, release = threading.Event(), threading.Event()
+
+        def fake_sync_resources(on_page, feedback, resource_types):
+            on_page([{"uuid": "a"}])
+            page_sent.set()
+            release.wait(5)
+            return catalog
+
+        mock_sync.side_effect = fake_sync_resources
+        first, second = CatalogRefreshTask(), CatalogRefreshTask()
+        thread = threading.Thread(target=first.run)
+        thread.start()
+        self.assertTrue(page_sent.wait(5))
+        page_received = MagicMock()
+        second.pageReceived.connect(page_received)
+        timer = threading.Timer(0.2, release.set)
+        timer.start()
+
+        self.assertTrue(second.run())
+        thread.join()
+        timer.join()
+
+        mock_sync.assert_called_once()
+        self.assertIs(second.catalog, first.catalog)
+        page_received.assert_called_once_with([{"uuid": "a"}])
+
+    @patch("qgis_hub_plugin.core.catalog_task.sync_resources")
+    def test_shared_refresh_canceled(self, mock_sync):
+        """Test a refresh canceled by its own task is run again by the task
+        waiting for it."""
+        from qgis_hub_plugin.core.catalog_task import CatalogRefreshTask
+        from qgis_hub_plugin.utilities.single_flight import refresh_flights
+
+        catalog = {"results": [{"uuid": "a"}]}
+        first, second = CatalogRefreshTask(), CatalogRefreshTask()
+        coalesced = refresh_flights.coalesced
+        started = threading.Event()
+
+        def fake_sync_resources(on_page, feedback, resource_types):
+            if feedback is not first.feedback:
+                return catalog
+            started.set()
+            deadline = time.monotonic() + 5
+            while refresh_flights.coalesced == coalesced:
+                self.assertLess(time.monotonic(), deadline)
+                time.sleep(0.01)
+            first.cancel()
+            raise DownloadError("Download canceled")
+
+        mock_sync.side_effect = fake_sync_resources
+        thread = threading.Thread(target=first.run)
+        thread.start()
+        self.assertTrue(started.wait(5))
+
+        self.assertTrue(second.run())
+        thread.join()
+
+        self.assertEqual(mock_sync.call_count, 2)
+        self.assertIs(second.catalog, catalog)
+        self.assertIsNone(first.catalog)
+
+    @patch("qgis_hub_plugin.core.catalog_task.sync_resources")
+    def test_progress_forwarded(self, mock_sync):
+        from qgis_hub_plugin.core.catalog_task import CatalogRefreshTask
+
+        def fake_sync_resources(on_page, feedback, resource_types):
+            feedback.setProgress(50)
+            return {"results": []}
+
+        mock_sync.side_effect = fake_sync_resources
+        task = CatalogRefreshTask()
+
+        task.run()
+
+        self.assertEqual(task.progress(), 50)
+
+
+class TestCatalogPrefetchTask(unittest.TestCase):
+    """Test CatalogPrefetchTask without running it in the task manager."""
+
+    catalog = {
+        "results": [
+            {"uuid": "cached", "thumbnail": "https://hub/cached.png"},
+            {"uuid": "missing", "thumbnail": "https://hub/missing.png"},
+            {"uuid": "default", "thumbnail": "https://hub/qgis-icon-32x32.png"},
+        ]
+    }
+
+    @patch("qgis_hub_plugin.core.catalog_task.download_resource_thumbnail")
+    @patch("qgis_hub_plugin.core.catalog_task.is_resource_thumbnail_cached")
+    @patch("qgis_hub_plugin.core.catalog_task.sync_resources")
+    @patch("qgis_hub_plugin.core.catalog_task.catalog_is_stale")
+    def test_run_stale_catalog(self, mock_stale, mock_sync, mock_cached, mock_download):
+        from datetime import timedelta
+
+        from qgis_hub_plugin.core.catalog_task import CatalogPrefetchTask
+
+        mock_stale.return_value = True
+        mock_sync.return_value = self.catalog
+        mock_cached.side_effect = lambda url, uuid: uuid == "cached"
+        task = CatalogPrefetchTask(timedelta(minutes=60))
+
+        self.assertTrue(task.run())
+        mock_sync.assert_called_once()
+        mock_download.assert_called_once_with("https://hub/missing.png", "missing")
+        self.assertEqual(task.thumbnails_downloaded, 1)
+        self.assertEqual(task.progress(), 100)
+
+    @patch("qgis_hub_plugin.core.catalog_task.download_resource_thumbnail")
+    @patch("qgis_hub_plugin.core.catalog_task.get_all_resources")
+    @patch("qgis_hub_plugin.core.catalog_task.sync_resources")
+    @patch("qgis_hub_plugin.core.catalog_task.catalog_is_stale")
+    def test_run_fresh_catalog(self, mock_stale, mock_sync, mock_api, mock_download):
+        from datetime import timedelta
+
+        from qgis_hub_plugin.core.catalog_task import CatalogPrefetchTask
+
+        mock_stale.return_value = False
+        mock_api.return_value = {"results": []}
+        task = CatalogPrefetchTask(timedelta(minutes=60))
+
+        self.assertTrue(task.run())
+        mock_sync.assert_not_called()
+        mock_api.assert_called_once_with(cache_only=True)
+
+
+class TestGetAllResourcesAsync(unittest.TestCase):
+    """Test the asynchronous catalog API."""
+
+    @patch("qgis_hub_plugin.core.catalog_task.QgsApplication")
+    def test_task_started_with_callbacks(self, mock_qgs_app):
+        from qgis_hub_plugin.core.catalog_task import get_all_resources_async
+
+        on_finished, on_failed, on_progress = MagicMock(), MagicMock(), MagicMock()
+
+        task = get_all_resources_async(
+            on_finished, on_failed=on_failed, on_progress=on_progress, full=True
+        )
+
+        mock_qgs_app.taskManager.return_value.addTask.assert_called_once_with(task)
+        self.assertTrue(task.full)
+        task.catalogRefreshed.emit({"results": []})
+        task.refreshFailed.emit("Hub unavailable")
+        task.progressChanged.emit(25.0)
+        on_finished.assert_called_once_with({"results": []})
+        on_failed.assert_called_once_with("Hub unavailable")
+        on_progress.assert_called_once_with(25.0)
+
+    @patch("qgis_hub_plugin.core.catalog_task.QgsApplication")
+    def test_task_canceled_callback(self, mock_qgs_app):
+        from qgis_hub_plugin.core.catalog_task import get_all_resources_async
+
+        on_finished, on_failed, on_canceled = MagicMock(), MagicMock(), MagicMock()
+
+        task = get_all_resources_async(
+            on_finished, on_failed=on_failed, on_canceled=on_canceled
+        )
+        task.cancel()
+        task.finished(False)
+
+        on_canceled.assert_called_once_with()
+        on_finished.assert_not_called()
+        on_failed.assert_not_called()
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,331 @@
+#! python3  # noqa E265
+
+"""
+Tests of the file downloads against a local stand-in HTTP server for the
+QGIS Hub.
+
+Usage from the repo root folder:
+
+    .. code-block:: bash
+        # for whole test module
+        pytest tests/qgis/test_downloads.py -v
+"""
+
+import hashlib
+import os
+import socket
+import tempfile
+import threading
+import time
+import tracemalloc
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+from qgis.testing import start_app
+
+start_app()
+
+FILE_SIZE = 16 * 1024 * 1024
+
+
+class _FileHandler(BaseHTTPRequestHandler):
+    """Serve the file of the server in small writes, like a slow link.
+
+    Byte ranges are served when the server has an ETag. The connection is
+    dropped once ``drop_after`` bytes of the body were sent, if set.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = self.server.body
+        etag = self.server.etag
+        requested_range = self.headers.get("Range", "")
+        self.server.ranges.append(requested_range)
+
+        start = 0
+        if etag and requested_range and self.headers.get("If-Range") == etag:
+            start = int(requested_range[len("bytes=") :].split("-")[0])
+        if start:
+            self.send_response(206)
+            self.send_header(
+                "Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}"
+            )
+        else:
+            self.send_response(200)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Accept-Ranges", "bytes")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Content-Length", str(len(body) - start))
+        self.end_headers()
+
+        drop_after = self.server.drop_after
+        self.server.drop_after = None
+        end = len(body) if drop_after is None else start + drop_after
+        for offset in range(start, end, 256 * 1024):
+            self.wfile.write(body[offset : min(end, offset + 256 * 1024)])
+            self.server.bytes_sent += min(end, offset + 256 * 1024) - offset
+        if drop_after is not None:
+            self.wfile.flush()
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    """Serve a small file slowly, recording how many are served at once."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.active += 1
+            self.server.max_active = max(self.server.max_active, self.server.active)
+        time.sleep(0.05)
+        body = self.path.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server.lock:
+            self.server.active -= 1
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _ServerTestCase(unittest.TestCase):
+    """Download from a local server serving a large random file."""
+
+    def setUp(self):
+        from qgis_hub_plugin.utilities.retry import RetryPolicy, circuit_breaker
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _FileHandler)
+        self.server.body = os.urandom(FILE_SIZE)
+        self.server.etag = ""
+        self.server.drop_after = None
+        self.server.ranges = []
+        self.server.bytes_sent = 0
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.start()
+
+        def stop():
+            self.server.shutdown()
+            self.server.server_close()
+            thread.join()
+
+        self.addCleanup(stop)
+
+        patcher = patch(
+            "qgis_hub_plugin.utilities.common.retry_policy",
+            RetryPolicy(max_attempts=1),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        circuit_breaker.reset()
+        self.addCleanup(circuit_breaker.reset)
+
+
+class TestStreamingDownload(_ServerTestCase):
+    """Test large files are written to disk as they download."""
+
+    def test_memory_stays_bounded(self):
+        from qgis_hub_plugin.utilities.common import DOWNLOAD_BUFFER_SIZE, download_file
+
+        destination = Path(self.tmp_dir.name, "large.gpkg")
+
+        tracemalloc.start()
+        try:
+            download_file(f"{self.base_url}/files/large.gpkg", destination)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(
+            hashlib.sha256(destination.read_bytes()).digest(),
+            hashlib.sha256(self.server.body).digest(),
+        )
+        # Far from the size of the file
+        self.assertLess(peak, 2 * DOWNLOAD_BUFFER_SIZE)
+        # No temporary file left behind
+        self.assertEqual(os.listdir(self.tmp_dir.name), ["large.gpkg"])
+
+
+class TestResumableDownload(_ServerTestCase):
+    """Test interrupted downloads are resumed where they stopped."""
+
+    def setUp(self):
+        super().setUp()
+        self.server.etag = '"v1"'
+        self.server.drop_after = FILE_SIZE // 2
+        self.url = f"{self.base_url}/files/large.gpkg"
+        self.destination = Path(self.tmp_dir.name, "large.gpkg")
+
+    def _set_max_attempts(self, max_attempts):
+        from qgis_hub_plugin.utilities.retry import RetryPolicy
+
+        patcher = patch(
+            "qgis_hub_plugin.utilities.common.retry_policy",
+            RetryPolicy(max_attempts=max_attempts, base_delay=0.0),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_resumed_by_the_retry(self):
+        from qgis_hub_plugin.utilities.common import download_file
+
+        self._set_max_attempts(2)
+
+        download_file(self.url, self.destination)
+
+        self.assertEqual(self.destination.read_bytes(), self.server.body)
+        self.assertEqual(self.server.ranges, ["", f"bytes={FILE_SIZE // 2}-"])
+        self.assertEqual(self.server.bytes_sent, FILE_SIZE)
+        self.assertEqual(os.listdir(self.tmp_dir.name), ["large.gpkg"])
+
+    def test_resumed_by_the_next_download(self):
+        from qgis_hub_plugin.utilities.common import PART_SUFFIX, download_file
+        from qgis_hub_plugin.utilities.exception import DownloadError
+
+        self._set_max_attempts(1)
+        with self.assertRaises(DownloadError):
+            download_file(self.url, self.destination)
+        self.assertFalse(self.destination.exists())
+        part_file = Path(self.tmp_dir.name, f"large.gpkg{PART_SUFFIX}")
+        self.assertEqual(part_file.stat().st_size, FILE_SIZE // 2)
+
+        download_file(self.url, self.destination)
+
+        self.assertEqual(self.destination.read_bytes(), self.server.body)
+        self.assertEqual(self.server.ranges[-1], f"bytes={FILE_SIZE // 2}-")
+        self.assertEqual(os.listdir(self.tmp_dir.name), ["large.gpkg"])
+
+    def test_restarted_when_the_file_changed(self):
+        from qgis_hub_plugin.utilities.common import download_file
+        from qgis_hub_plugin.utilities.exception import DownloadError
+
+        self._set_max_attempts(1)
+        with self.assertRaises(DownloadError):
+            download_file(self.url, self.destination)
+        self.server.body = os.urandom(FILE_SIZE)
+        self.server.etag = '"v2"'
+
+        download_file(self.url, self.destination)
+
+        # The server ignored the outdated range and sent the whole new file
+        self.assertEqual(self.destination.read_bytes(), self.server.body)
+
+    def test_not_resumed_without_validator(self):
+        from qgis_hub_plugin.utilities.common import download_file
+
+        self.server.etag = ""
+        self._set_max_attempts(2)
+
+        download_file(self.url, self.destination)
+
+        self.assertEqual(self.destination.read_bytes(), self.server.body)
+        self.assertEqual(self.server.ranges, ["", ""])
+
+
+class TestDownloadManager(unittest.TestCase):
+    """Test the downloads queued in the manager run a few at a time."""
+
+    def setUp(self):
+        from qgis_hub_plugin.utilities.retry import RetryPolicy, circuit_breaker
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+        self.server.lock = threading.Lock()
+        self.server.active = 0
+        self.server.max_active = 0
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.start()
+
+        def stop():
+            self.server.shutdown()
+            self.server.server_close()
+            thread.join()
+
+        self.addCleanup(stop)
+
+        patcher = patch(
+            "qgis_hub_plugin.utilities.common.retry_policy",
+            RetryPolicy(max_attempts=1),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        circuit_breaker.reset()
+        self.addCleanup(circuit_breaker.reset)
+
+    def _wait_idle(self, manager):
+        from qgis.PyQt.QtCore import QEventLoop, QTimer
+
+        loop = QEventLoop()
+        manager.progressChanged.connect(
+            lambda progress: loop.quit() if not manager.pending() else None
+        )
+        QTimer.singleShot(30000, loop.quit)
+        if manager.pending():
+            loop.exec()
+
+    def test_concurrency_is_bounded(self):
+        from qgis_hub_plugin.utilities.download_manager import DownloadManager
+        from qgis_hub_plugin.utilities.download_queue import DONE, FAILED
+
+        manager = DownloadManager(max_active=3, max_per_host=2)
+        finished = []
+        manager.downloadFinished.connect(finished.append)
+        progress = []
+        manager.progressChanged.connect(progress.append)
+
+        jobs = [
+            manager.submit(
+                f"{self.base_url}/thumbnails/{i}.png",
+                Path(self.tmp_dir.name, f"{i}.png"),
+            )
+            for i in range(8)
+        ]
+        # Same file, same job
+        self.assertIs(
+            manager.submit(jobs[0].url, jobs[0].destination, priority=1), jobs[0]
+        )
+        self._wait_idle(manager)
+
+        self.assertLessEqual(self.server.max_active, 2)
+        self.assertEqual(sorted(finished, key=jobs.index), jobs)
+        self.assertTrue(all(job.state == DONE for job in jobs))
+        self.assertEqual(
+            Path(self.tmp_dir.name, "3.png").read_bytes(), b"/thumbnails/3.png"
+        )
+        self.assertEqual(progress[-1].finished, 8)
+        self.assertEqual(progress[-1].total, 8)
+        self.assertEqual(progress[-1].failed, 0)
+
+        # Kept as is without a request, reported from the event loop
+        cached = manager.submit(jobs[0].url, jobs[0].destination, force=False)
+        self.assertEqual(cached.state, DONE)
+        self.assertIsNot(cached, jobs[0])
+        self.assertNotIn(cached, finished)
+
+        failing = manager.submit(
+            "http://127.0.0.1:9/missing.png", Path(self.tmp_dir.name, "missing.png")
+        )
+        self._wait_idle(manager)
+        self.assertEqual(failing.state, FAILED)
+        self.assertIn(cached, finished)
+
+
+if __name__ == "__main__":
+    unittest.main()
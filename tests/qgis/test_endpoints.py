@@ -0,0 +1,175 @@
+#! python3  # noqa E265
+
+"""
+Tests of the selection of the QGIS Hub mirrors, against local stand-in HTTP
+servers for the QGIS Hub and its mirrors.
+
+Usage from the repo root folder:
+
+    .. code-block:: bash
+        # for whole test module
+        pytest tests/qgis/test_endpoints.py -v
+"""
+
+import json
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+CATALOG = {
+    "total": 3,
+    "results": [{"uuid": f"uuid-{i}", "name": f"Resource {i}"} for i in range(3)],
+}
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    """Serve the catalog pages and files of the QGIS Hub, after the delay or
+    with the error status of the server."""
+
+    def do_GET(self):
+        with self.server.lock:
+            self.server.paths.append(self.path)
+        time.sleep(self.server.delay)
+        if self.server.status != 200:
+            self.send_error(self.server.status)
+            return
+
+        url = urlparse(self.path)
+        if url.path.startswith("/files/"):
+            body = b"file content"
+        else:
+            query = parse_qs(url.query)
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", ["50"])[0])
+            page = {
+                "total": CATALOG["total"],
+                "results": CATALOG["results"][offset : offset + limit],
+            }
+            body = json.dumps(page).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _closed_endpoint() -> str:
+    """Return the URL of a local port nothing listens to."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+
+class TestEndpointSelection(unittest.TestCase):
+    """Test the failover and the selection of the fastest endpoint."""
+
+    def setUp(self):
+        from qgis_hub_plugin.utilities.endpoints import EndpointSelector
+        from qgis_hub_plugin.utilities.retry import RetryPolicy, circuit_breaker
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.hub = self._start_server()
+        self.mirror = self._start_server()
+
+        self.selector = EndpointSelector(official=self.hub.endpoint)
+        self.selector.set_mirrors([self.mirror.endpoint])
+        for target in (
+            "qgis_hub_plugin.core.api_client.endpoint_selector",
+            "qgis_hub_plugin.utilities.common.endpoint_selector",
+        ):
+            patcher = patch(target, self.selector)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for target in (
+            "qgis_hub_plugin.core.api_client.retry_policy",
+            "qgis_hub_plugin.utilities.common.retry_policy",
+        ):
+            patcher = patch(target, RetryPolicy(max_attempts=1))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        circuit_breaker.reset()
+        self.addCleanup(circuit_breaker.reset)
+
+    def _start_server(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _StandInHandler)
+        server.endpoint = f"http://127.0.0.1:{server.server_port}"
+        server.lock = threading.Lock()
+        server.paths = []
+        server.delay = 0.0
+        server.status = 200
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+
+        def stop():
+            server.shutdown()
+            server.server_close()
+            thread.join()
+
+        self.addCleanup(stop)
+        return server
+
+    def _fetch_catalog(self):
+        from qgis_hub_plugin.core.api_client import fetch_catalog
+
+        with patch(
+            "qgis_hub_plugin.core.api_client.BASE_URL",
+            f"{self.selector.official}/api/v1/resources/",
+        ):
+            return fetch_catalog().catalog
+
+    def test_catalog_from_fastest_endpoint(self):
+        self.hub.delay = 0.3
+
+        catalog = self._fetch_catalog()
+
+        self.assertEqual(catalog["results"], CATALOG["results"])
+        self.assertEqual(self.selector.ranked()[0], self.mirror.endpoint)
+        # The hub only answered the latency probe
+        self.assertEqual(len(self.hub.paths), 1)
+        self.assertIn("limit=1&", self.hub.paths[0])
+
+    def test_catalog_failover(self):
+        self.mirror.status = 503
+        self.selector.record_latency(self.hub.endpoint, 1.0)
+        self.selector.record_latency(self.mirror.endpoint, 0.1)
+
+        catalog = self._fetch_catalog()
+
+        self.assertEqual(catalog["results"], CATALOG["results"])
+        self.assertEqual(len(self.mirror.paths), 1)
+
+    def test_catalog_all_endpoints_down(self):
+        from qgis_hub_plugin.utilities.exception import DownloadError
+
+        self.mirror.status = 503
+        self.selector.official = _closed_endpoint()
+        self.selector.set_mirrors([self.mirror.endpoint])
+
+        with self.assertRaises(DownloadError):
+            self._fetch_catalog()
+
+    def test_download_file_failover(self):
+        from qgis_hub_plugin.utilities.common import download_file
+
+        self.hub.status = 503
+        destination = Path(self.tmp_dir.name) / "1.zip"
+
+        download_file(f"{self.hub.endpoint}/files/1.zip", destination)
+
+        self.assertEqual(destination.read_bytes(), b"file content")
+        self.assertEqual(self.mirror.paths, ["/files/1.zip"])
+
+
+if __name__ == "__main__":
+    unittest.main()
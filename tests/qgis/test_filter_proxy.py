@@ -28,6 +28,7 @@ from qgis_hub_plugin.gui.constants import (
     ResourceSubtypeRole,
     ResourceTypeRole,
     SortingRole,
+    UuidRole,
 )
 
 # Initialize QGIS application
@@ -278,6 +279,23 @@ class TestFilterProxyModel(unittest.TestCase):
         # Should now show only 2 styles
         self.assertEqual(self.proxy.rowCount(), 2)
 
+    def test_accepted_uuids(self):
+        """Test the UUIDs found in the catalog store take precedence."""
+        for row in range(self.model.rowCount()):
+            self.model.item(row).setData(f"uuid-{row}", UuidRole)
+        self.proxy.setCheckboxStates({"model": True})
+        self.proxy.setRolesToFilter([NameRole])
+
+        self.proxy.setAcceptedUuids({"uuid-1", "uuid-4"})
+        self.assertEqual(
+            [self.proxy.index(row, 0).data() for row in range(self.proxy.rowCount())],
+            ["Symbol Style 1", "ColorRamp Style 1"],
+        )
+
+        # Back to the other filters
+        self.proxy.setAcceptedUuids(None)
+        self.assertEqual(self.proxy.rowCount(), 2)
+
     def test_filter_resource_with_multiple_subtypes(self):
         """Test filtering a resource that has multiple subtypes."""
         # Add a style with multiple subtypes
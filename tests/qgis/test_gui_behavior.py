@@ -21,6 +21,8 @@ from unittest.mock import MagicMock, patch
 from qgis.PyQt.QtCore import QSize
 from qgis.testing import start_app
 
+from tests.qgis.utils import memory_catalog_store
+
 # Initialize QGIS application
 start_app()
 
@@ -37,33 +39,35 @@ class TestGUIBehavior(unittest.TestCase):
         """Clean up after each test method."""
         pass
 
-    @patch("qgis_hub_plugin.gui.resource_browser.get_all_resources")
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
     @patch("qgis_hub_plugin.gui.resource_browser.download_resource_thumbnail")
     def test_view_switching_icon_to_list(self, mock_thumbnail, mock_api):
         """Test switching from icon view to list view."""
         from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
 
         # Mock API response with sample data
-        mock_api.return_value = {
-            "total": 1,
-            "count": 1,
-            "next": None,
-            "results": [
-                {
-                    "uuid": "test-uuid-1",
-                    "name": "Test Resource",
-                    "resource_type": "model",
-                    "resource_subtype": "",
-                    "creator": "Test User",
-                    "upload_date": "2024-01-15T10:30:00Z",
-                    "download_count": 10,
-                    "file": "https://example.com/model.model3",
-                    "thumbnail": None,
-                    "description": "Test model",
-                    "dependencies": [],
-                }
-            ],
-        }
+        mock_api.return_value = memory_catalog_store(
+            {
+                "total": 1,
+                "count": 1,
+                "next": None,
+                "results": [
+                    {
+                        "uuid": "test-uuid-1",
+                        "name": "Test Resource",
+                        "resource_type": "model",
+                        "resource_subtype": "",
+                        "creator": "Test User",
+                        "upload_date": "2024-01-15T10:30:00Z",
+                        "download_count": 10,
+                        "file": "https://example.com/model.model3",
+                        "thumbnail": None,
+                        "description": "Test model",
+                        "dependencies": [],
+                    }
+                ],
+            }
+        )
         mock_thumbnail.return_value = None
 
         # Create dialog (starts in icon view by default)
@@ -81,33 +85,35 @@ class TestGUIBehavior(unittest.TestCase):
         # Verify switched to list view (index 1)
         self.assertEqual(dialog.viewStackedWidget.currentIndex(), 1)
 
-    @patch("qgis_hub_plugin.gui.resource_browser.get_all_resources")
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
     @patch("qgis_hub_plugin.gui.resource_browser.download_resource_thumbnail")
     def test_view_switching_list_to_icon(self, mock_thumbnail, mock_api):
         """Test switching from list view to icon view."""
         from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
 
         # Mock API response
-        mock_api.return_value = {
-            "total": 1,
-            "count": 1,
-            "next": None,
-            "results": [
-                {
-                    "uuid": "test-uuid-2",
-                    "name": "Test Resource 2",
-                    "resource_type": "style",
-                    "resource_subtype": "symbol",
-                    "creator": "Test User",
-                    "upload_date": "2024-01-15T10:30:00Z",
-                    "download_count": 5,
-                    "file": "https://example.com/style.xml",
-                    "thumbnail": None,
-                    "description": "Test style",
-                    "dependencies": [],
-                }
-            ],
-        }
+        mock_api.return_value = memory_catalog_store(
+            {
+                "total": 1,
+                "count": 1,
+                "next": None,
+                "results": [
+                    {
+                        "uuid": "test-uuid-2",
+                        "name": "Test Resource 2",
+                        "resource_type": "style",
+                        "resource_subtype": "symbol",
+                        "creator": "Test User",
+                        "upload_date": "2024-01-15T10:30:00Z",
+                        "download_count": 5,
+                        "file": "https://example.com/style.xml",
+                        "thumbnail": None,
+                        "description": "Test style",
+                        "dependencies": [],
+                    }
+                ],
+            }
+        )
         mock_thumbnail.return_value = None
 
         # Create dialog and switch to list view first
@@ -125,33 +131,35 @@ class TestGUIBehavior(unittest.TestCase):
         # Verify switched to icon view (index 0)
         self.assertEqual(dialog.viewStackedWidget.currentIndex(), 0)
 
-    @patch("qgis_hub_plugin.gui.resource_browser.get_all_resources")
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
     @patch("qgis_hub_plugin.gui.resource_browser.download_resource_thumbnail")
     def test_thumbnail_size_change(self, mock_thumbnail, mock_api):
         """Test changing thumbnail size with slider."""
         from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
 
         # Mock API response
-        mock_api.return_value = {
-            "total": 1,
-            "count": 1,
-            "next": None,
-            "results": [
-                {
-                    "uuid": "test-uuid-3",
-                    "name": "Test Resource 3",
-                    "resource_type": "model",
-                    "resource_subtype": "",
-                    "creator": "Test User",
-                    "upload_date": "2024-01-15T10:30:00Z",
-                    "download_count": 10,
-                    "file": "https://example.com/model.model3",
-                    "thumbnail": None,
-                    "description": "Test model",
-                    "dependencies": [],
-                }
-            ],
-        }
+        mock_api.return_value = memory_catalog_store(
+            {
+                "total": 1,
+                "count": 1,
+                "next": None,
+                "results": [
+                    {
+                        "uuid": "test-uuid-3",
+                        "name": "Test Resource 3",
+                        "resource_type": "model",
+                        "resource_subtype": "",
+                        "creator": "Test User",
+                        "upload_date": "2024-01-15T10:30:00Z",
+                        "download_count": 10,
+                        "file": "https://example.com/model.model3",
+                        "thumbnail": None,
+                        "description": "Test model",
+                        "dependencies": [],
+                    }
+                ],
+            }
+        )
         mock_thumbnail.return_value = None
 
         # Create dialog
@@ -172,33 +180,35 @@ class TestGUIBehavior(unittest.TestCase):
             self.assertEqual(icon_size.width(), size)
             self.assertEqual(icon_size.height(), size)
 
-    @patch("qgis_hub_plugin.gui.resource_browser.get_all_resources")
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
     @patch("qgis_hub_plugin.gui.resource_browser.download_resource_thumbnail")
     def test_thumbnail_size_slider_signal(self, mock_thumbnail, mock_api):
         """Test that slider valueChanged signal updates icon size."""
         from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
 
         # Mock API response
-        mock_api.return_value = {
-            "total": 1,
-            "count": 1,
-            "next": None,
-            "results": [
-                {
-                    "uuid": "test-uuid-4",
-                    "name": "Test Resource 4",
-                    "resource_type": "style",
-                    "resource_subtype": "symbol",
-                    "creator": "Test User",
-                    "upload_date": "2024-01-15T10:30:00Z",
-                    "download_count": 15,
-                    "file": "https://example.com/style.xml",
-                    "thumbnail": None,
-                    "description": "Test style",
-                    "dependencies": [],
-                }
-            ],
-        }
+        mock_api.return_value = memory_catalog_store(
+            {
+                "total": 1,
+                "count": 1,
+                "next": None,
+                "results": [
+                    {
+                        "uuid": "test-uuid-4",
+                        "name": "Test Resource 4",
+                        "resource_type": "style",
+                        "resource_subtype": "symbol",
+                        "creator": "Test User",
+                        "upload_date": "2024-01-15T10:30:00Z",
+                        "download_count": 15,
+                        "file": "https://example.com/style.xml",
+                        "thumbnail": None,
+                        "description": "Test style",
+                        "dependencies": [],
+                    }
+                ],
+            }
+        )
         mock_thumbnail.return_value = None
 
         # Create dialog
@@ -217,72 +227,74 @@ class TestGUIBehavior(unittest.TestCase):
 class TestResourceTreeFiltering(unittest.TestCase):
     """Tests for resource tree filtering functionality."""
 
-    @patch("qgis_hub_plugin.gui.resource_browser.get_all_resources")
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
     @patch("qgis_hub_plugin.gui.resource_browser.download_resource_thumbnail")
     def test_tree_setup_with_resources(self, mock_thumbnail, mock_api):
         """Test that resource tree is populated correctly with multiple resource types."""
         from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
 
         # Mock API response with diverse resource types
-        mock_api.return_value = {
-            "total": 4,
-            "count": 4,
-            "next": None,
-            "results": [
-                {
-                    "uuid": "tree-model-1",
-                    "name": "Test Model 1",
-                    "resource_type": "model",
-                    "resource_subtype": "",
-                    "creator": "Test User",
-                    "upload_date": "2024-01-15T10:30:00Z",
-                    "download_count": 10,
-                    "file": "https://example.com/model.model3",
-                    "thumbnail": None,
-                    "description": "Test model",
-                    "dependencies": [],
-                },
-                {
-                    "uuid": "tree-model-2",
-                    "name": "Test Model 2",
-                    "resource_type": "model",
-                    "resource_subtype": "",
-                    "creator": "Test User",
-                    "upload_date": "2024-01-15T10:30:00Z",
-                    "download_count": 15,
-                    "file": "https://example.com/model2.model3",
-                    "thumbnail": None,
-                    "description": "Test model 2",
-                    "dependencies": [],
-                },
-                {
-                    "uuid": "tree-style-1",
-                    "name": "Test Style",
-                    "resource_type": "style",
-                    "resource_subtype": "symbol",
-                    "creator": "Test User",
-                    "upload_date": "2024-01-15T10:30:00Z",
-                    "download_count": 20,
-                    "file": "https://example.com/style.xml",
-                    "thumbnail": None,
-                    "description": "Test style",
-                    "dependencies": [],
-                },
-                {
-                    "uuid": "tree-script-1",
-                    "name": "Test Script",
-                    "resource_type": "processingscript",
-                    "resource_subtype": "python",
-                    "creator": "Test User",
-                    "upload_date": "2024-01-15T10:30:00Z",
-                    "download_count": 25,
-                    "file": "https://example.com/script.py",
-                    "thumbnail": None,
-                    "description": "Test script",
-                    "dependencies": [],
-                },
-            ],
-        }
+        mock_api.return_value = memory_catalog_store(
+            {
+                "total": 4,
+                "count": 4,
+                "next": None,
+                "results": [
+                    {
+                        "uuid": "tree-model-1",
+                        "name": "Test Model 1",
+                        "resource_type": "model",
+                        "resource_subtype": "",
+                        "creator": "Test User",
+                        "upload_date": "2024-01-15T10:30:00Z",
+                        "download_count": 10,
+                        "file": "https://example.com/model.model3",
+                        "thumbnail": None,
+                        "description": "Test model",
+                        "dependencies": [],
+                    },
+                    {
+                        "uuid": "tree-model-2",
+                        "name": "Test Model 2",
+                        "resource_type": "model",
+                        "resource_subtype": "",
+                        "creator": "Test User",
+                        "upload_date": "2024-01-15T10:30:00Z",
+                        "download_count": 15,
+                        "file": "https://example.com/model2.model3",
+                        "thumbnail": None,
+                        "description": "Test model 2",
+                        "dependencies": [],
+                    },
+                    {
+                        "uuid": "tree-style-1",
+                        "name": "Test Style",
+                        "resource_type": "style",
+                        "resource_subtype": "symbol",
+                        "creator": "Test User",
+                        "upload_date": "2024-01-15T10:30:00Z",
+                        "download_count": 20,
+                        "file": "https://example.com/style.xml",
+                        "thumbnail": None,
+                        "description": "Test style",
+                        "dependencies": [],
+                    },
+                    {
+                        "uuid": "tree-script-1",
+                        "name": "Test Script",
+                        "resource_type": "processingscript",
+                        "resource_subtype": "python",
+                        "creator": "Test User",
+                        "upload_date": "2024-01-15T10:30:00Z",
+                        "download_count": 25,
+                        "file": "https://example.com/script.py",
+                        "thumbnail": None,
+                        "description": "Test script",
+                        "dependencies": [],
+                    },
+                ],
+            }
+        )
         mock_thumbnail.return_value = None
 
         # Create dialog
@@ -298,59 +310,61 @@ class TestResourceTreeFiltering(unittest.TestCase):
         self.assertIn("All Types", all_types_item.text(0))
         self.assertIn("4", all_types_item.text(0))  # Should show count
 
-    @patch("qgis_hub_plugin.gui.resource_browser.get_all_resources")
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
     @patch("qgis_hub_plugin.gui.resource_browser.download_resource_thumbnail")
     def test_tree_filtering_by_category(self, mock_thumbnail, mock_api):
         """Test that selecting a category in the tree filters resources correctly."""
         from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
 
         # Mock API response with multiple types
-        mock_api.return_value = {
-            "total": 3,
-            "count": 3,
-            "next": None,
-            "results": [
-                {
-                    "uuid": "filter-model-1",
-                    "name": "Model Resource",
-                    "resource_type": "model",
-                    "resource_subtype": "",
-                    "creator": "Test User",
-                    "upload_date": "2024-01-15T10:30:00Z",
-                    "download_count": 10,
-                    "file": "https://example.com/model.model3",
-                    "thumbnail": None,
-                    "description": "Test model",
-                    "dependencies": [],
-                },
-                {
-                    "uuid": "filter-style-1",
-                    "name": "Style Resource",
-                    "resource_type": "style",
-                    "resource_subtype": "symbol",
-                    "creator": "Test User",
-                    "upload_date": "2024-01-15T10:30:00Z",
-                    "download_count": 20,
-                    "file": "https://example.com/style.xml",
-                    "thumbnail": None,
-                    "description": "Test style",
-                    "dependencies": [],
-                },
-                {
-                    "uuid": "filter-geopackage-1",
-                    "name": "Geopackage Resource",
-                    "resource_type": "geopackage",
-                    "resource_subtype": "",
-                    "creator": "Test User",
-                    "upload_date": "2024-01-15T10:30:00Z",
-                    "download_count": 30,
-                    "file": "https://example.com/data.gpkg",
-                    "thumbnail": None,
-                    "description": "Test geopackage",
-                    "dependencies": [],
-                },
-            ],
-        }
+        mock_api.return_value = memory_catalog_store(
+            {
+                "total": 3,
+                "count": 3,
+                "next": None,
+                "results": [
+                    {
+                        "uuid": "filter-model-1",
+                        "name": "Model Resource",
+                        "resource_type": "model",
+                        "resource_subtype": "",
+                        "creator": "Test User",
+                        "upload_date": "2024-01-15T10:30:00Z",
+                        "download_count": 10,
+                        "file": "https://example.com/model.model3",
+                        "thumbnail": None,
+                        "description": "Test model",
+                        "dependencies": [],
+                    },
+                    {
+                        "uuid": "filter-style-1",
+                        "name": "Style Resource",
+                        "resource_type": "style",
+                        "resource_subtype": "symbol",
+                        "creator": "Test User",
+                        "upload_date": "2024-01-15T10:30:00Z",
+                        "download_count": 20,
+                        "file": "https://example.com/style.xml",
+                        "thumbnail": None,
+                        "description": "Test style",
+                        "dependencies": [],
+                    },
+                    {
+                        "uuid": "filter-geopackage-1",
+                        "name": "Geopackage Resource",
+                        "resource_type": "geopackage",
+                        "resource_subtype": "",
+                        "creator": "Test User",
+                        "upload_date": "2024-01-15T10:30:00Z",
+                        "download_count": 30,
+                        "file": "https://example.com/data.gpkg",
+                        "thumbnail": None,
+                        "description": "Test geopackage",
+                        "dependencies": [],
+                    },
+                ],
+            }
+        )
         mock_thumbnail.return_value = None
 
         # Create dialog
@@ -381,46 +395,79 @@ class TestResourceTreeFiltering(unittest.TestCase):
             filtered_count = dialog.proxy_model.rowCount()
             self.assertEqual(filtered_count, 1)  # Only 1 model in our test data
 
-    @patch("qgis_hub_plugin.gui.resource_browser.get_all_resources")
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
+    def test_filter_from_catalog_store(self, mock_api):
+        """Test the category and the search text are looked up in the store,
+        and the streamed rows filtered one by one."""
+        from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
+
+        resources = [
+            _refresh_resource("a", "Roads"),
+            _refresh_resource("b", "Rivers"),
+        ]
+        resources[1]["resource_type"] = "style"
+        resources[1]["resource_subtypes"] = ["symbol"]
+        mock_api.return_value = memory_catalog_store({"results": resources})
+        dialog = ResourceBrowserDialog()
+        self.assertIsNone(dialog.proxy_model.accepted_uuids)
+
+        dialog.lineEditSearch.setText("ROAD")
+        self.assertEqual(dialog.proxy_model.accepted_uuids, {"a"})
+        self.assertEqual(dialog.proxy_model.rowCount(), 1)
+
+        dialog.lineEditSearch.setText("")
+        symbol_item = dialog.tree_items["styles:symbol"]
+        dialog.treeWidgetCategories.setCurrentItem(symbol_item)
+        self.assertEqual(dialog.proxy_model.accepted_uuids, {"b"})
+        self.assertEqual(dialog.proxy_model.rowCount(), 1)
+
+        # Not in the store yet
+        dialog.reset_resource_model()
+        dialog.on_catalog_page_received([_refresh_resource("c", "Canals")])
+        self.assertIsNone(dialog.proxy_model.accepted_uuids)
+
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
     @patch("qgis_hub_plugin.gui.resource_browser.download_resource_thumbnail")
     def test_tree_filtering_all_types(self, mock_thumbnail, mock_api):
         """Test that selecting 'All Types' shows all resources."""
         from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
 
         # Mock API response
-        mock_api.return_value = {
-            "total": 2,
-            "count": 2,
-            "next": None,
-            "results": [
-                {
-                    "uuid": "all-model-1",
-                    "name": "Model",
-                    "resource_type": "model",
-                    "resource_subtype": "",
-                    "creator": "Test User",
-                    "upload_date": "2024-01-15T10:30:00Z",
-                    "download_count": 10,
-                    "file": "https://example.com/model.model3",
-                    "thumbnail": None,
-                    "description": "Test model",
-                    "dependencies": [],
-                },
-                {
-                    "uuid": "all-style-1",
-                    "name": "Style",
-                    "resource_type": "style",
-                    "resource_subtype": "symbol",
-                    "creator": "Test User",
-                    "upload_date": "2024-01-15T10:30:00Z",
-                    "download_count": 20,
-                    "file": "https://example.com/style.xml",
-                    "thumbnail": None,
-                    "description": "Test style",
-                    "dependencies": [],
-                },
-            ],
-        }
+        mock_api.return_value = memory_catalog_store(
+            {
+                "total": 2,
+                "count": 2,
+                "next": None,
+                "results": [
+                    {
+                        "uuid": "all-model-1",
+                        "name": "Model",
+                        "resource_type": "model",
+                        "resource_subtype": "",
+                        "creator": "Test User",
+                        "upload_date": "2024-01-15T10:30:00Z",
+                        "download_count": 10,
+                        "file": "https://example.com/model.model3",
+                        "thumbnail": None,
+                        "description": "Test model",
+                        "dependencies": [],
+                    },
+                    {
+                        "uuid": "all-style-1",
+                        "name": "Style",
+                        "resource_type": "style",
+                        "resource_subtype": "symbol",
+                        "creator": "Test User",
+                        "upload_date": "2024-01-15T10:30:00Z",
+                        "download_count": 20,
+                        "file": "https://example.com/style.xml",
+                        "thumbnail": None,
+                        "description": "Test style",
+                        "dependencies": [],
+                    },
+                ],
+            }
+        )
         mock_thumbnail.return_value = None
 
         # Create dialog
@@ -440,7 +487,7 @@ class TestResourceTreeFiltering(unittest.TestCase):
 class TestPreviewFunctionality(unittest.TestCase):
     """Tests for resource preview functionality."""
 
-    @patch("qgis_hub_plugin.gui.resource_browser.get_all_resources")
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
     @patch("qgis_hub_plugin.gui.resource_browser.download_resource_thumbnail")
     def test_preview_updates_on_selection(self, mock_thumbnail, mock_api):
         """Test that preview panel updates when a resource is selected."""
@@ -449,26 +496,28 @@ class TestPreviewFunctionality(unittest.TestCase):
         from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
 
         # Mock API response
-        mock_api.return_value = {
-            "total": 1,
-            "count": 1,
-            "next": None,
-            "results": [
-                {
-                    "uuid": "preview-test-1",
-                    "name": "Preview Test Resource",
-                    "resource_type": "model",
-                    "resource_subtype": "",
-                    "creator": "Preview Creator",
-                    "upload_date": "2024-03-15T14:30:00Z",
-                    "download_count": 42,
-                    "file": "https://example.com/preview.model3",
-                    "thumbnail": None,
-                    "description": "This is a test description for preview",
-                    "dependencies": [],
-                }
-            ],
-        }
+        mock_api.return_value = memory_catalog_store(
+            {
+                "total": 1,
+                "count": 1,
+                "next": None,
+                "results": [
+                    {
+                        "uuid": "preview-test-1",
+                        "name": "Preview Test Resource",
+                        "resource_type": "model",
+                        "resource_subtype": "",
+                        "creator": "Preview Creator",
+                        "upload_date": "2024-03-15T14:30:00Z",
+                        "download_count": 42,
+                        "file": "https://example.com/preview.model3",
+                        "thumbnail": None,
+                        "description": "This is a test description for preview",
+                        "dependencies": [],
+                    }
+                ],
+            }
+        )
 
         # Mock thumbnail to return a default path
         mock_thumbnail.return_value = Path("/tmp/default_icon.png")
@@ -489,7 +538,7 @@ class TestPreviewFunctionality(unittest.TestCase):
         description_html = dialog.textBrowserDescription.toPlainText()
         self.assertIn("test description", description_html)
 
-    @patch("qgis_hub_plugin.gui.resource_browser.get_all_resources")
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
     @patch("qgis_hub_plugin.gui.resource_browser.download_resource_thumbnail")
     def test_preview_with_subtype(self, mock_thumbnail, mock_api):
         """Test that preview shows subtype information when available."""
@@ -498,26 +547,28 @@ class TestPreviewFunctionality(unittest.TestCase):
         from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
 
         # Mock API response with subtype
-        mock_api.return_value = {
-            "total": 1,
-            "count": 1,
-            "next": None,
-            "results": [
-                {
-                    "uuid": "subtype-test-1",
-                    "name": "Style with Subtype",
-                    "resource_type": "style",
-                    "resource_subtype": "colorramp",
-                    "creator": "Style Creator",
-                    "upload_date": "2024-03-15T14:30:00Z",
-                    "download_count": 15,
-                    "file": "https://example.com/style.xml",
-                    "thumbnail": None,
-                    "description": "Color ramp style",
-                    "dependencies": [],
-                }
-            ],
-        }
+        mock_api.return_value = memory_catalog_store(
+            {
+                "total": 1,
+                "count": 1,
+                "next": None,
+                "results": [
+                    {
+                        "uuid": "subtype-test-1",
+                        "name": "Style with Subtype",
+                        "resource_type": "style",
+                        "resource_subtype": "colorramp",
+                        "creator": "Style Creator",
+                        "upload_date": "2024-03-15T14:30:00Z",
+                        "download_count": 15,
+                        "file": "https://example.com/style.xml",
+                        "thumbnail": None,
+                        "description": "Color ramp style",
+                        "dependencies": [],
+                    }
+                ],
+            }
+        )
         mock_thumbnail.return_value = Path("/tmp/default_icon.png")
 
         # Create dialog
@@ -531,12 +582,239 @@ class TestPreviewFunctionality(unittest.TestCase):
         self.assertEqual(dialog.labelSubtype.text(), "colorramp")
 
 
+def _refresh_resource(uuid, name, download_count=1):
+    return {
+        "uuid": uuid,
+        "name": name,
+        "resource_type": "model",
+        "resource_subtype": "",
+        "creator": "Refresh Creator",
+        "upload_date": "2024-03-15T14:30:00Z",
+        "download_count": download_count,
+        "file": "https://example.com/refresh.model3",
+        "thumbnail": None,
+        "description": "Refresh test",
+        "dependencies": [],
+    }
+
+
+class TestCatalogRefresh(unittest.TestCase):
+    """Tests for the stale-while-revalidate catalog loading."""
+
+    @staticmethod
+    def _model_names(dialog):
+        return sorted(
+            dialog.resource_model.item(row, 0).name
+            for row in range(dialog.resource_model.rowCount())
+        )
+
+    @patch("qgis_hub_plugin.gui.resource_browser.catalog_is_stale", return_value=True)
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
+    def test_open_shows_cache_then_refreshes(self, mock_api, mock_stale):
+        """Test the cached catalog is shown before the background refresh."""
+        from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
+
+        mock_api.return_value = memory_catalog_store(
+            {"results": [_refresh_resource("a", "Cached")]}
+        )
+
+        dialog = ResourceBrowserDialog()
+
+        mock_api.assert_called_once_with()
+        self.assertEqual(self._model_names(dialog), ["Cached"])
+        ResourceBrowserDialog.start_catalog_refresh.assert_called_with(
+            user_requested=False
+        )
+
+    @patch("qgis_hub_plugin.gui.resource_browser.catalog_is_stale", return_value=False)
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
+    def test_fresh_cache_not_refreshed(self, mock_api, mock_stale):
+        """Test a cached catalog younger than the TTL is used as is."""
+        from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
+
+        mock_api.return_value = memory_catalog_store(
+            {"results": [_refresh_resource("a", "Cached")]}
+        )
+
+        dialog = ResourceBrowserDialog()
+
+        self.assertEqual(self._model_names(dialog), ["Cached"])
+        ResourceBrowserDialog.start_catalog_refresh.assert_not_called()
+
+        # Reloading always refreshes
+        dialog.populate_resources(force_update=True)
+        ResourceBrowserDialog.start_catalog_refresh.assert_called_once_with(
+            user_requested=True
+        )
+
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
+    def test_refresh_applies_only_changes(self, mock_api):
+        """Test added, removed and changed resources are applied in place."""
+        from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
+
+        mock_api.return_value = memory_catalog_store(
+            {
+                "results": [
+                    _refresh_resource("a", "Kept"),
+                    _refresh_resource("b", "Removed"),
+                    _refresh_resource("c", "Changed", download_count=1),
+                ]
+            }
+        )
+        dialog = ResourceBrowserDialog()
+        kept_item = dialog.resource_model.item(0, 0)
+
+        added, removed, changed = dialog.apply_resource_changes(
+            [
+                _refresh_resource("a", "Kept"),
+                _refresh_resource("c", "Changed", download_count=5),
+                _refresh_resource("d", "Added"),
+            ]
+        )
+
+        self.assertEqual((added, removed, changed), (1, 1, 1))
+        self.assertEqual(self._model_names(dialog), ["Added", "Changed", "Kept"])
+        self.assertIs(dialog.resource_model.item(0, 0), kept_item)
+        self.assertEqual(len(dialog.resources), 3)
+
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
+    def test_pages_streamed_into_empty_browser(self, mock_api):
+        """Test pages are shown as they arrive when there is no cache."""
+        from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
+
+        mock_api.return_value = memory_catalog_store(None)
+        dialog = ResourceBrowserDialog()
+
+        dialog.on_catalog_page_received([_refresh_resource("a", "First")])
+        self.assertEqual(self._model_names(dialog), ["First"])
+        dialog.on_catalog_page_received([_refresh_resource("b", "Second")])
+        self.assertEqual(self._model_names(dialog), ["First", "Second"])
+
+        catalog = {
+            "results": [
+                _refresh_resource("a", "First"),
+                _refresh_resource("b", "Second"),
+            ]
+        }
+        # Written to the store by the refresh before it completes
+        mock_api.return_value.replace_all(catalog["results"], "v1")
+        dialog.on_catalog_refreshed(False, catalog)
+        self.assertEqual(dialog.resource_model.rowCount(), 2)
+        self.assertFalse(dialog.streaming_pages)
+
+        # The category tree counts the streamed resources, of a type
+        # registered on the fly
+        all_types_item = dialog.treeWidgetCategories.topLevelItem(0)
+        self.assertEqual(all_types_item.text(0), "All Types (2)")
+        self.assertEqual(
+            [
+                all_types_item.child(i).text(0)
+                for i in range(all_types_item.childCount())
+            ],
+            ["models (2)"],
+        )
+
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
+    def test_pages_not_streamed_over_cache(self, mock_api):
+        """Test a displayed catalog is only updated once the refresh ends."""
+        from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
+
+        mock_api.return_value = memory_catalog_store(
+            {"results": [_refresh_resource("a", "Cached")]}
+        )
+        dialog = ResourceBrowserDialog()
+
+        dialog.on_catalog_page_received([_refresh_resource("b", "New")])
+
+        self.assertEqual(self._model_names(dialog), ["Cached"])
+
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
+    def test_refresh_failure_keeps_cache(self, mock_api):
+        """Test a failed background refresh keeps the cached rows silently."""
+        from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
+
+        mock_api.return_value = memory_catalog_store(
+            {"results": [_refresh_resource("a", "Cached")]}
+        )
+        dialog = ResourceBrowserDialog()
+
+        with patch.object(dialog, "show_error_message") as mock_error:
+            dialog.on_catalog_refresh_failed(False, "Hub unavailable")
+
+        mock_error.assert_not_called()
+        self.assertEqual(self._model_names(dialog), ["Cached"])
+        self.assertTrue(dialog.reloadPushButton.isEnabled())
+
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
+    def test_tree_selection_handled_once(self, mock_api):
+        """Test rebuilding the category tree does not add selection handlers."""
+        from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
+
+        mock_api.return_value = memory_catalog_store(
+            {"results": [_refresh_resource("a", "Cached")]}
+        )
+        dialog = ResourceBrowserDialog()
+        dialog.setup_resource_type_tree()
+        dialog.setup_resource_type_tree()
+        dialog.treeWidgetCategories.clearSelection()
+
+        with patch.object(dialog, "update_resource_filter") as mock_filter:
+            dialog.treeWidgetCategories.setCurrentItem(
+                dialog.treeWidgetCategories.topLevelItem(0)
+            )
+
+        mock_filter.assert_called_once_with()
+
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
+    def test_catalog_store_closed(self, mock_api):
+        """Test the store replaced by a new one, and the store of the closed
+        browser, are closed."""
+        import sqlite3
+
+        from qgis.PyQt.QtGui import QCloseEvent
+
+        from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
+
+        catalog = {"results": [_refresh_resource("a", "Cached")]}
+        first_store = memory_catalog_store(catalog)
+        second_store = memory_catalog_store(catalog)
+        mock_api.side_effect = [first_store, second_store]
+        dialog = ResourceBrowserDialog()
+
+        dialog.populate_resources()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            first_store.count()
+        self.assertEqual(second_store.count(), 1)
+
+        dialog.closeEvent(QCloseEvent())
+        with self.assertRaises(sqlite3.ProgrammingError):
+            second_store.count()
+
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
+    def test_closed_browser_ignores_downloads(self, mock_api):
+        """Test a closed browser no longer handles the shared downloads."""
+        from qgis.PyQt.QtGui import QCloseEvent
+
+        from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
+        from qgis_hub_plugin.utilities.download_manager import download_manager
+
+        mock_api.return_value = memory_catalog_store(None)
+        dialog = ResourceBrowserDialog()
+        job = object()
+        dialog.thumbnail_jobs[job] = "a"
+
+        dialog.closeEvent(QCloseEvent())
+        download_manager.downloadFinished.emit(job)
+
+        self.assertEqual(dialog.thumbnail_jobs, {job: "a"})
+
+
 class TestDownloadFunctionality(unittest.TestCase):
     """Tests for resource download functionality."""
 
     @patch("qgis_hub_plugin.gui.resource_browser.download_file")
     @patch("qgis_hub_plugin.gui.resource_browser.QFileDialog.getSaveFileName")
-    @patch("qgis_hub_plugin.gui.resource_browser.get_all_resources")
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
     @patch("qgis_hub_plugin.gui.resource_browser.download_resource_thumbnail")
     def test_download_resource_opens_file_dialog(
         self, mock_thumbnail, mock_api, mock_get_save_filename, mock_download
@@ -547,26 +825,28 @@ class TestDownloadFunctionality(unittest.TestCase):
         from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
 
         # Mock API response
-        mock_api.return_value = {
-            "total": 1,
-            "count": 1,
-            "next": None,
-            "results": [
-                {
-                    "uuid": "download-test-1",
-                    "name": "Downloadable Resource",
-                    "resource_type": "model",
-                    "resource_subtype": "",
-                    "creator": "Test Creator",
-                    "upload_date": "2024-03-15T14:30:00Z",
-                    "download_count": 10,
-                    "file": "https://example.com/resource.model3",
-                    "thumbnail": None,
-                    "description": "Test resource for download",
-                    "dependencies": [],
-                }
-            ],
-        }
+        mock_api.return_value = memory_catalog_store(
+            {
+                "total": 1,
+                "count": 1,
+                "next": None,
+                "results": [
+                    {
+                        "uuid": "download-test-1",
+                        "name": "Downloadable Resource",
+                        "resource_type": "model",
+                        "resource_subtype": "",
+                        "creator": "Test Creator",
+                        "upload_date": "2024-03-15T14:30:00Z",
+                        "download_count": 10,
+                        "file": "https://example.com/resource.model3",
+                        "thumbnail": None,
+                        "description": "Test resource for download",
+                        "dependencies": [],
+                    }
+                ],
+            }
+        )
         mock_thumbnail.return_value = None
 
         # Mock file dialog to return a path without showing the dialog
@@ -594,7 +874,7 @@ class TestDownloadFunctionality(unittest.TestCase):
         self.assertEqual(call_args[0][1], Path("/tmp/downloaded_resource.model3"))
 
     @patch("qgis_hub_plugin.gui.resource_browser.QFileDialog.getSaveFileName")
-    @patch("qgis_hub_plugin.gui.resource_browser.get_all_resources")
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
     @patch("qgis_hub_plugin.gui.resource_browser.download_resource_thumbnail")
     def test_download_cancelled_by_user(
         self, mock_thumbnail, mock_api, mock_get_save_filename
@@ -603,26 +883,28 @@ class TestDownloadFunctionality(unittest.TestCase):
         from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
 
         # Mock API response
-        mock_api.return_value = {
-            "total": 1,
-            "count": 1,
-            "next": None,
-            "results": [
-                {
-                    "uuid": "cancel-test-1",
-                    "name": "Test Resource",
-                    "resource_type": "model",
-                    "resource_subtype": "",
-                    "creator": "Test Creator",
-                    "upload_date": "2024-03-15T14:30:00Z",
-                    "download_count": 10,
-                    "file": "https://example.com/resource.model3",
-                    "thumbnail": None,
-                    "description": "Test resource",
-                    "dependencies": [],
-                }
-            ],
-        }
+        mock_api.return_value = memory_catalog_store(
+            {
+                "total": 1,
+                "count": 1,
+                "next": None,
+                "results": [
+                    {
+                        "uuid": "cancel-test-1",
+                        "name": "Test Resource",
+                        "resource_type": "model",
+                        "resource_subtype": "",
+                        "creator": "Test Creator",
+                        "upload_date": "2024-03-15T14:30:00Z",
+                        "download_count": 10,
+                        "file": "https://example.com/resource.model3",
+                        "thumbnail": None,
+                        "description": "Test resource",
+                        "dependencies": [],
+                    }
+                ],
+            }
+        )
         mock_thumbnail.return_value = None
 
         # Mock file dialog to return empty (user cancelled) without showing dialog
@@ -644,33 +926,35 @@ class TestDownloadFunctionality(unittest.TestCase):
 class TestViewPersistence(unittest.TestCase):
     """Tests for view state persistence across sessions."""
 
-    @patch("qgis_hub_plugin.gui.resource_browser.get_all_resources")
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
     @patch("qgis_hub_plugin.gui.resource_browser.download_resource_thumbnail")
     def test_view_state_persistence(self, mock_thumbnail, mock_api):
         """Test that view state is saved and restored correctly."""
         from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
 
         # Mock API response
-        mock_api.return_value = {
-            "total": 1,
-            "count": 1,
-            "next": None,
-            "results": [
-                {
-                    "uuid": "test-persist-uuid",
-                    "name": "Test Persist",
-                    "resource_type": "model",
-                    "resource_subtype": "",
-                    "creator": "Test User",
-                    "upload_date": "2024-01-15T10:30:00Z",
-                    "download_count": 10,
-                    "file": "https://example.com/model.model3",
-                    "thumbnail": None,
-                    "description": "Test model",
-                    "dependencies": [],
-                }
-            ],
-        }
+        mock_api.return_value = memory_catalog_store(
+            {
+                "total": 1,
+                "count": 1,
+                "next": None,
+                "results": [
+                    {
+                        "uuid": "test-persist-uuid",
+                        "name": "Test Persist",
+                        "resource_type": "model",
+                        "resource_subtype": "",
+                        "creator": "Test User",
+                        "upload_date": "2024-01-15T10:30:00Z",
+                        "download_count": 10,
+                        "file": "https://example.com/model.model3",
+                        "thumbnail": None,
+                        "description": "Test model",
+                        "dependencies": [],
+                    }
+                ],
+            }
+        )
         mock_thumbnail.return_value = None
 
         # Create dialog and switch to list view
@@ -686,33 +970,35 @@ class TestViewPersistence(unittest.TestCase):
         )
         self.assertEqual(stored_view_index, 1)
 
-    @patch("qgis_hub_plugin.gui.resource_browser.get_all_resources")
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
     @patch("qgis_hub_plugin.gui.resource_browser.download_resource_thumbnail")
     def test_icon_size_persistence(self, mock_thumbnail, mock_api):
         """Test that icon size is saved and restored correctly."""
         from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
 
         # Mock API response
-        mock_api.return_value = {
-            "total": 1,
-            "count": 1,
-            "next": None,
-            "results": [
-                {
-                    "uuid": "test-size-persist-uuid",
-                    "name": "Test Size Persist",
-                    "resource_type": "style",
-                    "resource_subtype": "symbol",
-                    "creator": "Test User",
-                    "upload_date": "2024-01-15T10:30:00Z",
-                    "download_count": 15,
-                    "file": "https://example.com/style.xml",
-                    "thumbnail": None,
-                    "description": "Test style",
-                    "dependencies": [],
-                }
-            ],
-        }
+        mock_api.return_value = memory_catalog_store(
+            {
+                "total": 1,
+                "count": 1,
+                "next": None,
+                "results": [
+                    {
+                        "uuid": "test-size-persist-uuid",
+                        "name": "Test Size Persist",
+                        "resource_type": "style",
+                        "resource_subtype": "symbol",
+                        "creator": "Test User",
+                        "upload_date": "2024-01-15T10:30:00Z",
+                        "download_count": 15,
+                        "file": "https://example.com/style.xml",
+                        "thumbnail": None,
+                        "description": "Test style",
+                        "dependencies": [],
+                    }
+                ],
+            }
+        )
         mock_thumbnail.return_value = None
 
         # Create dialog and set icon size
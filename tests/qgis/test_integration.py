@@ -20,6 +20,8 @@ from unittest.mock import patch
 
 from qgis.testing import start_app
 
+from tests.qgis.utils import memory_catalog_store
+
 # Initialize QGIS application
 start_app()
 
@@ -27,59 +29,61 @@ start_app()
 class TestIntegration(unittest.TestCase):
     """Integration tests for complete workflows."""
 
-    @patch("qgis_hub_plugin.gui.resource_browser.get_all_resources")
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
     @patch("qgis_hub_plugin.gui.resource_browser.download_resource_thumbnail")
     def test_full_resource_load_workflow(self, mock_thumbnail, mock_api):
         """Test complete workflow from API to GUI display."""
         from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
 
         # Mock API response
-        mock_api.return_value = {
-            "total": 3,
-            "count": 3,
-            "next": None,
-            "results": [
-                {
-                    "uuid": "integration-uuid-1",
-                    "name": "Integration Test Model",
-                    "resource_type": "model",
-                    "resource_subtype": "",
-                    "creator": "Test User",
-                    "upload_date": "2024-01-15T10:30:00Z",
-                    "download_count": 10,
-                    "file": "https://example.com/model.model3",
-                    "thumbnail": None,
-                    "description": "Integration test",
-                    "dependencies": [],
-                },
-                {
-                    "uuid": "integration-uuid-2",
-                    "name": "Integration Test Style",
-                    "resource_type": "style",
-                    "resource_subtype": "symbol",
-                    "creator": "Style Creator",
-                    "upload_date": "2024-02-10T14:20:00Z",
-                    "download_count": 25,
-                    "file": "https://example.com/style.xml",
-                    "thumbnail": None,
-                    "description": "Test style",
-                    "dependencies": [],
-                },
-                {
-                    "uuid": "integration-uuid-3",
-                    "name": "Integration Test Script",
-                    "resource_type": "processingscript",
-                    "resource_subtype": "python",
-                    "creator": "Script Author",
-                    "upload_date": "2024-03-05T09:15:00Z",
-                    "download_count": 15,
-                    "file": "https://example.com/script.py",
-                    "thumbnail": None,
-                    "description": "Test script",
-                    "dependencies": ["numpy"],
-                },
-            ],
-        }
+        mock_api.return_value = memory_catalog_store(
+            {
+                "total": 3,
+                "count": 3,
+                "next": None,
+                "results": [
+                    {
+                        "uuid": "integration-uuid-1",
+                        "name": "Integration Test Model",
+                        "resource_type": "model",
+                        "resource_subtype": "",
+                        "creator": "Test User",
+                        "upload_date": "2024-01-15T10:30:00Z",
+                        "download_count": 10,
+                        "file": "https://example.com/model.model3",
+                        "thumbnail": None,
+                        "description": "Integration test",
+                        "dependencies": [],
+                    },
+                    {
+                        "uuid": "integration-uuid-2",
+                        "name": "Integration Test Style",
+                        "resource_type": "style",
+                        "resource_subtype": "symbol",
+                        "creator": "Style Creator",
+                        "upload_date": "2024-02-10T14:20:00Z",
+                        "download_count": 25,
+                        "file": "https://example.com/style.xml",
+                        "thumbnail": None,
+                        "description": "Test style",
+                        "dependencies": [],
+                    },
+                    {
+                        "uuid": "integration-uuid-3",
+                        "name": "Integration Test Script",
+                        "resource_type": "processingscript",
+                        "resource_subtype": "python",
+                        "creator": "Script Author",
+                        "upload_date": "2024-03-05T09:15:00Z",
+                        "download_count": 15,
+                        "file": "https://example.com/script.py",
+                        "thumbnail": None,
+                        "description": "Test script",
+                        "dependencies": ["numpy"],
+                    },
+                ],
+            }
+        )
 
         # Mock thumbnail download
         mock_thumbnail.return_value = None
@@ -107,14 +111,16 @@ class TestIntegration(unittest.TestCase):
         self.assertIn("style", resource_types)
         self.assertIn("processingscript", resource_types)
 
-    @patch("qgis_hub_plugin.gui.resource_browser.get_all_resources")
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
     @patch("qgis_hub_plugin.gui.resource_browser.download_resource_thumbnail")
     def test_resource_browser_with_empty_response(self, mock_thumbnail, mock_api):
         """Test resource browser handles empty API response."""
         from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
 
         # Mock empty API response
-        mock_api.return_value = {"total": 0, "count": 0, "next": None, "results": []}
+        mock_api.return_value = memory_catalog_store(
+            {"total": 0, "count": 0, "next": None, "results": []}
+        )
 
         mock_thumbnail.return_value = None
 
@@ -124,36 +130,38 @@ class TestIntegration(unittest.TestCase):
         # Verify model is empty
         self.assertEqual(dialog.resource_model.rowCount(), 0)
 
-    @patch("qgis_hub_plugin.gui.resource_browser.get_all_resources")
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
     @patch("qgis_hub_plugin.gui.resource_browser.download_resource_thumbnail")
     def test_resource_filtering_integration(self, mock_thumbnail, mock_api):
         """Test that filtering works with loaded resources."""
         from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
 
         # Mock API with multiple resource types
-        mock_api.return_value = {
-            "total": 4,
-            "count": 4,
-            "next": None,
-            "results": [
-                {
-                    "uuid": f"filter-test-{i}",
-                    "name": f"Resource {i}",
-                    "resource_type": resource_type,
-                    "resource_subtype": "",
-                    "creator": "Test Creator",
-                    "upload_date": "2024-01-01T00:00:00Z",
-                    "download_count": i * 10,
-                    "file": f"https://example.com/file{i}",
-                    "thumbnail": None,
-                    "description": f"Resource {i}",
-                    "dependencies": [],
-                }
-                for i, resource_type in enumerate(
-                    ["model", "model", "style", "processingscript"]
-                )
-            ],
-        }
+        mock_api.return_value = memory_catalog_store(
+            {
+                "total": 4,
+                "count": 4,
+                "next": None,
+                "results": [
+                    {
+                        "uuid": f"filter-test-{i}",
+                        "name": f"Resource {i}",
+                        "resource_type": resource_type,
+                        "resource_subtype": "",
+                        "creator": "Test Creator",
+                        "upload_date": "2024-01-01T00:00:00Z",
+                        "download_count": i * 10,
+                        "file": f"https://example.com/file{i}",
+                        "thumbnail": None,
+                        "description": f"Resource {i}",
+                        "dependencies": [],
+                    }
+                    for i, resource_type in enumerate(
+                        ["model", "model", "style", "processingscript"]
+                    )
+                ],
+            }
+        )
 
         mock_thumbnail.return_value = None
 
@@ -172,13 +180,13 @@ class TestIntegration(unittest.TestCase):
         # Verify only 2 models are shown
         self.assertEqual(dialog.proxy_model.rowCount(), 2)
 
-    @patch("qgis_hub_plugin.gui.resource_browser.get_all_resources")
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
     def test_resource_browser_handles_api_failure(self, mock_api):
         """Test that resource browser handles API failure gracefully."""
         from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
 
         # Mock API failure (returns None)
-        mock_api.return_value = None
+        mock_api.return_value = memory_catalog_store(None)
 
         # Create dialog - should not crash
         try:
@@ -188,33 +196,35 @@ class TestIntegration(unittest.TestCase):
         except Exception as e:
             self.fail(f"Dialog creation failed with API error: {e}")
 
-    @patch("qgis_hub_plugin.gui.resource_browser.get_all_resources")
+    @patch("qgis_hub_plugin.gui.resource_browser.get_catalog_store")
     @patch("qgis_hub_plugin.gui.resource_browser.download_resource_thumbnail")
     def test_resource_with_dependencies(self, mock_thumbnail, mock_api):
         """Test that resources with dependencies are loaded correctly."""
         from qgis_hub_plugin.gui.resource_browser import ResourceBrowserDialog
 
         # Mock resource with dependencies
-        mock_api.return_value = {
-            "total": 1,
-            "count": 1,
-            "next": None,
-            "results": [
-                {
-                    "uuid": "deps-test-uuid",
-                    "name": "Script with Dependencies",
-                    "resource_type": "processingscript",
-                    "resource_subtype": "python",
-                    "creator": "Developer",
-                    "upload_date": "2024-01-01T00:00:00Z",
-                    "download_count": 5,
-                    "file": "https://example.com/script.py",
-                    "thumbnail": None,
-                    "description": "Script needing libraries",
-                    "dependencies": ["numpy", "pandas", "geopandas"],
-                }
-            ],
-        }
+        mock_api.return_value = memory_catalog_store(
+            {
+                "total": 1,
+                "count": 1,
+                "next": None,
+                "results": [
+                    {
+                        "uuid": "deps-test-uuid",
+                        "name": "Script with Dependencies",
+                        "resource_type": "processingscript",
+                        "resource_subtype": "python",
+                        "creator": "Developer",
+                        "upload_date": "2024-01-01T00:00:00Z",
+                        "download_count": 5,
+                        "file": "https://example.com/script.py",
+                        "thumbnail": None,
+                        "description": "Script needing libraries",
+                        "dependencies": ["numpy", "pandas", "geopandas"],
+                    }
+                ],
+            }
+        )
 
         mock_thumbnail.return_value = None
 
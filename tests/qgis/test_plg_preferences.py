@@ -37,6 +37,15 @@ class TestPlgPreferences(unittest.TestCase):
         self.assertIsInstance(settings.version, str)
         self.assertEqual(settings.version, __version__)
 
+        # catalog
+        self.assertIsInstance(settings.catalog_ttl, int)
+        self.assertGreater(settings.catalog_ttl, 0)
+        self.assertIsInstance(settings.refresh_interval, int)
+        self.assertGreater(settings.refresh_interval, 0)
+        self.assertIsInstance(settings.hub_mirrors, str)
+        self.assertIsInstance(settings.prefetch_on_startup, bool)
+        self.assertFalse(settings.prefetch_on_startup)
+
 
 # ############################################################################
 # ####### Stand-alone run ########
@@ -0,0 +1,139 @@
+#! python3  # noqa E265
+
+"""
+Unit tests for the background catalog refresh scheduler.
+
+Usage from the repo root folder:
+
+    .. code-block:: bash
+        # for whole test module
+        pytest tests/qgis/test_refresh_scheduler.py -v
+"""
+
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+
+from qgis.testing import start_app
+
+from qgis_hub_plugin.toolbelt.preferences import PlgSettingsStructure
+
+start_app()
+
+
+class TestCatalogRefreshScheduler(unittest.TestCase):
+    """Test CatalogRefreshScheduler without waiting for its timer."""
+
+    def setUp(self):
+        self.settings = PlgSettingsStructure(catalog_ttl=30, refresh_interval=60)
+        patcher = patch(
+            "qgis_hub_plugin.core.refresh_scheduler.PlgOptionsManager"
+            ".get_plg_settings",
+            return_value=self.settings,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_jittered_interval(self):
+        from qgis_hub_plugin.core.refresh_scheduler import (
+            REFRESH_JITTER,
+            jittered_interval,
+        )
+
+        delays = {jittered_interval(60) for _ in range(50)}
+
+        self.assertGreater(len(delays), 1)
+        for delay in delays:
+            self.assertGreaterEqual(delay, 60 * 60000 * (1 - REFRESH_JITTER))
+            self.assertLessEqual(delay, 60 * 60000 * (1 + REFRESH_JITTER))
+
+    def test_start_disabled(self):
+        from qgis_hub_plugin.core.refresh_scheduler import CatalogRefreshScheduler
+
+        scheduler = CatalogRefreshScheduler()
+        self.settings.refresh_interval = 0
+        scheduler.start()
+
+        self.assertFalse(scheduler.timer.isActive())
+
+    def test_apply_settings(self):
+        from qgis_hub_plugin.core.refresh_scheduler import CatalogRefreshScheduler
+
+        scheduler = CatalogRefreshScheduler()
+        self.settings.refresh_interval = 0
+        scheduler.start()
+
+        # Enabled again without restarting QGIS
+        self.settings.refresh_interval = 30
+        scheduler.apply_settings()
+        self.assertTrue(scheduler.timer.isActive())
+        self.assertLessEqual(scheduler.timer.interval(), 30 * 60000 * 1.2)
+
+        # An unchanged interval keeps the scheduled check
+        with patch.object(scheduler.timer, "start") as mock_start:
+            scheduler.apply_settings()
+        mock_start.assert_not_called()
+
+        self.settings.refresh_interval = 0
+        scheduler.apply_settings()
+        self.assertFalse(scheduler.timer.isActive())
+
+    @patch("qgis_hub_plugin.core.refresh_scheduler.QgsApplication")
+    @patch("qgis_hub_plugin.core.refresh_scheduler.catalog_is_stale")
+    def test_check_refreshes_stale_catalog(self, mock_stale, mock_qgs_app):
+        from qgis_hub_plugin.core.refresh_scheduler import CatalogRefreshScheduler
+
+        mock_stale.return_value = True
+        scheduler = CatalogRefreshScheduler()
+        scheduler.check()
+
+        mock_stale.assert_called_once_with(timedelta(minutes=30))
+        mock_qgs_app.taskManager.return_value.addTask.assert_called_once_with(
+            scheduler.task
+        )
+        self.assertTrue(scheduler.timer.isActive())
+
+        # No second refresh while the first one runs
+        scheduler.check()
+        mock_qgs_app.taskManager.return_value.addTask.assert_called_once()
+        scheduler.task.catalogRefreshed.emit({})
+        self.assertIsNone(scheduler.task)
+        scheduler.stop()
+
+    @patch("qgis_hub_plugin.core.refresh_scheduler.QgsApplication")
+    @patch("qgis_hub_plugin.core.refresh_scheduler.catalog_is_stale")
+    def test_check_keeps_fresh_catalog(self, mock_stale, mock_qgs_app):
+        from qgis_hub_plugin.core.refresh_scheduler import CatalogRefreshScheduler
+
+        mock_stale.return_value = False
+        scheduler = CatalogRefreshScheduler()
+        scheduler.check()
+
+        mock_qgs_app.taskManager.return_value.addTask.assert_not_called()
+        self.assertTrue(scheduler.timer.isActive())
+        scheduler.stop()
+
+    @patch("qgis_hub_plugin.core.refresh_scheduler.QgsApplication")
+    def test_prefetch_opt_in(self, mock_qgs_app):
+        from qgis_hub_plugin.core.refresh_scheduler import (
+            PREFETCH_PRIORITY,
+            CatalogRefreshScheduler,
+        )
+
+        scheduler = CatalogRefreshScheduler()
+        scheduler.prefetch()
+        mock_qgs_app.taskManager.return_value.addTask.assert_not_called()
+
+        self.settings.prefetch_on_startup = True
+        scheduler.prefetch()
+
+        mock_qgs_app.taskManager.return_value.addTask.assert_called_once_with(
+            scheduler.task, PREFETCH_PRIORITY
+        )
+        self.assertEqual(scheduler.task.ttl, timedelta(minutes=30))
+        scheduler.task.refreshFailed.emit("Hub unavailable")
+        self.assertIsNone(scheduler.task)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -189,6 +189,32 @@ class TestResourceItem(unittest.TestCase):
         self.assertIn("numpy", item.dependencies)
         self.assertIn("pandas", item.dependencies)
 
+    @patch("qgis_hub_plugin.gui.resource_item.download_resource_thumbnail")
+    @patch("qgis_hub_plugin.gui.resource_item.get_icon")
+    def test_details_loaded_on_demand(self, mock_get_icon, mock_download_thumb):
+        """Test the description and dependencies are only read when used."""
+        from qgis_hub_plugin.core.catalog_snapshot import list_record
+        from qgis_hub_plugin.gui.resource_item import ResourceItem
+
+        mock_download_thumb.return_value = None
+        mock_get_icon.return_value = QIcon()
+        self.sample_resource["dependencies"] = ["numpy"]
+        load_details = MagicMock(return_value=self.sample_resource)
+
+        item = ResourceItem(list_record(self.sample_resource), load_details)
+
+        load_details.assert_not_called()
+        self.assertEqual(item.description, "Test description")
+        self.assertEqual(item.dependencies, ["numpy"])
+        self.assertEqual(item.dependencies, ["numpy"])
+        load_details.assert_called_once_with("test-uuid-123")
+
+        # Loaded again once forgotten
+        self.sample_resource["description"] = "New description"
+        item.forget_details()
+        self.assertEqual(item.description, "New description")
+        self.assertEqual(load_details.call_count, 2)
+
     @patch("qgis_hub_plugin.gui.resource_item.download_resource_thumbnail")
     @patch("qgis_hub_plugin.gui.resource_item.get_icon")
     def test_resource_with_whitespace_in_name(self, mock_get_icon, mock_download_thumb):
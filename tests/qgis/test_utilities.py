@@ -15,6 +15,9 @@ Usage from the repo root folder:
         pytest tests/qgis/test_utilities.py::TestDownloadUtilities::test_download_file_success -v
 """
 
+import io
+import os
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -23,13 +26,33 @@ import pytest
 from qgis.PyQt.QtNetwork import QNetworkReply
 
 
+def _set_body(reply: MagicMock, data: bytes):
+    """Make a mocked reply return *data* when read in chunks."""
+    body = io.BytesIO(data)
+    reply.bytesAvailable.side_effect = lambda: len(data) - body.tell()
+    reply.read.side_effect = body.read
+
+
 class TestDownloadUtilities(unittest.TestCase):
     """Test download-related utility functions."""
 
+    def setUp(self):
+        from qgis_hub_plugin.utilities.retry import RetryPolicy, circuit_breaker
+
+        patcher = patch(
+            "qgis_hub_plugin.utilities.common.retry_policy",
+            RetryPolicy(base_delay=0.0),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        circuit_breaker.reset()
+        self.addCleanup(circuit_breaker.reset)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
     @patch("qgis_hub_plugin.utilities.common.QgsNetworkAccessManager")
-    @patch("qgis_hub_plugin.utilities.common.QFile")
     @patch("qgis_hub_plugin.utilities.common.QgsApplication")
-    def test_download_file_success(self, mock_qgs_app, mock_qfile, mock_nam):
+    def test_download_file_success(self, mock_qgs_app, mock_nam):
         """Test successful file download."""
         from qgis_hub_plugin.utilities.common import download_file
 
@@ -37,32 +60,58 @@ class TestDownloadUtilities(unittest.TestCase):
         mock_reply = MagicMock()
         mock_reply.error.return_value = QNetworkReply.NetworkError.NoError
         mock_reply.isFinished.return_value = True
-        mock_reply.readAll.return_value = b"file content data"
+        _set_body(mock_reply, b"file content data")
 
         mock_nam_instance = MagicMock()
         mock_nam_instance.get.return_value = mock_reply
         mock_nam.instance.return_value = mock_nam_instance
 
-        # Setup mock file
-        mock_file_instance = MagicMock()
-        mock_file_instance.open.return_value = True
-        mock_qfile.return_value = mock_file_instance
-
         # Test download
-        destination = Path("/tmp/test_file.txt")
+        destination = Path(self.tmp_dir.name, "test_file.txt")
         result = download_file("https://example.com/file.txt", destination)
 
         # Verify network request was made
         mock_nam_instance.get.assert_called_once()
 
-        # Verify file was written
-        mock_file_instance.open.assert_called_once()
-        mock_file_instance.write.assert_called_once_with(b"file content data")
-        mock_file_instance.close.assert_called_once()
+        # Verify file was written through a part file
+        self.assertEqual(destination.read_bytes(), b"file content data")
+        self.assertEqual(os.listdir(self.tmp_dir.name), ["test_file.txt"])
 
         # Verify result
         self.assertEqual(result, destination)
 
+    @patch("qgis_hub_plugin.utilities.common.QgsNetworkAccessManager")
+    @patch("qgis_hub_plugin.utilities.common.QgsApplication")
+    def test_download_file_records_metrics(self, mock_qgs_app, mock_nam):
+        """Test every download is recorded in the transfer metrics."""
+        from qgis_hub_plugin.utilities.common import download_file
+        from qgis_hub_plugin.utilities.metrics import (
+            OUTCOME_LOCAL,
+            OUTCOME_NETWORK,
+            MetricsRegistry,
+        )
+
+        mock_reply = MagicMock()
+        mock_reply.error.return_value = QNetworkReply.NetworkError.NoError
+        mock_reply.isFinished.return_value = True
+        _set_body(mock_reply, b"file content data")
+        mock_reply.attribute.return_value = None
+        mock_nam.instance.return_value.get.return_value = mock_reply
+        registry = MetricsRegistry()
+
+        with patch("qgis_hub_plugin.utilities.common.transfer_metrics", registry):
+            destination = Path(self.tmp_dir.name, "file.txt")
+            download_file("https://example.com/file.txt", destination)
+            download_file("https://example.com/file.txt", destination, False)
+
+        network, local = registry.records()
+        self.assertEqual(network.outcome, OUTCOME_NETWORK)
+        self.assertEqual(network.host, "example.com")
+        self.assertEqual(network.bytes_received, len(b"file content data"))
+        self.assertGreaterEqual(network.duration, 0)
+        self.assertEqual(local.outcome, OUTCOME_LOCAL)
+        self.assertEqual(local.bytes_received, 0)
+
     @patch("qgis_hub_plugin.utilities.common.QgsNetworkAccessManager")
     @patch("qgis_hub_plugin.utilities.common.QgsApplication")
     def test_download_file_404_error(self, mock_qgs_app, mock_nam):
@@ -82,7 +131,9 @@ class TestDownloadUtilities(unittest.TestCase):
 
         # Test download with 404
         with self.assertRaises(DownloadError) as context:
-            download_file("https://example.com/missing.txt", Path("/tmp/file.txt"))
+            download_file(
+                "https://example.com/missing.txt", Path(self.tmp_dir.name, "file.txt")
+            )
 
         # Verify error message contains 404
         self.assertIn("404", str(context.exception))
@@ -106,16 +157,72 @@ class TestDownloadUtilities(unittest.TestCase):
 
         # Test download with error
         with self.assertRaises(DownloadError) as context:
-            download_file("https://example.com/file.txt", Path("/tmp/file.txt"))
+            download_file(
+                "https://example.com/file.txt", Path(self.tmp_dir.name, "file.txt")
+            )
 
         # Verify error message
         self.assertIn("Download failed", str(context.exception))
         self.assertIn("Network timeout", str(context.exception))
 
     @patch("qgis_hub_plugin.utilities.common.QgsNetworkAccessManager")
-    @patch("qgis_hub_plugin.utilities.common.QFile")
     @patch("qgis_hub_plugin.utilities.common.QgsApplication")
-    def test_download_file_write_error(self, mock_qgs_app, mock_qfile, mock_nam):
+    def test_download_file_retries_transient_failure(self, mock_qgs_app, mock_nam):
+        """Test a timed out download is retried."""
+        from qgis_hub_plugin.utilities.common import download_file
+
+        timeout_reply = MagicMock()
+        timeout_reply.error.return_value = QNetworkReply.NetworkError.TimeoutError
+        timeout_reply.isFinished.return_value = True
+        mock_reply = MagicMock()
+        mock_reply.error.return_value = QNetworkReply.NetworkError.NoError
+        mock_reply.isFinished.return_value = True
+        _set_body(mock_reply, b"data")
+
+        mock_nam_instance = MagicMock()
+        mock_nam_instance.get.side_effect = [timeout_reply, mock_reply]
+        mock_nam.instance.return_value = mock_nam_instance
+
+        destination = Path(self.tmp_dir.name, "test_file.txt")
+        result = download_file("https://example.com/file.txt", destination)
+
+        self.assertEqual(result, destination)
+        self.assertEqual(destination.read_bytes(), b"data")
+        self.assertEqual(mock_nam_instance.get.call_count, 2)
+
+    @patch("qgis_hub_plugin.utilities.common.QgsNetworkAccessManager")
+    @patch("qgis_hub_plugin.utilities.common.QgsApplication")
+    def test_download_file_circuit_open(self, mock_qgs_app, mock_nam):
+        """Test downloads fail fast once the host kept failing."""
+        from qgis_hub_plugin.utilities.common import download_file
+        from qgis_hub_plugin.utilities.exception import DownloadError
+
+        mock_reply = MagicMock()
+        mock_reply.error.return_value = QNetworkReply.NetworkError.TimeoutError
+        mock_reply.isFinished.return_value = True
+        mock_nam_instance = MagicMock()
+        mock_nam_instance.get.return_value = mock_reply
+        mock_nam.instance.return_value = mock_nam_instance
+
+        for _ in range(2):
+            with self.assertRaises(DownloadError):
+                download_file(
+                    "https://example.com/file.txt", Path(self.tmp_dir.name, "file.txt")
+                )
+        requests_sent = mock_nam_instance.get.call_count
+
+        with self.assertRaises(DownloadError) as context:
+            download_file(
+                "https://example.com/file.txt", Path(self.tmp_dir.name, "file.txt")
+            )
+
+        self.assertIn("unavailable", str(context.exception))
+        self.assertEqual(mock_nam_instance.get.call_count, requests_sent)
+
+    @patch("qgis_hub_plugin.utilities.common.QgsNetworkAccessManager")
+    @patch("qgis_hub_plugin.utilities.common.open", create=True)
+    @patch("qgis_hub_plugin.utilities.common.QgsApplication")
+    def test_download_file_write_error(self, mock_qgs_app, mock_open, mock_nam):
         """Test file write error handling."""
         from qgis_hub_plugin.utilities.common import download_file
         from qgis_hub_plugin.utilities.exception import DownloadError
@@ -124,26 +231,138 @@ class TestDownloadUtilities(unittest.TestCase):
         mock_reply = MagicMock()
         mock_reply.error.return_value = QNetworkReply.NetworkError.NoError
         mock_reply.isFinished.return_value = True
-        mock_reply.readAll.return_value = b"data"
+        _set_body(mock_reply, b"data")
 
         mock_nam_instance = MagicMock()
         mock_nam_instance.get.return_value = mock_reply
         mock_nam.instance.return_value = mock_nam_instance
 
-        # Setup mock file that fails to open
-        mock_file_instance = MagicMock()
-        mock_file_instance.open.return_value = False
-        mock_file_instance.errorString.return_value = "Permission denied"
-        mock_qfile.return_value = mock_file_instance
+        # Setup a part file that fails to open
+        mock_open.side_effect = PermissionError(13, "Permission denied")
 
         # Test download with write error
         with self.assertRaises(DownloadError) as context:
-            download_file("https://example.com/file.txt", Path("/tmp/file.txt"))
+            download_file(
+                "https://example.com/file.txt", Path(self.tmp_dir.name, "file.txt")
+            )
 
         # Verify error message
         self.assertIn("Failed to open file", str(context.exception))
         self.assertIn("Permission denied", str(context.exception))
 
+    @patch("qgis_hub_plugin.utilities.common.QgsNetworkAccessManager")
+    @patch("qgis_hub_plugin.utilities.common.wait_for_replies")
+    @patch("qgis_hub_plugin.utilities.common.download_flights")
+    def test_download_file_coalesces_identical_requests(
+        self, mock_flights, mock_wait, mock_nam
+    ):
+        """Test a download re-entered from the event loop shares the reply."""
+        from qgis_hub_plugin.utilities.common import download_file
+        from qgis_hub_plugin.utilities.metrics import OUTCOME_COALESCED
+        from qgis_hub_plugin.utilities.single_flight import SingleFlight
+
+        flights = SingleFlight()
+        mock_flights.join.side_effect = flights.join
+        mock_flights.land.side_effect = flights.land
+        mock_reply = MagicMock()
+        mock_reply.error.return_value = QNetworkReply.NetworkError.NoError
+        mock_reply.isFinished.return_value = False
+        _set_body(mock_reply, b"data")
+        mock_nam.instance.return_value.get.return_value = mock_reply
+        destination = Path(self.tmp_dir.name, "test_file.txt")
+        nested_results = []
+
+        def process_events(replies, timeout):
+            # Another dialog asks for the same file while the first waits
+            mock_wait.side_effect = None
+            mock_reply.isFinished.return_value = True
+            nested_results.append(
+                download_file("https://example.com/file.txt", destination)
+            )
+
+        mock_wait.side_effect = process_events
+
+        with patch(
+            "qgis_hub_plugin.utilities.common.record_reply", return_value=False
+        ) as mock_record_reply, patch(
+            "qgis_hub_plugin.utilities.common.record_metrics"
+        ) as mock_metrics:
+            result = download_file("https://example.com/file.txt", destination)
+
+        self.assertEqual(result, destination)
+        self.assertEqual(nested_results, [destination])
+        mock_nam.instance.return_value.get.assert_called_once()
+        self.assertEqual(destination.read_bytes(), b"data")
+        self.assertEqual((flights.started, flights.coalesced), (1, 1))
+        # The outcome is recorded once, by the caller who started the request,
+        # although the nested caller completed it
+        mock_record_reply.assert_called_once_with(
+            mock_reply, "https://example.com/file.txt"
+        )
+        self.assertEqual(
+            [c[1].get("outcome") for c in mock_metrics.call_args_list],
+            [OUTCOME_COALESCED, None],
+        )
+        self.assertIs(mock_metrics.call_args_list[1][0][1], mock_reply)
+
+    def test_build_network_request_allows_http2(self):
+        """Test requests opt into HTTP/2 and leave compression to Qt."""
+        from qgis.PyQt.QtNetwork import QNetworkRequest
+
+        from qgis_hub_plugin.utilities.common import build_network_request
+
+        request = build_network_request("https://hub.qgis.org/api/v1/resources/")
+
+        self.assertTrue(
+            request.attribute(QNetworkRequest.Attribute.Http2AllowedAttribute)
+        )
+        # Setting it by hand would disable the automatic decompression
+        self.assertFalse(request.hasRawHeader(b"Accept-Encoding"))
+
+    @patch("qgis_hub_plugin.utilities.common.QgsNetworkAccessManager")
+    @patch("qgis_hub_plugin.utilities.common.QgsApplication")
+    @patch("qgis_hub_plugin.utilities.common._HTTP1_ONLY_HOSTS", new_callable=set)
+    def test_download_file_http2_fallback(self, http1_hosts, mock_qgs_app, mock_nam):
+        """Test a request failing over HTTP/2 is sent again over HTTP/1.1."""
+        from qgis.PyQt.QtNetwork import QNetworkRequest
+
+        from qgis_hub_plugin.utilities.common import download_file
+
+        http2_reply = MagicMock()
+        http2_reply.error.return_value = QNetworkReply.NetworkError.ProtocolFailure
+        http2_reply.isFinished.return_value = True
+        http2_reply.request.return_value.attribute.return_value = True
+        http1_reply = MagicMock()
+        http1_reply.error.return_value = QNetworkReply.NetworkError.NoError
+        http1_reply.isFinished.return_value = True
+        _set_body(http1_reply, b"data")
+
+        mock_nam_instance = MagicMock()
+        mock_nam_instance.get.side_effect = [http2_reply, http1_reply]
+        mock_nam.instance.return_value = mock_nam_instance
+
+        destination = Path(self.tmp_dir.name, "test_file.txt")
+        result = download_file("https://example.com/file.txt", destination)
+
+        self.assertEqual(result, destination)
+        self.assertEqual(http1_hosts, {"example.com"})
+        retried = mock_nam_instance.get.call_args_list[1][0][0]
+        self.assertFalse(
+            retried.attribute(QNetworkRequest.Attribute.Http2AllowedAttribute)
+        )
+
+    @patch("qgis_hub_plugin.utilities.common._HTTP1_ONLY_HOSTS", new_callable=set)
+    def test_http2_kept_after_network_error(self, http1_hosts):
+        """Test only a protocol error turns HTTP/2 off for a host."""
+        from qgis_hub_plugin.utilities.common import retry_without_http2
+
+        reply = MagicMock()
+        reply.error.return_value = QNetworkReply.NetworkError.UnknownNetworkError
+        reply.request.return_value.attribute.return_value = True
+
+        self.assertFalse(retry_without_http2(reply, "https://example.com/file"))
+        self.assertEqual(http1_hosts, set())
+
     @patch("qgis_hub_plugin.utilities.common.download_file")
     @patch("pathlib.Path.exists")
     def test_download_file_skip_if_exists(self, mock_exists, mock_download):
@@ -533,6 +752,76 @@ class TestClearCache(unittest.TestCase):
             self.assertTrue(response_removed)
             self.assertEqual(n, 0)
 
+    def test_clear_cache_removes_validators(self):
+        import tempfile
+
+        from qgis_hub_plugin.utilities import common
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = Path(tmpdir)
+            (base / "response.json").write_text("{}")
+            (base / "response.validators.json").write_text("{}")
+
+            with patch.object(common, "QGIS_HUB_DIR", base):
+                common.clear_cache()
+
+            self.assertFalse((base / "response.validators.json").exists())
+
+    def test_clear_cache_removes_compressed_response(self):
+        import tempfile
+
+        from qgis_hub_plugin.utilities import common
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = Path(tmpdir)
+            (base / "response.json.gz").write_bytes(b"x")
+
+            with patch.object(common, "QGIS_HUB_DIR", base):
+                response_removed, _ = common.clear_cache()
+
+            self.assertTrue(response_removed)
+            self.assertFalse((base / "response.json.gz").exists())
+
+    def test_clear_cache_removes_offline_files(self):
+        import tempfile
+
+        from qgis_hub_plugin.utilities import common
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = Path(tmpdir)
+            with patch.object(common, "QGIS_HUB_DIR", base):
+                offline_file = common.offline_file_path("https://hub/files/a.zip")
+                offline_file.parent.mkdir(parents=True)
+                offline_file.write_bytes(b"x")
+
+                common.clear_cache()
+
+            self.assertFalse((base / "offline").exists())
+
+    def test_clear_cache_removes_catalog_store(self):
+        import tempfile
+
+        from qgis_hub_plugin.utilities import common
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            base = Path(tmpdir)
+            store_files = [
+                base / name
+                for name in (
+                    "catalog.sqlite",
+                    "catalog.sqlite-wal",
+                    "catalog.sqlite-shm",
+                    "catalog.snapshot",
+                )
+            ]
+            for store_file in store_files:
+                store_file.write_bytes(b"x")
+
+            with patch.object(common, "QGIS_HUB_DIR", base):
+                common.clear_cache()
+
+            self.assertEqual([f for f in store_files if f.exists()], [])
+
 
 class TestConvertThumbnailToPng(unittest.TestCase):
     """Test _convert_thumbnail_to_png Pillow fallback."""
@@ -0,0 +1,17 @@
+#! python3  # noqa E265
+
+"""
+Helpers shared by the tests depending on QGIS.
+"""
+
+from typing import Optional
+
+from qgis_hub_plugin.core.catalog_store import CatalogStore
+
+
+def memory_catalog_store(catalog: Optional[dict]) -> CatalogStore:
+    """Return an in-memory catalog store holding the resources of an API
+    response, to stand in for the store the resource browser opens."""
+    store = CatalogStore(":memory:")
+    store.replace_all((catalog or {}).get("results", []))
+    return store
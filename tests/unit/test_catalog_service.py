@@ -0,0 +1,72 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.unit.test_catalog_service
+"""
+
+# standard library
+import unittest
+from unittest.mock import MagicMock
+
+# project
+from qgis_hub_plugin.core.catalog_service import CatalogService
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestCatalogService(unittest.TestCase):
+    """Test the process-wide catalog cache"""
+
+    def setUp(self):
+        self.service = CatalogService()
+
+    def test_value_reused_while_version_unchanged(self):
+        load = MagicMock(side_effect=[{"results": []}, {"results": [1]}])
+
+        first = self.service.get("response", "v1", load)
+        second = self.service.get("response", "v1", load)
+
+        self.assertIs(first, second)
+        load.assert_called_once()
+        self.assertEqual((self.service.hits, self.service.misses), (1, 1))
+
+    def test_value_reloaded_when_version_changes(self):
+        self.service.get("response", "v1", lambda: "old")
+        self.assertEqual(self.service.get("response", "v2", lambda: "new"), "new")
+        self.assertEqual(self.service.get("response", "v2", lambda: "other"), "new")
+
+    def test_nothing_cached_without_version(self):
+        load = MagicMock(return_value="value")
+
+        self.service.get("response", "", load)
+        self.service.get("response", None, load)
+
+        self.assertEqual(load.call_count, 2)
+
+    def test_put_and_invalidate(self):
+        self.service.put("response", "v1", "written")
+        self.assertEqual(self.service.get("response", "v1", lambda: "read"), "written")
+
+        self.service.invalidate("response")
+        self.assertEqual(self.service.get("response", "v1", lambda: "read"), "read")
+
+        self.service.invalidate()
+        self.assertEqual(self.service.get("response", "v1", lambda: "again"), "again")
+
+    def test_failed_load_not_cached(self):
+        with self.assertRaises(ValueError):
+            self.service.get("response", "v1", MagicMock(side_effect=ValueError))
+        self.assertEqual(self.service.get("response", "v1", lambda: "value"), "value")
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.unit.test_catalog_snapshot
+"""
+
+# standard library
+import tempfile
+import unittest
+from pathlib import Path
+
+# project
+from qgis_hub_plugin.core.catalog_snapshot import (
+    list_record,
+    load_snapshot,
+    write_snapshot,
+)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestCatalogSnapshot(unittest.TestCase):
+    """Test the compact catalog snapshot"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.snapshot_file = Path(self.tmp_dir.name, "catalog.snapshot")
+        self.resources = [
+            {
+                "uuid": "a",
+                "name": "Style",
+                "creator": "Alice",
+                "resource_type": "style",
+                "resource_subtypes": ["symbol", "label"],
+                "download_count": 3,
+                "upload_date": "2024-01-15T10:30:00Z",
+                "thumbnail": None,
+                "dependencies": [],
+                "description": "<p>A long description</p>",
+            },
+            {
+                "uuid": "b",
+                "name": "Model",
+                "creator": "Bob",
+                "resource_type": "model",
+                "resource_subtype": "",
+                "upload_date": "2024-01-16T10:30:00Z",
+            },
+        ]
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_list_record_drops_descriptions(self):
+        record = list_record(self.resources[0])
+        self.assertNotIn("description", record)
+        self.assertEqual(record["resource_subtypes"], ["symbol", "label"])
+        self.assertIsNone(record["thumbnail"])
+
+    def test_round_trip(self):
+        write_snapshot(self.snapshot_file, self.resources, "v1")
+
+        self.assertEqual(
+            load_snapshot(self.snapshot_file, "v1"),
+            [list_record(resource) for resource in self.resources],
+        )
+
+    def test_empty_catalog(self):
+        write_snapshot(self.snapshot_file, [], "v1")
+        self.assertEqual(load_snapshot(self.snapshot_file, "v1"), [])
+
+    def test_outdated_snapshot(self):
+        write_snapshot(self.snapshot_file, self.resources, "v1")
+        self.assertIsNone(load_snapshot(self.snapshot_file, "v2"))
+
+    def test_unreadable_snapshot(self):
+        self.assertIsNone(load_snapshot(self.snapshot_file, "v1"))
+        self.snapshot_file.write_bytes(b"not a snapshot")
+        self.assertIsNone(load_snapshot(self.snapshot_file, "v1"))
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.unit.test_download_queue
+"""
+
+# standard library
+import unittest
+from pathlib import Path
+
+# project
+from qgis_hub_plugin.utilities.download_queue import (
+    CANCELED,
+    DONE,
+    FAILED,
+    QUEUED,
+    RUNNING,
+    DownloadJob,
+    DownloadQueue,
+)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+def _job(host="hub.qgis.org", name="file", priority=0):
+    return DownloadJob(
+        f"https://{host}/{name}", Path("/tmp", host, name), priority=priority
+    )
+
+
+class TestDownloadQueue(unittest.TestCase):
+    """Test the scheduling of the queued downloads"""
+
+    def setUp(self):
+        self.queue = DownloadQueue(max_active=3, max_per_host=2)
+
+    def test_limits(self):
+        hub_jobs = [self.queue.push(_job(name=str(i))) for i in range(3)]
+        mirror_jobs = [
+            self.queue.push(_job("mirror.example.org", str(i))) for i in range(2)
+        ]
+
+        # Two from the QGIS Hub, the third one does not hold the mirror back
+        self.assertEqual(self.queue.pop_ready(), hub_jobs[:2] + mirror_jobs[:1])
+        self.assertEqual(self.queue.pop_ready(), [])
+        self.assertEqual(hub_jobs[2].state, QUEUED)
+
+        self.queue.finish(hub_jobs[0], size=10)
+        self.assertEqual(self.queue.pop_ready(), [hub_jobs[2]])
+        self.assertEqual(hub_jobs[0].state, DONE)
+        self.assertEqual(hub_jobs[2].state, RUNNING)
+
+        self.queue.finish(mirror_jobs[0], error="404")
+        self.assertEqual(self.queue.pop_ready(), [mirror_jobs[1]])
+        self.assertEqual(mirror_jobs[0].state, FAILED)
+
+    def test_priority(self):
+        low = self.queue.push(_job(name="low"))
+        self.queue.push(_job(name="low 2"))
+        high = self.queue.push(_job(name="high", priority=1))
+        self.queue.set_limits(1, 1)
+
+        self.assertEqual(self.queue.pop_ready(), [high])
+        self.queue.finish(high)
+        self.assertEqual(self.queue.pop_ready(), [low])
+
+    def test_identical_jobs_are_queued_once(self):
+        first = self.queue.push(_job(name="a"))
+        self.queue.push(_job(name="b"))
+
+        second = self.queue.push(_job(name="b", priority=5))
+        again = self.queue.push(_job(name="a"))
+
+        self.assertIs(again, first)
+        self.assertEqual(second.priority, 5)
+        self.assertEqual(self.queue.pending(), 2)
+        self.queue.set_limits(1, 1)
+        self.assertEqual(self.queue.pop_ready(), [second])
+
+    def test_cancel(self):
+        job = self.queue.push(_job(name="a"))
+        other = self.queue.push(_job(name="b"))
+
+        self.assertTrue(self.queue.cancel(job))
+        self.assertFalse(self.queue.cancel(job))
+        self.assertEqual(job.state, CANCELED)
+        self.assertEqual(self.queue.pop_ready(), [other])
+        # Running jobs are not canceled
+        self.assertFalse(self.queue.cancel(other))
+
+    def test_progress(self):
+        jobs = [self.queue.push(_job(name=str(i))) for i in range(3)]
+        self.queue.pop_ready()
+        self.queue.finish(jobs[0], size=100)
+        self.queue.finish(jobs[1], error="Timeout")
+
+        progress = self.queue.progress()
+        self.assertEqual(tuple(progress), (3, 2, 1, 0, 100))
+        self.assertAlmostEqual(progress.percent, 200 / 3)
+
+        self.queue.pop_ready()
+        self.queue.finish(jobs[2], size=50)
+        self.assertEqual(self.queue.progress().percent, 100)
+
+        # A new batch once the queue was idle
+        self.queue.push(_job(name="next"))
+        self.assertEqual(tuple(self.queue.progress()), (1, 0, 0, 0, 0))
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.unit.test_endpoints
+"""
+
+# standard library
+import unittest
+
+# project
+from qgis_hub_plugin.utilities.endpoints import (
+    OFFICIAL_ENDPOINT,
+    EndpointSelector,
+    parse_endpoints,
+)
+from qgis_hub_plugin.utilities.retry import circuit_breaker
+
+MIRROR = "https://mirror.example.org"
+OTHER_MIRROR = "http://10.0.0.5:8000"
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestParseEndpoints(unittest.TestCase):
+    """Test the parsing of the mirrors setting"""
+
+    def test_separators_and_duplicates(self):
+        self.assertEqual(
+            parse_endpoints(f"{MIRROR}/, {OTHER_MIRROR}\n{MIRROR}"),
+            [MIRROR, OTHER_MIRROR],
+        )
+
+    def test_invalid_values_ignored(self):
+        self.assertEqual(parse_endpoints("mirror.example.org ftp://x"), [])
+        self.assertEqual(parse_endpoints(""), [])
+
+
+class TestEndpointSelector(unittest.TestCase):
+    """Test the ranking of the endpoints"""
+
+    def setUp(self):
+        self.now = 0.0
+        self.selector = EndpointSelector(clock=lambda: self.now)
+        self.selector.set_mirrors([MIRROR, OTHER_MIRROR])
+        circuit_breaker.reset()
+
+    def tearDown(self):
+        circuit_breaker.reset()
+
+    def test_official_first_until_measured(self):
+        self.assertEqual(
+            self.selector.ranked(), [OFFICIAL_ENDPOINT, MIRROR, OTHER_MIRROR]
+        )
+
+    def test_fastest_first(self):
+        self.selector.record_latency(OFFICIAL_ENDPOINT, 0.5)
+        self.selector.record_latency(MIRROR, 0.1)
+        self.selector.record_latency(OTHER_MIRROR, 0.2)
+        # A slow transfer outweighs a low latency
+        self.selector.record_transfer(MIRROR, 1024 * 1024, 10.0)
+
+        self.assertEqual(
+            self.selector.ranked(), [OTHER_MIRROR, OFFICIAL_ENDPOINT, MIRROR]
+        )
+
+    def test_open_circuit_last(self):
+        self.selector.record_latency(MIRROR, 0.1)
+        for _ in range(circuit_breaker.failure_threshold):
+            circuit_breaker.record_failure("mirror.example.org")
+
+        self.assertEqual(self.selector.ranked()[-1], MIRROR)
+
+    def test_needs_probe(self):
+        self.assertTrue(self.selector.needs_probe(60))
+        for endpoint in self.selector.endpoints:
+            self.selector.record_latency(endpoint, 0.1)
+        self.assertFalse(self.selector.needs_probe(60))
+        self.now = 61.0
+        self.assertTrue(self.selector.needs_probe(60))
+
+        # Nothing to choose from without mirrors
+        self.selector.set_mirrors([])
+        self.assertFalse(self.selector.needs_probe(60))
+
+    def test_candidates(self):
+        self.selector.record_latency(MIRROR, 0.1)
+        self.selector.record_latency(OFFICIAL_ENDPOINT, 0.2)
+        self.selector.record_latency(OTHER_MIRROR, 0.3)
+
+        self.assertEqual(
+            self.selector.candidates(f"{OFFICIAL_ENDPOINT}/files/1.zip"),
+            [
+                f"{MIRROR}/files/1.zip",
+                f"{OFFICIAL_ENDPOINT}/files/1.zip",
+                f"{OTHER_MIRROR}/files/1.zip",
+            ],
+        )
+        # Unknown hosts are left alone
+        self.assertEqual(
+            self.selector.candidates("https://example.com/a.png"),
+            ["https://example.com/a.png"],
+        )
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.unit.test_files
+"""
+
+# standard library
+import tempfile
+import unittest
+from pathlib import Path
+
+# project
+from qgis_hub_plugin.utilities.files import atomic_copy, atomic_write
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestAtomicWrite(unittest.TestCase):
+    """Test the crash-safe file writes"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.folder = Path(self.tmp_dir.name)
+        self.destination = self.folder / "response.json"
+
+    def test_write_replaces_file(self):
+        self.destination.write_text("old")
+
+        with atomic_write(self.destination, "w", encoding="utf-8") as f:
+            f.write("new")
+            # Nothing is replaced until the file is complete
+            self.assertEqual(self.destination.read_text(), "old")
+
+        self.assertEqual(self.destination.read_text(), "new")
+        self.assertEqual(list(self.folder.iterdir()), [self.destination])
+
+    def test_failed_write_keeps_previous_file(self):
+        self.destination.write_bytes(b"old")
+
+        with self.assertRaises(RuntimeError):
+            with atomic_write(self.destination) as f:
+                f.write(b"partial")
+                raise RuntimeError("interrupted")
+
+        self.assertEqual(self.destination.read_bytes(), b"old")
+        self.assertEqual(list(self.folder.iterdir()), [self.destination])
+
+    def test_copy(self):
+        source = self.folder / "source.bin"
+        source.write_bytes(b"data" * 1000)
+
+        atomic_copy(source, self.destination)
+
+        self.assertEqual(self.destination.read_bytes(), b"data" * 1000)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
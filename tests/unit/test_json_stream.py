@@ -0,0 +1,89 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.unit.test_json_stream
+"""
+
+# standard library
+import json
+import unittest
+
+# project
+from qgis_hub_plugin.core.json_stream import ResultsStreamParser
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestResultsStreamParser(unittest.TestCase):
+    """Test the incremental parser of catalog pages"""
+
+    def setUp(self):
+        self.page = {
+            "total": 3,
+            "next": "https://hub.qgis.org/api/v1/resources/?offset=3",
+            "results": [
+                {"uuid": "a", "name": 'Quotes " and [brackets]', "tags": [{}]},
+                {"uuid": "b", "name": "Accents é and {braces}", "dependencies": []},
+                {"uuid": "c", "name": "Escaped \\\\", "nested": {"results": [1]}},
+            ],
+            "previous": None,
+        }
+        self.body = json.dumps(self.page, ensure_ascii=False).encode("utf-8")
+
+    def test_resources_yielded_while_receiving(self):
+        parser = ResultsStreamParser()
+        batches = []
+
+        # Byte by byte, splitting strings and multi-byte characters
+        for i in range(len(self.body)):
+            resources = parser.feed(self.body[i : i + 1])
+            if resources:
+                batches.append((i, resources))
+
+        self.assertEqual(
+            [resource for _, batch in batches for resource in batch],
+            self.page["results"],
+        )
+        # The first resource is available long before the end of the body
+        self.assertLess(batches[0][0], len(self.body) // 2)
+        self.assertEqual(parser.finish(), self.page)
+
+    def test_single_chunk(self):
+        parser = ResultsStreamParser()
+
+        self.assertEqual(parser.feed(self.body), self.page["results"])
+        self.assertEqual(parser.finish(), self.page)
+
+    def test_page_without_results(self):
+        parser = ResultsStreamParser()
+
+        self.assertEqual(parser.feed(b'{"detail": "Not found."}'), [])
+        self.assertEqual(parser.finish(), {"detail": "Not found."})
+
+    def test_incomplete_page(self):
+        parser = ResultsStreamParser()
+        parser.feed(self.body[:-10])
+
+        with self.assertRaises(ValueError):
+            parser.finish()
+
+    def test_invalid_resource(self):
+        parser = ResultsStreamParser()
+
+        # Not told apart from an incomplete resource before the end
+        self.assertEqual(parser.feed(b'{"results": [{"uuid": a}]}'), [])
+        with self.assertRaises(ValueError):
+            parser.finish()
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.unit.test_metrics
+"""
+
+# standard library
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+# project
+from qgis_hub_plugin.utilities.metrics import (
+    OUTCOME_COALESCED,
+    OUTCOME_ERROR,
+    OUTCOME_NETWORK,
+    MetricsRegistry,
+    TransferRecord,
+)
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test the aggregation of the transfer metrics"""
+
+    def setUp(self):
+        self.registry = MetricsRegistry(max_records=3)
+
+    def _record(self, host="hub.qgis.org", outcome=OUTCOME_NETWORK, **kwargs):
+        self.registry.record(
+            TransferRecord(
+                url=f"https://{host}/file", host=host, outcome=outcome, **kwargs
+            )
+        )
+
+    def test_summary(self):
+        self._record(bytes_received=1000, duration=1.0, first_byte=0.2, tls=0.1)
+        self._record(bytes_received=3000, duration=3.0, first_byte=0.4)
+        self._record(host="mirror.example.org", outcome=OUTCOME_COALESCED)
+
+        summary = self.registry.summary()
+
+        overall = summary["overall"]
+        self.assertEqual(overall["requests"], 3)
+        self.assertEqual(
+            overall["outcomes"], {OUTCOME_NETWORK: 2, OUTCOME_COALESCED: 1}
+        )
+        self.assertEqual(overall["bytes_received"], 4000)
+        self.assertEqual(overall["duration_median"], 2.0)
+        self.assertAlmostEqual(overall["first_byte_median"], 0.3)
+        self.assertEqual(overall["tls_median"], 0.1)
+        self.assertEqual(overall["throughput"], 1000.0)
+        self.assertEqual(summary["hosts"]["mirror.example.org"]["requests"], 1)
+        self.assertIsNone(summary["hosts"]["mirror.example.org"]["throughput"])
+
+    def test_bounded(self):
+        for _ in range(5):
+            self._record(outcome=OUTCOME_ERROR, status=503)
+
+        self.assertEqual(len(self.registry.records()), 3)
+        self.assertEqual(self.registry.total, 5)
+
+        self.registry.reset()
+        self.assertEqual(self.registry.records(), [])
+        self.assertEqual(self.registry.summary()["overall"]["requests"], 0)
+
+    def test_export(self):
+        self._record(bytes_received=10, duration=0.5, status=200)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            destination = Path(tmp_dir, "metrics.json")
+            self.registry.export(destination)
+            data = json.loads(destination.read_text(encoding="utf-8"))
+
+        self.assertEqual(data["total"], 1)
+        self.assertEqual(data["records"][0]["status"], 200)
+        self.assertGreater(data["records"][0]["finished"], 0)
+        self.assertEqual(data["summary"]["overall"]["bytes_received"], 10)
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.unit.test_retry
+"""
+
+# standard library
+import unittest
+
+# project
+from qgis_hub_plugin.utilities.retry import CircuitBreaker, RetryPolicy
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Test the backoff of the retry policy"""
+
+    def test_attempts_are_bounded(self):
+        policy = RetryPolicy(max_attempts=3)
+
+        self.assertTrue(policy.should_retry(1))
+        self.assertTrue(policy.should_retry(2))
+        self.assertFalse(policy.should_retry(3))
+
+    def test_delay_grows_and_is_capped(self):
+        policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+
+        for _ in range(100):
+            self.assertLessEqual(policy.delay(1), 1.0)
+            self.assertLessEqual(policy.delay(2), 2.0)
+            self.assertLessEqual(policy.delay(10), 4.0)
+            self.assertGreaterEqual(policy.delay(10), 0.0)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test the per host circuit breaker"""
+
+    def setUp(self):
+        self.now = 0.0
+        self.breaker = CircuitBreaker(
+            failure_threshold=2, reset_timeout=60.0, clock=lambda: self.now
+        )
+
+    def test_opens_after_consecutive_failures(self):
+        self.breaker.record_failure("hub")
+        self.assertTrue(self.breaker.allow("hub"))
+
+        self.breaker.record_failure("hub")
+
+        self.assertFalse(self.breaker.allow("hub"))
+        self.assertEqual(self.breaker.retry_in("hub"), 60.0)
+        # Other hosts are not affected
+        self.assertTrue(self.breaker.allow("mirror"))
+
+    def test_success_resets_failures(self):
+        self.breaker.record_failure("hub")
+        self.breaker.record_success("hub")
+        self.breaker.record_failure("hub")
+
+        self.assertTrue(self.breaker.allow("hub"))
+
+    def test_single_trial_after_timeout(self):
+        self.breaker.record_failure("hub")
+        self.breaker.record_failure("hub")
+        self.now = 61.0
+
+        self.assertTrue(self.breaker.allow("hub"))
+        self.assertFalse(self.breaker.allow("hub"))
+
+        # A failing trial keeps the circuit open, a successful one closes it
+        self.breaker.record_failure("hub")
+        self.assertFalse(self.breaker.allow("hub"))
+        self.now = 122.0
+        self.assertTrue(self.breaker.allow("hub"))
+        self.breaker.record_success("hub")
+        self.assertTrue(self.breaker.allow("hub"))
+        self.assertFalse(self.breaker.is_open("hub"))
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+#! python3  # noqa E265
+
+"""
+Usage from the repo root folder:
+
+.. code-block:: bash
+    # for whole tests
+    python -m unittest tests.unit.test_single_flight
+"""
+
+# standard library
+import threading
+import unittest
+
+# project
+from qgis_hub_plugin.utilities.single_flight import SingleFlight
+
+# ############################################################################
+# ########## Classes #############
+# ################################
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test the coalescing of identical calls"""
+
+    def setUp(self):
+        self.flights = SingleFlight()
+
+    def test_identical_calls_share_a_flight(self):
+        first = self.flights.join("url", lambda: "reply")
+        second = self.flights.join("url", lambda: self.fail("started twice"))
+        other = self.flights.join("other", lambda: "other reply")
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual((self.flights.started, self.flights.coalesced), (2, 1))
+
+        self.assertTrue(self.flights.land(first, "result"))
+        self.assertFalse(self.flights.land(second, "late result"))
+        self.assertEqual(second.result, "result")
+        self.assertEqual(self.flights.in_flight(), 1)
+
+    def test_landed_flight_is_not_joined(self):
+        flight = self.flights.join("url", lambda: "reply")
+        self.flights.land(flight, "result")
+
+        self.assertIsNot(self.flights.join("url", lambda: "reply"), flight)
+        self.assertEqual(self.flights.started, 2)
+
+    def test_notify(self):
+        flight = self.flights.join("url", lambda: "reply")
+        notified = []
+        self.flights.notify(flight, lambda: notified.append("before"))
+        self.assertEqual(notified, [])
+
+        self.flights.land(flight, "result")
+        self.flights.notify(flight, lambda: notified.append("after"))
+        self.flights.land(flight, "late result")
+
+        self.assertEqual(notified, ["before", "after"])
+
+    def test_other_thread_waits_for_the_owner(self):
+        flight = self.flights.join("url", lambda: "reply")
+        results = []
+
+        def follower():
+            joined = self.flights.join("url", lambda: "reply")
+            joined.wait(5)
+            results.append((joined.is_owner, joined.result))
+
+        thread = threading.Thread(target=follower)
+        thread.start()
+        while self.flights.coalesced == 0:
+            pass
+        self.assertTrue(flight.is_owner)
+        self.flights.land(flight, "result")
+        thread.join(5)
+
+        self.assertEqual(results, [(False, "result")])
+
+
+# ############################################################################
+# ####### Stand-alone run ########
+# ################################
+if __name__ == "__main__":
+    unittest.main()